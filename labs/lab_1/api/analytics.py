@@ -0,0 +1,52 @@
+import hashlib
+import json
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.orm import Session
+from sqlmodel import select
+
+from connection import get_read_session
+from models.user import User
+from schemas.analytics import SpendAnalytics
+from schemas.transaction import TransactionFilters
+from api.auth import get_current_user
+from services.analytics import InvalidWindow, spend_series, spend_window
+from services.response_cache import response_cache
+
+router = APIRouter()
+
+Dimension = Literal["category", "type", "linked_object"]
+Bucket = Literal["day", "week", "month", "year"]
+
+@router.get("/analytics/spend", response_model=SpendAnalytics)
+def get_spend_analytics(
+    request: Request,
+    filters: TransactionFilters = Depends(),
+    group_by: list[Dimension] = Query(["category"]),
+    bucket: Bucket = "month",
+    rolling: int = Query(0, ge=0, le=366),
+    db: Session = Depends(get_read_session),
+    current_user: User = Depends(get_current_user),
+):
+    group_by = list(dict.fromkeys(group_by))
+    try:
+        window = spend_window(filters, bucket)
+    except InvalidWindow as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    if filters.date_to is None:
+        # the window ends at "now", so a cached body would freeze it
+        return spend_series(db, current_user.id, window, group_by, bucket, rolling)
+
+    data_version = db.execute(select(User.data_version).where(User.id == current_user.id)).scalar_one()
+    params = json.dumps(
+        {"filters": filters.model_dump(mode="json"), "group_by": group_by, "bucket": bucket, "rolling": rolling},
+        sort_keys=True,
+    )
+    key = f"analytics:spend:{current_user.id}:{data_version}:{hashlib.sha256(params.encode()).hexdigest()}"
+
+    return response_cache.respond(
+        request,
+        key,
+        lambda: spend_series(db, current_user.id, window, group_by, bucket, rolling).model_dump_json().encode(),
+    )
@@ -1,82 +1,137 @@
 from fastapi import APIRouter, Depends, status, HTTPException
-from sqlalchemy.orm import Session
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from fastapi.security import OAuth2PasswordBearer
 from models.user import User
 from schemas.user import UserCreate, UserRead, UserLogin
-from connection import get_session
-from authorization.hash_service import hash_password, verify_password
+from connection import get_async_session
+from authorization.hash_service import hash_password_async, verify_and_update_password
 from authorization.jwt_generator import verify_access_token, create_access_token
+from authorization.principal_cache import (
+    get_principal, cache_principal, invalidate_principal, get_token_version, cache_token_version,
+)
+from authorization.config import settings
 
 router = APIRouter()
 
 @router.post("/register", response_model=UserRead)
-async def register(user_create: UserCreate, db: Session = Depends(get_session)):
-    db_user_by_email = db.query(User).filter(User.email == user_create.email).first()
+async def register(user_create: UserCreate, db: AsyncSession = Depends(get_async_session)):
+    db_user_by_email = (await db.exec(select(User).where(User.email == user_create.email))).first()
     if db_user_by_email:
         raise HTTPException(status_code=400, detail="Email already registered")
 
-    db_user_by_username = db.query(User).filter(User.username == user_create.username).first()
+    db_user_by_username = (await db.exec(select(User).where(User.username == user_create.username))).first()
     if db_user_by_username:
         raise HTTPException(status_code=400, detail="Username already registered")
 
-    hashed_password = hash_password(user_create.password)
+    hashed_password = await hash_password_async(user_create.password)
 
     user = User(**user_create.dict(), password_hash=hashed_password)
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
 
     return user
 
 
 @router.post("/login")
-async def login(user_base: UserLogin, db: Session = Depends(get_session)):
-    user = db.query(User).filter(User.username == user_base.username).first()
+async def login(user_base: UserLogin, db: AsyncSession = Depends(get_async_session)):
+    user = (await db.exec(select(User).where(User.username == user_base.username))).first()
 
-    if not user or not verify_password(user_base.password, user.password_hash):
+    if not user:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+
+    verified, new_hash = await verify_and_update_password(user_base.password, user.password_hash)
+    if not verified:
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
-    access_token = create_access_token(data={"sub": user.username, "user_id": user.id})
+    if new_hash:
+        user.password_hash = new_hash
+        await db.commit()
+
+    access_token = create_access_token(data={"sub": user.username, "user_id": user.id, "ver": user.token_version})
 
     return {"access_token": access_token, "token_type": "bearer"}
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
 
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_session)) -> User:
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    payload = verify_access_token(token, credentials_exception)
+
+def _token_claims(token: str) -> tuple[int, str, int]:
+    payload = verify_access_token(token, _credentials_exception())
 
     username: str = payload.get("sub")
     user_id: int = payload.get("user_id")
 
     if username is None or user_id is None:
-        raise credentials_exception
+        raise _credentials_exception()
 
-    user = db.query(User).filter(User.id == user_id).first()
-    if user is None:
-        raise credentials_exception
+    return user_id, username, payload.get("ver", 0)
+
+
+async def _load_user(user_id: int, token_version: int, db: AsyncSession) -> User:
+    user = get_principal(user_id)
+    if user is None or user.token_version != token_version:
+        user = await db.get(User, user_id)
+        if user is None:
+            raise _credentials_exception()
+        cache_principal(user)
+
+    if user.token_version != token_version:
+        raise _credentials_exception()
 
     return user
 
+
+async def _check_token_version(user_id: int, token_version: int, db: AsyncSession):
+    """Claims-only revocation check against a short-TTL cache of the user's token_version."""
+    current = get_token_version(user_id)
+    if current is None:
+        current = (await db.exec(select(User.token_version).where(User.id == user_id))).first()
+        if current is None:
+            raise _credentials_exception()
+        cache_token_version(user_id, current)
+
+    if current != token_version:
+        raise _credentials_exception()
+
+
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_session)) -> User:
+    user_id, username, token_version = _token_claims(token)
+
+    if settings.AUTH_CLAIMS_ONLY:
+        await _check_token_version(user_id, token_version, db)
+        return User(id=user_id, username=username, token_version=token_version)
+
+    return await _load_user(user_id, token_version, db)
+
+
+async def get_current_user_record(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_session)) -> User:
+    user_id, _, token_version = _token_claims(token)
+    return await _load_user(user_id, token_version, db)
+
 @router.get("/users/me", response_model=UserRead)
-async def read_users_me(current_user: User = Depends(get_current_user)):
+async def read_users_me(current_user: User = Depends(get_current_user_record)):
     return current_user
 
 
 @router.put("/users/{user_id}/change-password")
-async def change_password(user_id: int, new_password: str, db: Session = Depends(get_session)):
-    user = db.query(User).filter(User.id == user_id).first()
+async def change_password(user_id: int, new_password: str, db: AsyncSession = Depends(get_async_session)):
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    user.password_hash = hash_password(new_password)
-    db.commit()
-    db.refresh(user)
+    user.password_hash = await hash_password_async(new_password)
+    user.token_version += 1
+    await db.commit()
+    await db.refresh(user)
+    invalidate_principal(user.id)
 
     return {"msg": "Password updated successfully"}
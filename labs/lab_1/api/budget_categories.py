@@ -1,28 +1,57 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 
-from connection import get_session
+from connection import get_session, get_read_session
 from models.budget_category import BudgetCategory
+from models.user import User
 from schemas.budget import BudgetCategoryRead
+from api.auth import get_current_user
+from services.response_cache import response_cache, budget_categories_key
+from services.entity_versions import bump_budget
+from services.tenant_query import owned, get_owned
 
 router = APIRouter()
 
+budget_category_list = TypeAdapter(list[BudgetCategoryRead])
+
 @router.get("/budget-categories/", response_model=list[BudgetCategoryRead])
-def get_all_budget_categories(db: Session = Depends(get_session)):
-    return db.query(BudgetCategory).all()
+def get_all_budget_categories(
+    request: Request,
+    db: Session = Depends(get_read_session),
+    current_user: User = Depends(get_current_user),
+):
+    return response_cache.respond(
+        request,
+        budget_categories_key(current_user.id),
+        lambda: budget_category_list.dump_json(budget_category_list.validate_python(
+            db.execute(owned(BudgetCategory, current_user.id).order_by(BudgetCategory.id)).scalars().all(),
+            from_attributes=True,
+        )),
+    )
 
 @router.get("/budget-categories/{id}", response_model=BudgetCategoryRead)
-def get_budget_category(id: int, db: Session = Depends(get_session)):
-    bc = db.get(BudgetCategory, id)
+def get_budget_category(
+    id: int,
+    db: Session = Depends(get_read_session),
+    current_user: User = Depends(get_current_user),
+):
+    bc = get_owned(db, BudgetCategory, id, current_user.id)
     if not bc:
         raise HTTPException(status_code=404, detail="Not found")
     return bc
 
 @router.delete("/budget-categories/{id}")
-def delete_budget_category(id: int, db: Session = Depends(get_session)):
-    bc = db.get(BudgetCategory, id)
+def delete_budget_category(
+    id: int,
+    db: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+):
+    bc = get_owned(db, BudgetCategory, id, current_user.id)
     if not bc:
         raise HTTPException(status_code=404, detail="Not found")
+    bump_budget(db, bc.budget_id)
     db.delete(bc)
     db.commit()
+    response_cache.invalidate(budget_categories_key(current_user.id))
     return {"ok": True}
\ No newline at end of file
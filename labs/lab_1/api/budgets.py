@@ -1,20 +1,49 @@
-from datetime import timedelta
+from datetime import date
+from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import delete
 from sqlalchemy.orm import joinedload
-from sqlmodel import Session, select
+from sqlmodel import Session
 
-from connection import get_session
+from connection import get_session, get_read_session
 from models.user import User
 from models.budget import Budget
 from models.budget_category import BudgetCategory
-from schemas.budget import BudgetRead, BudgetCreate, BudgetCategoryRead, BudgetUpdate
+from schemas.budget import BudgetRead, BudgetCreate, BudgetCategoryRead, BudgetUpdate, TransactionRead, BudgetForecast
 from api.auth import get_current_user
 from models.transaction import Transaction
-from sqlalchemy import func
+from services.budget_spend import get_budget_spend, month_range
+from services.response_cache import response_cache, budget_categories_key
+from services.entity_versions import entity_etag, collection_etag, not_modified
+from services.budget_forecast import forecast_users
+from services.tenant_query import owned, get_owned
 
 router = APIRouter()
 
+BUDGET_TRANSACTION_COLUMNS = [getattr(Transaction, field) for field in TransactionRead.model_fields]
+WITH_CATEGORIES = joinedload(Budget.categories).joinedload(BudgetCategory.category)
+
+def _budget_read(budget: Budget, spend: dict, transactions=None) -> BudgetRead:
+    categories_with_amounts = [
+        BudgetCategoryRead(
+            category_id=bc.category_id,
+            limit_amount=bc.limit_amount,
+            category=bc.category,
+            current_amount=spend.get((budget.id, bc.category_id), 0.0)
+        )
+        for bc in budget.categories
+    ]
+
+    return BudgetRead(
+        id=budget.id,
+        user_id=budget.user_id,
+        month=budget.month,
+        created_at=budget.created_at,
+        categories=categories_with_amounts,
+        transactions=transactions or []
+    )
+
 @router.post("/budgets/", response_model=BudgetRead)
 def create_budget(
     budget: BudgetCreate,
@@ -38,90 +67,66 @@ def create_budget(
         session.add(db_budget_category)
 
     session.commit()
-    session.refresh(db_budget)
-    return db_budget
+    response_cache.invalidate(budget_categories_key(current_user.id))
+    return _load_budget(session, db_budget.id, current_user.id)
 
-@router.get("/budgets/{budget_id}", response_model=BudgetRead)
-def get_budget(budget_id: int, session: Session = Depends(get_session)):
-    budget = session.exec(
-        select(Budget)
-        .where(Budget.id == budget_id)
-        .options(joinedload(Budget.categories).joinedload(BudgetCategory.category))
-    ).unique().first()
+def _budget_version(session: Session, budget_id: int, user_id: int) -> int:
+    version = session.exec(owned(Budget, user_id, Budget.version).where(Budget.id == budget_id)).first()
+    if version is None:
+        raise HTTPException(status_code=404, detail="Budget not found")
+    return version
+
+def _load_budget(session: Session, budget_id: int, user_id: int) -> BudgetRead:
+    budget = get_owned(session, Budget, budget_id, user_id, WITH_CATEGORIES)
 
     if not budget:
         raise HTTPException(status_code=404, detail="Budget not found")
 
-    start_date = budget.month.replace(day=1)
-    next_month = (start_date + timedelta(days=32)).replace(day=1)
-
-    categories_with_amounts = []
-    for bc in budget.categories:
-        result = session.exec(
-            select(func.sum(Transaction.amount))
-            .where(
-                Transaction.category_id == bc.category_id,
-                Transaction.date >= start_date,
-                Transaction.date < next_month,
-            )
-        ).first()
-        current_amount = result or 0.0
-
-        categories_with_amounts.append(BudgetCategoryRead(
-            category_id=bc.category_id,
-            limit_amount=bc.limit_amount,
-            category=bc.category,
-            current_amount=current_amount
-        ))
+    spend = get_budget_spend(session, [budget])
+    return _budget_read(budget, spend)
 
-    return BudgetRead(
-        id=budget.id,
-        user_id=budget.user_id,
-        month=budget.month,
-        created_at=budget.created_at,
-        categories=categories_with_amounts
-    )
+@router.get("/budgets/forecast", response_model=BudgetForecast)
+def get_budget_forecast(
+    month: Optional[date] = None,
+    session: Session = Depends(get_read_session),
+    current_user: User = Depends(get_current_user)
+):
+    month = month or date.today()
+    return forecast_users(session, [current_user.id], month)[current_user.id]
+
+@router.get("/budgets/{budget_id}", response_model=BudgetRead)
+def get_budget(
+    budget_id: int,
+    request: Request,
+    response: Response,
+    session: Session = Depends(get_read_session),
+    current_user: User = Depends(get_current_user)
+):
+    etag = entity_etag("budget", budget_id, _budget_version(session, budget_id, current_user.id))
+    cached = not_modified(request, response, etag)
+    if cached:
+        return cached
+
+    return _load_budget(session, budget_id, current_user.id)
 
 @router.get("/budgets/", response_model=list[BudgetRead])
-def get_budgets(session: Session = Depends(get_session)):
+def get_budgets(
+    request: Request,
+    response: Response,
+    session: Session = Depends(get_read_session),
+    current_user: User = Depends(get_current_user)
+):
+    versions = session.exec(owned(Budget, current_user.id, Budget.id, Budget.version).order_by(Budget.id)).all()
+    cached = not_modified(request, response, collection_etag("budgets", versions))
+    if cached:
+        return cached
+
     budgets = session.exec(
-        select(Budget).options(joinedload(Budget.categories).joinedload(BudgetCategory.category))
+        owned(Budget, current_user.id).options(WITH_CATEGORIES).order_by(Budget.id)
     ).unique().all()
 
-    result = []
-
-    for budget in budgets:
-        start_date = budget.month.replace(day=1)
-        next_month = (start_date + timedelta(days=32)).replace(day=1)
-
-        categories_with_amounts = []
-
-        for bc in budget.categories:
-            current_amount = session.exec(
-                select(func.sum(Transaction.amount))
-                .where(
-                    Transaction.category_id == bc.category_id,
-                    Transaction.date >= start_date,
-                    Transaction.date < next_month,
-                )
-            ).first() or 0.0
-
-            categories_with_amounts.append(BudgetCategoryRead(
-                category_id=bc.category_id,
-                limit_amount=bc.limit_amount,
-                category=bc.category,
-                current_amount=current_amount
-            ))
-
-        result.append(BudgetRead(
-            id=budget.id,
-            user_id=budget.user_id,
-            month=budget.month,
-            created_at=budget.created_at,
-            categories=categories_with_amounts
-        ))
-
-    return result
+    spend = get_budget_spend(session, budgets)
+    return [_budget_read(budget, spend) for budget in budgets]
 
 @router.put("/budgets/{budget_id}", response_model=BudgetRead)
 def update_budget(
@@ -130,14 +135,14 @@ def update_budget(
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
-    db_budget = session.get(Budget, budget_id)
-    if not db_budget or db_budget.user_id != current_user.id:
+    db_budget = get_owned(session, Budget, budget_id, current_user.id)
+    if not db_budget:
         raise HTTPException(status_code=404, detail="Budget not found")
 
     db_budget.month = budget.month
+    db_budget.version += 1
 
-    session.exec(select(BudgetCategory).where(BudgetCategory.budget_id == db_budget.id)).delete()
-    session.commit()
+    session.execute(delete(BudgetCategory).where(BudgetCategory.budget_id == db_budget.id))
 
     for category in budget.categories:
         db_budget_category = BudgetCategory(
@@ -148,69 +153,53 @@ def update_budget(
         session.add(db_budget_category)
 
     session.commit()
-    session.refresh(db_budget)
+    response_cache.invalidate(budget_categories_key(current_user.id))
 
-    return get_budget(budget_id=budget_id, session=session)
+    return _load_budget(session, budget_id, current_user.id)
 
 @router.delete("/budgets/{budget_id}")
-def delete_budget(budget_id: int, session: Session = Depends(get_session)):
-    budget = session.get(Budget, budget_id)
+def delete_budget(
+    budget_id: int,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    budget = get_owned(session, Budget, budget_id, current_user.id)
     if not budget:
         raise HTTPException(status_code=404, detail="Budget not found")
     session.delete(budget)
     session.commit()
+    response_cache.invalidate(budget_categories_key(current_user.id))
     return {"ok": True}
 
 @router.get("/budgets/{budget_id}/details", response_model=BudgetRead)
-def get_budget_detail(budget_id: int, session: Session = Depends(get_session)):
-    budget = session.exec(
-        select(Budget)
-        .where(Budget.id == budget_id)
-        .options(joinedload(Budget.categories).joinedload(BudgetCategory.category))
-    ).unique().first()
+def get_budget_detail(
+    budget_id: int,
+    request: Request,
+    response: Response,
+    session: Session = Depends(get_read_session),
+    current_user: User = Depends(get_current_user)
+):
+    etag = entity_etag("budget-detail", budget_id, _budget_version(session, budget_id, current_user.id))
+    cached = not_modified(request, response, etag)
+    if cached:
+        return cached
+
+    budget = get_owned(session, Budget, budget_id, current_user.id, WITH_CATEGORIES)
 
     if not budget:
         raise HTTPException(status_code=404, detail="Budget not found")
 
-    start_date = budget.month.replace(day=1)
-    next_month = (start_date + timedelta(days=32)).replace(day=1)
+    start_date, next_month = month_range(budget.month)
 
     transactions = session.exec(
-        select(Transaction)
+        owned(Transaction, current_user.id, *BUDGET_TRANSACTION_COLUMNS)
         .where(
             Transaction.linked_object_type == "budget",
             Transaction.linked_object_id == budget.id,
             Transaction.date >= start_date,
             Transaction.date < next_month,
         )
-    ).all()
-
-    categories_with_amounts = []
-    for bc in budget.categories:
-        result = session.exec(
-            select(func.sum(Transaction.amount))
-            .where(
-                Transaction.category_id == bc.category_id,
-                Transaction.linked_object_type == "budget",
-                Transaction.linked_object_id == budget.id,
-                Transaction.date >= start_date,
-                Transaction.date < next_month,
-            )
-        ).first()
-        current_amount = result or 0.0
-
-        categories_with_amounts.append(BudgetCategoryRead(
-            category_id=bc.category_id,
-            limit_amount=bc.limit_amount,
-            category=bc.category,
-            current_amount=current_amount
-        ))
+    ).mappings().all()
 
-    return BudgetRead(
-        id=budget.id,
-        user_id=budget.user_id,
-        month=budget.month,
-        created_at=budget.created_at,
-        categories=categories_with_amounts,
-        transactions=transactions
-    )
\ No newline at end of file
+    spend = get_budget_spend(session, [budget], linked_only=True)
+    return _budget_read(budget, spend, transactions)
@@ -1,26 +1,40 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 
-from connection import get_session
+from connection import get_session, get_read_session
 from models.category import Category
 from schemas.category import CategoryRead, CategoryCreate, CategoryUpdate
+from services.entity_versions import bump_category
+from services.response_cache import response_cache, CATEGORIES_KEY
 
 router = APIRouter()
 
+category_list = TypeAdapter(list[CategoryRead])
+
+def _invalidate_categories():
+    response_cache.invalidate(CATEGORIES_KEY)
+    response_cache.bump_generation(CATEGORIES_KEY)
+
 @router.post("/categories/", response_model=CategoryRead)
 def create_category(cat: CategoryCreate, db: Session = Depends(get_session)):
     db_cat = Category(**cat.dict())
     db.add(db_cat)
     db.commit()
     db.refresh(db_cat)
+    _invalidate_categories()
     return db_cat
 
 @router.get("/categories/", response_model=list[CategoryRead])
-def get_categories(db: Session = Depends(get_session)):
-    return db.query(Category).all()
+def get_categories(request: Request, db: Session = Depends(get_read_session)):
+    return response_cache.respond(
+        request,
+        CATEGORIES_KEY,
+        lambda: category_list.dump_json(category_list.validate_python(db.query(Category).all(), from_attributes=True)),
+    )
 
 @router.get("/categories/{category_id}", response_model=CategoryRead)
-def get_category(category_id: int, db: Session = Depends(get_session)):
+def get_category(category_id: int, db: Session = Depends(get_read_session)):
     cat = db.get(Category, category_id)
     if not cat:
         raise HTTPException(status_code=404, detail="Not found")
@@ -39,11 +53,13 @@ def update_category(
     if cat_update.name:
         cat.name = cat_update.name
 
-    if cat_update.is_income:
-        cat.income = cat_update.income
+    if cat_update.is_income is not None:
+        cat.is_income = cat_update.is_income
 
+    bump_category(db, cat.id)
     db.commit()
     db.refresh(cat)
+    _invalidate_categories()
     return cat
 
 @router.delete("/categories/{category_id}")
@@ -53,4 +69,5 @@ def delete_category(category_id: int, db: Session = Depends(get_session)):
         raise HTTPException(status_code=404, detail="Not found")
     db.delete(cat)
     db.commit()
+    _invalidate_categories()
     return {"ok": True}
\ No newline at end of file
@@ -1,17 +1,21 @@
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 
-from connection import get_session
+from connection import get_session, get_read_session
 from models.goal import Goal
 from models.transaction import Transaction
 from models.user import User
 from schemas.goal import GoalRead, GoalCreate, GoalUpdate, TransactionRead
 from api.auth import get_current_user
+from services.entity_versions import entity_etag, collection_etag, not_modified
+from services.tenant_query import owned, get_owned
 
 router = APIRouter()
 
+GOAL_TRANSACTION_COLUMNS = [getattr(Transaction, field) for field in TransactionRead.model_fields]
+
 @router.post("/goals/", response_model=GoalRead)
 def create_goal(
     goal: GoalCreate,
@@ -27,14 +31,35 @@ def create_goal(
     return db_goal
 
 @router.get("/goals/", response_model=list[GoalRead])
-def get_goals(db: Session = Depends(get_session)):
-    return db.query(Goal).all()
+def get_goals(
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_session),
+    current_user: User = Depends(get_current_user),
+):
+    versions = db.execute(owned(Goal, current_user.id, Goal.id, Goal.version).order_by(Goal.id)).all()
+    cached = not_modified(request, response, collection_etag("goals", versions))
+    if cached:
+        return cached
+
+    return db.execute(owned(Goal, current_user.id).order_by(Goal.id)).scalars().all()
 
 @router.get("/goals/{goal_id}", response_model=GoalRead)
-def get_goal(goal_id: int, db: Session = Depends(get_session)):
-    goal = db.get(Goal, goal_id)
+def get_goal(
+    goal_id: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_session),
+    current_user: User = Depends(get_current_user),
+):
+    goal = get_owned(db, Goal, goal_id, current_user.id)
     if not goal:
         raise HTTPException(status_code=404, detail="Not found")
+
+    cached = not_modified(request, response, entity_etag("goal", goal.id, goal.version))
+    if cached:
+        return cached
+
     return goal
 
 
@@ -45,27 +70,29 @@ def update_goal(
         db: Session = Depends(get_session),
         current_user: User = Depends(get_current_user)
 ):
-    goal = db.get(Goal, goal_id)
+    goal = get_owned(db, Goal, goal_id, current_user.id)
     if not goal:
         raise HTTPException(status_code=404, detail="Goal not found")
 
-    if goal.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized to edit this goal")
-
     if goal_update.name:
         goal.name = goal_update.name
     if goal_update.target_amount is not None:
         goal.target_amount = goal_update.target_amount
     if goal_update.description:
         goal.description = goal_update.description
+    goal.version += 1
 
     db.commit()
     db.refresh(goal)
     return goal
 
 @router.delete("/goals/{goal_id}")
-def delete_goal(goal_id: int, db: Session = Depends(get_session)):
-    goal = db.get(Goal, goal_id)
+def delete_goal(
+    goal_id: int,
+    db: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+):
+    goal = get_owned(db, Goal, goal_id, current_user.id)
     if not goal:
         raise HTTPException(status_code=404, detail="Not found")
     db.delete(goal)
@@ -74,21 +101,31 @@ def delete_goal(goal_id: int, db: Session = Depends(get_session)):
 
 
 @router.get("/goals/{goal_id}/details", response_model=GoalRead)
-def get_goal_detail(goal_id: int, db: Session = Depends(get_session), current_user: User = Depends(get_current_user)):
-    goal = db.query(Goal).filter(Goal.id == goal_id, Goal.user_id == current_user.id).first()
+def get_goal_detail(
+    goal_id: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_session),
+    current_user: User = Depends(get_current_user)
+):
+    goal = get_owned(db, Goal, goal_id, current_user.id)
 
     if not goal:
         raise HTTPException(status_code=404, detail="Goal not found")
 
+    cached = not_modified(request, response, entity_etag("goal-detail", goal.id, goal.version))
+    if cached:
+        return cached
+
     if goal.due_date is None:
         goal.due_date = datetime(2025, 12, 31)
 
-    transactions = db.query(Transaction).filter(
-        Transaction.linked_object_type == "goal",
-        Transaction.linked_object_id == goal.id
-    ).all()
-
-    transactions_serialized = [TransactionRead.from_orm(transaction) for transaction in transactions]
+    transactions = db.execute(
+        owned(Transaction, current_user.id, *GOAL_TRANSACTION_COLUMNS).where(
+            Transaction.linked_object_type == "goal",
+            Transaction.linked_object_id == goal.id
+        )
+    ).mappings().all()
 
     return {
         "id": goal.id,
@@ -97,5 +134,5 @@ def get_goal_detail(goal_id: int, db: Session = Depends(get_session), current_us
         "target_amount": goal.target_amount,
         "created_at": goal.created_at,
         "due_date": goal.due_date,
-        "transactions": transactions_serialized
+        "transactions": transactions
     }
\ No newline at end of file
@@ -0,0 +1,52 @@
+import hmac
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import PlainTextResponse
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from authorization.config import settings
+from authorization.hash_service import hash_pool
+from authorization.jwt_generator import token_cache
+from authorization.principal_cache import principal_cache
+from connection import engine, async_engine, pool_stats, replica_router
+from services.metrics import render_metrics
+
+internal_bearer = HTTPBearer(auto_error=False)
+
+
+def require_internal_token(credentials: HTTPAuthorizationCredentials | None = Depends(internal_bearer)):
+    """Internal endpoints take INTERNAL_TOKEN as a bearer token and are hidden while it is unset."""
+    if not settings.INTERNAL_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if credentials is None or not hmac.compare_digest(credentials.credentials.encode(), settings.INTERNAL_TOKEN.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid internal token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+router = APIRouter(dependencies=[Depends(require_internal_token)])
+
+@router.get("/internal/pool")
+def get_pool_stats():
+    return {
+        "sync": pool_stats(engine),
+        "async": pool_stats(async_engine.sync_engine),
+        "replicas": replica_router.stats(),
+    }
+
+@router.get("/internal/hash")
+def get_hash_stats():
+    return hash_pool.stats()
+
+@router.get("/internal/caches")
+def get_cache_stats():
+    return {
+        "tokens": token_cache.stats(),
+        "principals": principal_cache.stats(),
+    }
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
@@ -1,15 +1,29 @@
-from decimal import Decimal
+from typing import Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Body
+from fastapi import APIRouter, Depends, HTTPException, Body, Header, Query, Request
+from fastapi.responses import Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
-from connection import get_session
-from models.budget import Budget
-from models.goal import Goal
-from models.transaction import Transaction, LinkedObjectType
-from schemas.transaction import TransactionRead, TransactionCreate, TransactionType, TransactionUpdate
+from connection import get_session, get_read_session, replica_router, sticky_key
+from models.transaction import Transaction
+from schemas.transaction import (
+    TransactionRead, TransactionCreate, TransactionUpdate, TransactionPage, TransactionFilters,
+    TransactionImportResult
+)
 from api.auth import get_current_user
 from models.user import User
+from services.linked_balances import linked_exists
+from services.outbox import enqueue_transaction_effects, transaction_entry
+from services.idempotency import request_hash, claim_key, complete_key, KeyInFlight
+from services.tenant_query import get_owned
+from services.transaction_query import filter_transactions, paginate_transactions, encode_cursor, InvalidCursor
+from services.transaction_export import stream_transactions, gzip_chunks
+from services.transaction_import import (
+    parse_json, parse_csv, parse_ofx, import_transactions, ImportFormatError, MAX_IMPORT_ROWS
+)
+
+MAX_PAGE_SIZE = 500
 
 router = APIRouter()
 
@@ -17,7 +31,8 @@ router = APIRouter()
 def create_transaction(
     tr: TransactionCreate,
     db: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    idempotency_key: str | None = Header(None, max_length=255),
 ):
     # Проверка
     if bool(tr.linked_object_id) != bool(tr.linked_object_type):
@@ -26,47 +41,116 @@ def create_transaction(
             detail="Both linked_object_id and linked_object_type must be set together."
         )
 
+    if idempotency_key:
+        digest = request_hash(tr.model_dump_json())
+        try:
+            stored = claim_key(db, current_user.id, idempotency_key, digest)
+        except KeyInFlight:
+            raise HTTPException(
+                status_code=409,
+                detail="A request with this Idempotency-Key is still in progress",
+                headers={"Retry-After": "1"},
+            )
+        if stored:
+            if stored.request_hash != digest:
+                raise HTTPException(status_code=422, detail="Idempotency-Key was already used for a different request")
+            return Response(
+                content=stored.response,
+                status_code=stored.status_code,
+                media_type="application/json",
+                headers={"Idempotent-Replayed": "true"},
+            )
+
+    if tr.linked_object_type and not linked_exists(db, tr.linked_object_type, tr.linked_object_id, current_user.id):
+        raise HTTPException(status_code=404, detail=f"{tr.linked_object_type.value.capitalize()} not found")
+
     db_tr = Transaction(**tr.dict(), user_id=current_user.id)
     db.add(db_tr)
+    enqueue_transaction_effects(db, current_user.id, transaction_entry(db_tr))
+    if idempotency_key:
+        # serialize the row as the database returns it, so the first response and every replay match
+        db.flush()
+        db.refresh(db_tr)
+        body = TransactionRead.model_validate(db_tr).model_dump_json()
+        complete_key(db, current_user.id, idempotency_key, 200, body)
+        db.commit()
+        return Response(content=body, media_type="application/json")
     db.commit()
     db.refresh(db_tr)
+    return db_tr
 
-    if tr.linked_object_type == LinkedObjectType.goal:
-        goal = db.get(Goal, tr.linked_object_id)
-        if not goal:
-            raise HTTPException(status_code=404, detail="Goal not found")
-        if tr.type == TransactionType.expense:
-            goal.current_amount -= tr.amount
-        elif tr.type == TransactionType.income:
-            goal.current_amount += tr.amount
-        db.add(goal)
-
-    elif tr.linked_object_type == LinkedObjectType.budget:
-        budget = db.get(Budget, tr.linked_object_id)
-        if not budget:
-            raise HTTPException(status_code=404, detail="Budget not found")
-        if not hasattr(budget, "current_amount"):
-            setattr(budget, "current_amount", Decimal(0))
-        if tr.type == TransactionType.expense:
-            budget.current_amount += tr.amount
-        elif tr.type == TransactionType.income:
-            budget.current_amount -= tr.amount
-        db.add(budget)
+@router.post("/transactions/bulk", response_model=TransactionImportResult)
+async def bulk_create_transactions(
+    request: Request,
+    category_id: int | None = None,
+    db: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+):
+    body = await request.body()
+    content_type = request.headers.get("content-type", "application/json").split(";")[0].strip()
+    try:
+        if content_type == "text/csv":
+            rows = parse_csv(body)
+        elif content_type in ("application/x-ofx", "application/ofx"):
+            rows = parse_ofx(body, category_id)
+        else:
+            rows = parse_json(body)
+    except ImportFormatError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    if len(rows) > MAX_IMPORT_ROWS:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_IMPORT_ROWS} transactions per import")
+
+    return await run_in_threadpool(import_transactions, db, current_user.id, rows)
+
+@router.get("/transactions/", response_model=TransactionPage)
+def get_transactions(
+    filters: TransactionFilters = Depends(),
+    cursor: str | None = None,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_read_session),
+    current_user: User = Depends(get_current_user),
+):
+    query = filter_transactions(current_user.id, filters)
+    try:
+        rows = db.execute(paginate_transactions(query, cursor, limit)).scalars().all()
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    next_cursor = encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+    return TransactionPage(items=rows[:limit], next_cursor=next_cursor)
+
+@router.get("/transactions/export")
+def export_transactions(
+    request: Request,
+    filters: TransactionFilters = Depends(),
+    format: Literal["ndjson", "csv"] = "ndjson",
+    current_user: User = Depends(get_current_user),
+):
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    headers = {"Content-Disposition": f'attachment; filename="transactions.{format}"'}
+    chunks = stream_transactions(current_user.id, filters, format, replica_router.engine_for(sticky_key(request)))
 
-    db.commit()
-    return db_tr
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        chunks = gzip_chunks(chunks)
+        headers["Content-Encoding"] = "gzip"
 
-@router.get("/transactions/", response_model=list[TransactionRead])
-def get_transactions(db: Session = Depends(get_session)):
-    return db.query(Transaction).all()
+    return StreamingResponse(chunks, media_type=media_type, headers=headers)
 
-@router.get("/transactions/{transaction_id}", response_model=TransactionRead)
-def get_transaction(transaction_id: int, db: Session = Depends(get_session)):
-    tr = db.get(Transaction, transaction_id)
+def _owned_transaction(db: Session, transaction_id: int, user_id: int, detail: str = "Not found") -> Transaction:
+    tr = get_owned(db, Transaction, transaction_id, user_id)
     if not tr:
-        raise HTTPException(status_code=404, detail="Not found")
+        raise HTTPException(status_code=404, detail=detail)
     return tr
 
+@router.get("/transactions/{transaction_id}", response_model=TransactionRead)
+def get_transaction(
+    transaction_id: int,
+    db: Session = Depends(get_read_session),
+    current_user: User = Depends(get_current_user),
+):
+    return _owned_transaction(db, transaction_id, current_user.id)
+
 @router.patch("/transactions/{transaction_id}", response_model=TransactionRead)
 def update_transaction(
     transaction_id: int,
@@ -74,74 +158,34 @@ def update_transaction(
     db: Session = Depends(get_session),
     current_user: User = Depends(get_current_user),
 ):
-    tr = db.get(Transaction, transaction_id)
-    if not tr:
-        raise HTTPException(status_code=404, detail="Transaction not found")
+    tr = _owned_transaction(db, transaction_id, current_user.id, "Transaction not found")
 
-    if tr.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Forbidden")
-
-    old_amount = tr.amount
-    old_type = tr.type
-    old_linked_type = tr.linked_object_type
-    old_linked_id = tr.linked_object_id
+    old_entry = transaction_entry(tr, sign=-1)
 
     update_dict = update_data.dict(exclude_unset=True)
 
     for field, value in update_dict.items():
         setattr(tr, field, value)
 
-    db.add(tr)
-
-    if old_linked_type == LinkedObjectType.goal:
-        goal = db.get(Goal, old_linked_id)
-        if goal:
-            if old_type == TransactionType.income:
-                goal.current_amount -= old_amount
-            elif old_type == TransactionType.expense:
-                goal.current_amount += old_amount
-            db.add(goal)
-
-    elif old_linked_type == LinkedObjectType.budget:
-        budget = db.get(Budget, old_linked_id)
-        if budget:
-            if old_type == TransactionType.income:
-                budget.current_amount += old_amount
-            elif old_type == TransactionType.expense:
-                budget.current_amount -= old_amount
-            db.add(budget)
-
-    if tr.linked_object_type == LinkedObjectType.goal:
-        goal = db.get(Goal, tr.linked_object_id)
-        if not goal:
-            raise HTTPException(status_code=404, detail="Linked goal not found")
-        if tr.type == TransactionType.income:
-            goal.current_amount += tr.amount
-        elif tr.type == TransactionType.expense:
-            goal.current_amount -= tr.amount
-        db.add(goal)
-
-    elif tr.linked_object_type == LinkedObjectType.budget:
-        budget = db.get(Budget, tr.linked_object_id)
-        if not budget:
-            raise HTTPException(status_code=404, detail="Linked budget not found")
-        if not hasattr(budget, "current_amount"):
-            setattr(budget, "current_amount", Decimal(0))
-        if tr.type == TransactionType.income:
-            budget.current_amount -= tr.amount
-        elif tr.type == TransactionType.expense:
-            budget.current_amount += tr.amount
-        db.add(budget)
+    if tr.linked_object_type and not linked_exists(db, tr.linked_object_type, tr.linked_object_id, current_user.id):
+        raise HTTPException(
+            status_code=404, detail=f"Linked {tr.linked_object_type.value} not found"
+        )
 
+    db.add(tr)
+    enqueue_transaction_effects(db, tr.user_id, old_entry, transaction_entry(tr))
     db.commit()
     db.refresh(tr)
     return tr
 
 @router.delete("/transactions/{transaction_id}")
-def delete_transaction(transaction_id: int, db: Session = Depends(get_session)):
-    tr = db.get(Transaction, transaction_id)
-    if not tr:
-        raise HTTPException(status_code=404, detail="Not found")
+def delete_transaction(
+    transaction_id: int,
+    db: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+):
+    tr = _owned_transaction(db, transaction_id, current_user.id)
+    enqueue_transaction_effects(db, tr.user_id, transaction_entry(tr, sign=-1))
     db.delete(tr)
     db.commit()
     return {"ok": True}
\ No newline at end of file
@@ -4,5 +4,14 @@ class Settings:
     SECRET_KEY = os.getenv("SECRET_KEY", "richardrichardrichard")
     ALGORITHM = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES = 30
+    BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+    HASH_WORKERS = int(os.getenv("HASH_WORKERS", 4))
+    HASH_QUEUE_DEPTH = int(os.getenv("HASH_QUEUE_DEPTH", 32))
+    PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", 10000))
+    PRINCIPAL_CACHE_TTL = float(os.getenv("PRINCIPAL_CACHE_TTL", 60))
+    TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", 10000))
+    AUTH_CLAIMS_ONLY = os.getenv("AUTH_CLAIMS_ONLY", "false").lower() in ("1", "true", "yes")
+    TOKEN_VERSION_CACHE_TTL = float(os.getenv("TOKEN_VERSION_CACHE_TTL", 5))
+    INTERNAL_TOKEN = os.getenv("INTERNAL_TOKEN", "")
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
@@ -1,9 +1,91 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from authorization.config import settings
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
+
+
+class HashingUnavailable(Exception):
+    pass
+
+
+class HashWorkerPool:
+    """Runs bcrypt off the event loop on a fixed number of threads.
+
+    At most ``workers + queue_depth`` calls may be in flight; beyond that
+    callers get ``HashingUnavailable`` instead of queueing without bound.
+    """
+
+    def __init__(self, workers: int, queue_depth: int):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._limit = workers + queue_depth
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.started = 0
+        self.completed = 0
+        self.rejected = 0
+        self.queue_time_total = 0.0
+        self.queue_time_max = 0.0
+
+    async def run(self, func, *args):
+        with self._lock:
+            if self._in_flight >= self._limit:
+                self.rejected += 1
+                raise HashingUnavailable()
+            self._in_flight += 1
+
+        submitted = time.perf_counter()
+
+        def job():
+            queued = time.perf_counter() - submitted
+            with self._lock:
+                self.started += 1
+                self.queue_time_total += queued
+                self.queue_time_max = max(self.queue_time_max, queued)
+            try:
+                return func(*args)
+            finally:
+                with self._lock:
+                    self.completed += 1
+
+        # released when the job finishes or is cancelled before starting, not when the caller gives up
+        future = self._executor.submit(job)
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self, future):
+        with self._lock:
+            self._in_flight -= 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "in_flight": self._in_flight,
+                "limit": self._limit,
+                "started": self.started,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "queue_time_avg_ms": self.queue_time_total / self.started * 1000 if self.started else 0.0,
+                "queue_time_max_ms": self.queue_time_max * 1000,
+            }
+
+
+hash_pool = HashWorkerPool(settings.HASH_WORKERS, settings.HASH_QUEUE_DEPTH)
 
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
\ No newline at end of file
+    return pwd_context.verify(plain_password, hashed_password)
+
+async def hash_password_async(password: str) -> str:
+    return await hash_pool.run(hash_password, password)
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """Returns (verified, new_hash); new_hash is set when the stored hash uses outdated settings."""
+    return await hash_pool.run(pwd_context.verify_and_update, plain_password, hashed_password)
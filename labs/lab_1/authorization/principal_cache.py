@@ -0,0 +1,21 @@
+from authorization.config import settings
+from services.ttl_cache import TTLCache
+
+principal_cache = TTLCache(settings.PRINCIPAL_CACHE_SIZE, settings.PRINCIPAL_CACHE_TTL)
+token_version_cache = TTLCache(settings.PRINCIPAL_CACHE_SIZE, settings.TOKEN_VERSION_CACHE_TTL)
+
+def get_principal(user_id: int):
+    return principal_cache.get(user_id)
+
+def cache_principal(user):
+    principal_cache.set(user.id, user)
+
+def get_token_version(user_id: int):
+    return token_version_cache.get(user_id)
+
+def cache_token_version(user_id: int, token_version: int):
+    token_version_cache.set(user_id, token_version)
+
+def invalidate_principal(user_id: int):
+    principal_cache.pop(user_id)
+    token_version_cache.pop(user_id)
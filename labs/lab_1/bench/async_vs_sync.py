@@ -0,0 +1,69 @@
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DB_ADMIN", "sqlite:///bench.db")
+
+from sqlalchemy import func
+from sqlmodel import Session, SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from connection import engine, async_engine
+from models.user import User
+import main  # noqa: F401  registers every model
+
+
+def seed(users: int):
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        existing = session.exec(select(func.count()).select_from(User)).one()
+        session.add_all(
+            User(username=f"bench{i}", email=f"bench{i}@example.com", password_hash="x")
+            for i in range(existing, users)
+        )
+        session.commit()
+
+
+def sync_lookup(user_id: int):
+    with Session(engine) as session:
+        return session.get(User, user_id)
+
+
+async def async_lookup(user_id: int):
+    async with AsyncSession(async_engine) as session:
+        return await session.get(User, user_id)
+
+
+async def run(name: str, call, requests: int, concurrency: int, users: int):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        async with semaphore:
+            await call(i % users + 1)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = time.perf_counter() - started
+    print(f"{name:>5}: {requests / elapsed:10.1f} req/s ({requests} requests, concurrency {concurrency})")
+
+
+async def bench(args):
+    await run("sync", lambda user_id: run_in_threadpool(sync_lookup, user_id), args.requests, args.concurrency, args.users)
+    await run("async", async_lookup, args.requests, args.concurrency, args.users)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare sync (thread pool) and async user lookups")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    args = parser.parse_args()
+
+    engine.echo = False
+    async_engine.echo = False
+    seed(args.users)
+    asyncio.run(bench(args))
@@ -0,0 +1,68 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DB_ADMIN", "sqlite:///bench.db")
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, SQLModel, select
+
+from authorization.jwt_generator import create_access_token
+from connection import engine
+from main import app
+from models.category import Category
+from models.user import User
+
+
+def seed() -> tuple[str, int]:
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        user = session.exec(select(User).where(User.username == "bulk-bench")).first()
+        if user is None:
+            user = User(username="bulk-bench", email="bulk-bench@example.com", password_hash="x")
+            session.add(user)
+        category = Category(name="bulk-bench", is_income=False)
+        session.add(category)
+        session.commit()
+        token = create_access_token({"sub": user.username, "user_id": user.id, "ver": user.token_version})
+        return token, category.id
+
+
+def rows(count: int, category_id: int) -> list[dict]:
+    return [
+        {
+            "amount": f"{i % 500 + 1}.25",
+            "type": "expense" if i % 4 else "income",
+            "date": f"2025-{i % 12 + 1:02d}-{i % 28 + 1:02d}T12:00:00",
+            "category_id": category_id,
+            "description": f"row {i}",
+        }
+        for i in range(count)
+    ]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare per-row POST /transactions/ with POST /transactions/bulk")
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--single-rows", type=int, default=500)
+    args = parser.parse_args()
+
+    engine.echo = False
+    token, category_id = seed()
+    headers = {"Authorization": f"Bearer {token}"}
+
+    with TestClient(app) as client:
+        started = time.perf_counter()
+        for row in rows(args.single_rows, category_id):
+            client.post("/api/v1/transactions/", json=row, headers=headers).raise_for_status()
+        single = args.single_rows / (time.perf_counter() - started)
+
+        started = time.perf_counter()
+        response = client.post("/api/v1/transactions/bulk", json=rows(args.rows, category_id), headers=headers)
+        response.raise_for_status()
+        bulk = response.json()["inserted"] / (time.perf_counter() - started)
+
+    print(f"single: {single:10.0f} rows/s ({args.single_rows} requests)")
+    print(f"  bulk: {bulk:10.0f} rows/s ({args.rows} rows in one request)")
@@ -0,0 +1,105 @@
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DB_ADMIN", "sqlite:///forecast_bench.db")
+
+import numpy as np
+from sqlalchemy import func, insert
+from sqlmodel import Session, SQLModel, select
+
+import main  # noqa: F401  registers every model
+from connection import engine
+from models.budget import Budget
+from models.budget_category import BudgetCategory
+from models.category import Category
+from models.category_month_spend import CategoryMonthSpend
+from models.user import User
+from services.budget_forecast import HISTORY_MONTHS, elapsed_days, forecast_users, project
+
+MONTH = date(2025, 3, 1)
+AS_OF = date(2025, 3, 12)
+
+
+def seed(users: int, categories: int) -> list[int]:
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        existing = session.execute(select(func.count()).select_from(User)).scalar_one()
+        if existing < users:
+            random.seed(7)
+            first = existing + 1
+            session.execute(insert(User), [
+                {"username": f"forecast-{i}", "email": f"forecast-{i}@example.com", "password_hash": "x"}
+                for i in range(first, users + 1)
+            ])
+            if not session.execute(select(func.count()).select_from(Category)).scalar_one():
+                session.execute(insert(Category), [{"name": f"c{i}", "is_income": False} for i in range(categories)])
+            category_ids = session.execute(select(Category.id)).scalars().all()[:categories]
+            session.execute(insert(Budget), [{"user_id": i, "month": MONTH} for i in range(first, users + 1)])
+            budget_ids = dict(session.execute(select(Budget.user_id, Budget.id).where(Budget.user_id >= first)).all())
+
+            spend, limits = [], []
+            for user_id in range(first, users + 1):
+                for category_id in category_ids:
+                    level = random.uniform(50, 500)
+                    limits.append({"budget_id": budget_ids[user_id], "category_id": category_id, "limit_amount": round(level * 1.1, 2)})
+                    for back in range(HISTORY_MONTHS + 1):
+                        year, month = divmod(MONTH.year * 12 + MONTH.month - 1 - back, 12)
+                        amount = level * random.uniform(0.6, 1.4) * (AS_OF.day / 31 if back == 0 else 1)
+                        spend.append({"user_id": user_id, "category_id": category_id, "month": date(year, month + 1, 1), "expense_sum": round(amount, 2), "count": 1})
+            session.execute(insert(BudgetCategory), limits)
+            session.execute(insert(CategoryMonthSpend), spend)
+            session.commit()
+        return session.execute(select(User.id).order_by(User.id).limit(users)).scalars().all()
+
+
+def project_loop(history: np.ndarray, mtd: np.ndarray, elapsed: int, days: int) -> list[float]:
+    projected = []
+    for row, spent in zip(history.tolist(), mtd.tolist()):
+        observed = [amount for amount in row if amount]
+        baseline = sum(observed) / len(observed) if observed else 0.0
+        seasonal = row[0] / baseline if baseline and row[0] else 1.0
+        seasonal = min(max(seasonal, 0.5), 2.0)
+        expected_rate = baseline * seasonal / days
+        velocity_rate = spent / elapsed if elapsed else expected_rate
+        weight = elapsed / days if observed else 1.0
+        projected.append(spent + (weight * velocity_rate + (1 - weight) * expected_rate) * (days - elapsed))
+    return projected
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time the nightly budget forecast over many users")
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--categories", type=int, default=5)
+    parser.add_argument("--chunk", type=int, default=1000)
+    args = parser.parse_args()
+
+    engine.echo = False
+    started = time.perf_counter()
+    user_ids = seed(args.users, args.categories)
+    print(f"seed: {time.perf_counter() - started:.1f}s")
+
+    flagged = 0
+    started = time.perf_counter()
+    with Session(engine) as session:
+        for i in range(0, len(user_ids), args.chunk):
+            forecasts = forecast_users(session, user_ids[i:i + args.chunk], MONTH, as_of=AS_OF)
+            flagged += sum(c.over_limit for f in forecasts.values() for c in f.categories)
+    total = time.perf_counter() - started
+    print(f"forecast: {len(user_ids)} users in {total:.2f}s ({len(user_ids) / total:.0f} users/s), {flagged} categories over limit")
+
+    rng = np.random.default_rng(7)
+    history, mtd = rng.uniform(0, 500, (200000, HISTORY_MONTHS)), rng.uniform(0, 300, 200000)
+    elapsed, days = elapsed_days(MONTH, AS_OF)
+    started = time.perf_counter()
+    vectorized, _ = project(history, mtd, elapsed, days)
+    vector_time = time.perf_counter() - started
+    started = time.perf_counter()
+    looped = project_loop(history, mtd, elapsed, days)
+    loop_time = time.perf_counter() - started
+    assert np.allclose(vectorized, looped)
+    print(f"projection of {len(mtd)} rows: vectorized {vector_time * 1000:.1f}ms, per-row loop {loop_time * 1000:.1f}ms")
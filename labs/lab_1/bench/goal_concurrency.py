@@ -0,0 +1,107 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DB_ADMIN", "sqlite:///bench.db?timeout=60")
+os.environ.setdefault("OUTBOX_EMBEDDED_WORKER", "false")
+
+from sqlmodel import Session, SQLModel
+
+from api.transactions import create_transaction
+from connection import engine
+from models.category import Category
+from models.goal import Goal
+from models.user import User
+from models.transaction import LinkedObjectType
+from schemas.transaction import TransactionCreate
+from services import outbox
+from services.linked_balances import adjust_linked
+import main  # noqa: F401  registers every model
+
+
+def seed() -> tuple[User, int, int]:
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        suffix = time.time_ns()
+        user = User(username=f"stress-{suffix}", email=f"stress-{suffix}@example.com", password_hash="x")
+        category = Category(name="stress", is_income=True)
+        session.add_all([user, category])
+        session.commit()
+        goal = Goal(user_id=user.id, title="stress", target_amount=10**9, due_date=date(2030, 1, 1))
+        session.add(goal)
+        session.commit()
+        session.refresh(user)
+        return user, category.id, goal.id
+
+
+def adjust(goal_id: int, amount: Decimal):
+    """What a drain does per goal: one atomic UPDATE in its own transaction."""
+    with Session(engine) as session:
+        adjust_linked(session, LinkedObjectType.goal, goal_id, amount)
+        session.commit()
+
+
+def deposit(user: User, category_id: int, goal_id: int, amount: Decimal):
+    tr = TransactionCreate(
+        amount=amount,
+        type="income",
+        date=datetime(2025, 6, 1),
+        category_id=category_id,
+        linked_object_id=goal_id,
+        linked_object_type="goal",
+    )
+    with Session(engine) as session:
+        create_transaction(tr, db=session, current_user=user, idempotency_key=None)
+
+
+def drain_until_empty(_):
+    with Session(engine) as session:
+        while outbox.drain(session, batch_size=50):
+            pass
+
+
+def stored(goal_id: int) -> Decimal:
+    with Session(engine) as session:
+        return session.get(Goal, goal_id).current_amount
+
+
+def report(label: str, count: int, elapsed: float, expected: Decimal, actual: Decimal) -> bool:
+    ok = actual == expected
+    print(f"{label}: {count / elapsed:.0f}/s, expected {expected}, stored {actual}: {'OK' if ok else 'LOST UPDATES'}")
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrent deposits into one goal must not lose updates")
+    parser.add_argument("--writers", type=int, default=16)
+    parser.add_argument("--deposits", type=int, default=2000)
+    parser.add_argument("--drainers", type=int, default=None,
+                        help="threads draining the outbox at once (default: --writers on Postgres, 1 on SQLite)")
+    args = parser.parse_args()
+    # SQLite ignores FOR UPDATE SKIP LOCKED, so concurrent drainers there could claim the same events
+    drainers = args.drainers or (1 if engine.dialect.name == "sqlite" else args.writers)
+
+    engine.echo = False
+    amounts = [Decimal(i % 7 + 1) for i in range(args.deposits)]
+    ok = True
+
+    _, _, goal_id = seed()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.writers) as pool:
+        list(pool.map(lambda amount: adjust(goal_id, amount), amounts))
+    ok &= report("concurrent adjust_linked", args.deposits, time.perf_counter() - started, sum(amounts), stored(goal_id))
+
+    user, category_id, goal_id = seed()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.writers) as pool:
+        list(pool.map(lambda amount: deposit(user, category_id, goal_id, amount), amounts))
+    with ThreadPoolExecutor(max_workers=drainers) as pool:
+        list(pool.map(drain_until_empty, range(drainers)))
+    ok &= report(f"deposits + {drainers} drainers", args.deposits, time.perf_counter() - started, sum(amounts), stored(goal_id))
+
+    sys.exit(0 if ok else 1)
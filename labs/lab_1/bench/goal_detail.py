@@ -0,0 +1,81 @@
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DB_ADMIN", "sqlite:///bench.db")
+
+from sqlalchemy import insert
+from sqlmodel import Session, SQLModel
+
+from api.goals import get_goal_detail
+from connection import engine
+from models.category import Category
+from models.goal import Goal
+from models.transaction import Transaction
+from models.user import User
+from schemas.goal import GoalRead, TransactionRead
+import main  # noqa: F401  registers every model
+
+
+def seed(count: int) -> tuple[User, int]:
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        user = User(username=f"goal-bench-{time.time_ns()}", email=f"goal-bench-{time.time_ns()}@example.com", password_hash="x")
+        category = Category(name="goal-bench", is_income=True)
+        session.add_all([user, category])
+        session.commit()
+        goal = Goal(user_id=user.id, title="bench", target_amount=1, due_date=date(2030, 1, 1))
+        session.add(goal)
+        session.commit()
+        started = datetime(2020, 1, 1)
+        session.execute(insert(Transaction), [
+            {
+                "user_id": user.id,
+                "category_id": category.id,
+                "amount": i % 100 + 1,
+                "type": "income",
+                "description": f"deposit {i}",
+                "date": started + timedelta(minutes=i),
+                "linked_object_type": "goal",
+                "linked_object_id": goal.id,
+            }
+            for i in range(count)
+        ])
+        session.commit()
+        session.refresh(user)
+        return user, goal.id
+
+
+def orm_detail(session: Session, user: User, goal_id: int) -> dict:
+    goal = session.query(Goal).filter(Goal.id == goal_id, Goal.user_id == user.id).first()
+    transactions = session.query(Transaction).filter(
+        Transaction.linked_object_type == "goal",
+        Transaction.linked_object_id == goal.id
+    ).all()
+    return {**goal.model_dump(), "transactions": [TransactionRead.from_orm(tr) for tr in transactions]}
+
+
+def measure(name: str, call, rows: int):
+    tracemalloc.start()
+    started = time.perf_counter()
+    with Session(engine) as session:
+        GoalRead.model_validate(call(session))
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:>8}: {rows / elapsed:10.0f} rows/s, peak {peak / 2**20:8.1f} MiB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Goal detail read path: ORM entities vs column selects")
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    engine.echo = False
+    user, goal_id = seed(args.rows)
+    measure("orm", lambda session: orm_detail(session, user, goal_id), args.rows)
+    measure("columns", lambda session: get_goal_detail(goal_id, db=session, current_user=user), args.rows)
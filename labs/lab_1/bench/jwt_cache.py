@@ -0,0 +1,26 @@
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from authorization.jwt_generator import create_access_token, decode_access_token, verify_access_token, token_cache
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare cached and uncached JWT verification")
+    parser.add_argument("--number", type=int, default=20000)
+    parser.add_argument("--tokens", type=int, default=100, help="distinct tokens cycled through")
+    args = parser.parse_args()
+
+    tokens = [create_access_token({"sub": f"user{i}", "user_id": i, "ver": 0}) for i in range(args.tokens)]
+    error = Exception("invalid token")
+
+    for name, verify in (("uncached", decode_access_token), ("cached", verify_access_token)):
+        token_cache.clear()
+        counter = iter(range(args.number))
+        elapsed = timeit.timeit(lambda: verify(tokens[next(counter) % args.tokens], error), number=args.number)
+        print(f"{name:>8}: {elapsed / args.number * 1e6:8.2f} us/token, {args.number / elapsed:10.0f} tokens/s")
+
+    print(f"cache: {token_cache.stats()}")
@@ -0,0 +1,310 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DB_ADMIN", "sqlite:///load_bench.db")
+os.environ.setdefault("INTERNAL_TOKEN", "load-bench")
+
+import httpx
+from sqlalchemy import func, insert
+from sqlmodel import Session, SQLModel, select
+
+import main  # noqa: F401  registers every model
+from authorization.hash_service import hash_password
+from authorization.jwt_generator import create_access_token
+from connection import engine
+from main import app
+from models.budget import Budget
+from models.budget_category import BudgetCategory
+from models.category import Category
+from models.goal import Goal
+from models.transaction import LinkedObjectType, Transaction
+from models.user import User
+from services.linked_balances import recompute_linked
+from services.spend_rollup import rebuild
+
+PASSWORD = "load-password"
+INSERT_BATCH = 10000
+
+
+def _months_back(today: date, count: int) -> list[date]:
+    months = []
+    year, month = today.year, today.month
+    for _ in range(count):
+        months.append(date(year, month, 1))
+        year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+    return months
+
+
+def seed(args) -> None:
+    """Fill an empty database with reproducible volumes; a database that already has load users is reused."""
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        if session.execute(select(func.count()).select_from(User).where(User.username.like("load-%"))).scalar_one():
+            print("seed: reusing existing load-* users, pass --reseed to start over")
+            return
+
+        rng = random.Random(args.seed)
+        started = time.perf_counter()
+        password_hash = hash_password(PASSWORD)
+        now = datetime.utcnow()
+
+        first_category = (session.execute(select(func.max(Category.id))).scalar() or 0) + 1
+        session.execute(insert(Category), [
+            {"name": f"load-category-{i}", "is_income": i % 5 == 0} for i in range(args.categories)
+        ])
+        category_ids = list(range(first_category, first_category + args.categories))
+
+        first_user = (session.execute(select(func.max(User.id))).scalar() or 0) + 1
+        session.execute(insert(User), [
+            {"username": f"load-{i}", "email": f"load-{i}@example.com", "password_hash": password_hash, "created_at": now}
+            for i in range(args.users)
+        ])
+        user_ids = list(range(first_user, first_user + args.users))
+
+        months = _months_back(now.date(), args.budgets)
+        session.execute(insert(Budget), [
+            {"user_id": user_id, "month": month, "current_amount": 0, "created_at": now, "version": 0}
+            for user_id in user_ids for month in months
+        ])
+        budgets = session.execute(select(Budget.id, Budget.user_id).where(Budget.user_id.in_(user_ids))).all()
+        session.execute(insert(BudgetCategory), [
+            {"budget_id": budget_id, "category_id": category_id, "limit_amount": rng.randrange(100, 2000)}
+            for budget_id, _ in budgets for category_id in rng.sample(category_ids, min(4, len(category_ids)))
+        ])
+
+        session.execute(insert(Goal), [
+            {
+                "user_id": user_id,
+                "title": f"goal {i}",
+                "target_amount": rng.randrange(1000, 50000),
+                "current_amount": 0,
+                "due_date": now.date() + timedelta(days=rng.randrange(30, 900)),
+                "created_at": now,
+                "version": 0,
+            }
+            for user_id in user_ids for i in range(args.goals)
+        ])
+        goals = session.execute(select(Goal.id, Goal.user_id).where(Goal.user_id.in_(user_ids))).all()
+
+        budgets_by_user, goals_by_user = {}, {}
+        for budget_id, user_id in budgets:
+            budgets_by_user.setdefault(user_id, []).append(budget_id)
+        for goal_id, user_id in goals:
+            goals_by_user.setdefault(user_id, []).append(goal_id)
+
+        span = timedelta(days=30 * args.budgets).total_seconds()
+        for offset in range(0, args.transactions, INSERT_BATCH):
+            rows = []
+            for _ in range(min(INSERT_BATCH, args.transactions - offset)):
+                user_id = rng.choice(user_ids)
+                linked_type, linked_id = None, None
+                roll = rng.random()
+                if roll < 0.05 and goals_by_user.get(user_id):
+                    linked_type, linked_id = LinkedObjectType.goal, rng.choice(goals_by_user[user_id])
+                elif roll < 0.10:
+                    linked_type, linked_id = LinkedObjectType.budget, rng.choice(budgets_by_user[user_id])
+                rows.append({
+                    "user_id": user_id,
+                    "category_id": rng.choice(category_ids),
+                    "amount": round(rng.uniform(1, 500), 2),
+                    "type": "income" if rng.random() < 0.2 else "expense",
+                    "description": "load",
+                    "date": now - timedelta(seconds=rng.uniform(0, span)),
+                    "linked_object_type": linked_type,
+                    "linked_object_id": linked_id,
+                })
+            session.execute(insert(Transaction), rows)
+            session.commit()
+            print(f"seed: {offset + len(rows)}/{args.transactions} transactions")
+
+        rebuild(session)
+        recompute_linked(session, LinkedObjectType.goal)
+        recompute_linked(session, LinkedObjectType.budget)
+        session.commit()
+        print(f"seed: done in {time.perf_counter() - started:.1f}s")
+
+
+def load_fixtures(sample_users: int, seed: int) -> list[dict]:
+    with Session(engine) as session:
+        users = session.execute(
+            select(User.id, User.username, User.token_version).where(User.username.like("load-%")).order_by(User.id).limit(sample_users)
+        ).all()
+        user_ids = [user_id for user_id, _, _ in users]
+        budgets, goals, transactions = {}, {}, {}
+        for model, target in ((Budget, budgets), (Goal, goals)):
+            for object_id, user_id in session.execute(select(model.id, model.user_id).where(model.user_id.in_(user_ids))).all():
+                target.setdefault(user_id, []).append(object_id)
+        for transaction_id, user_id in session.execute(
+            select(Transaction.id, Transaction.user_id).where(Transaction.user_id.in_(user_ids)).order_by(Transaction.id.desc()).limit(50 * len(user_ids))
+        ).all():
+            transactions.setdefault(user_id, []).append(transaction_id)
+        category_ids = session.execute(select(Category.id).where(Category.name.like("load-category-%"))).scalars().all()
+
+    return [
+        {
+            "id": user_id,
+            "username": username,
+            "headers": {"Authorization": f"Bearer {create_access_token({'sub': username, 'user_id': user_id, 'ver': token_version})}"},
+            "budgets": budgets.get(user_id, [0]),
+            "goals": goals.get(user_id, [0]),
+            "transactions": transactions.get(user_id, [0]),
+            "categories": category_ids,
+        }
+        for user_id, username, token_version in users
+    ]
+
+
+def _transaction(rng: random.Random, user: dict) -> dict:
+    return {
+        "amount": f"{rng.uniform(1, 200):.2f}",
+        "type": "expense",
+        "description": "load",
+        "date": datetime.utcnow().isoformat(),
+        "category_id": rng.choice(user["categories"]),
+    }
+
+
+SCENARIOS = [
+    ("auth", "login", lambda rng, u: ("POST", "/api/v1/login", {"json": {"username": u["username"], "password": PASSWORD}})),
+    ("auth", "users_me", lambda rng, u: ("GET", "/api/v1/users/me", {})),
+    ("categories", "list_categories", lambda rng, u: ("GET", "/api/v1/categories/", {})),
+    ("budgets", "list_budgets", lambda rng, u: ("GET", "/api/v1/budgets/", {})),
+    ("budgets", "get_budget", lambda rng, u: ("GET", f"/api/v1/budgets/{rng.choice(u['budgets'])}", {})),
+    ("budgets", "budget_details", lambda rng, u: ("GET", f"/api/v1/budgets/{rng.choice(u['budgets'])}/details", {})),
+    ("budgets", "budget_forecast", lambda rng, u: ("GET", "/api/v1/budgets/forecast", {})),
+    ("budget_categories", "list_budget_categories", lambda rng, u: ("GET", "/api/v1/budget-categories/", {})),
+    ("goals", "list_goals", lambda rng, u: ("GET", "/api/v1/goals/", {})),
+    ("goals", "get_goal", lambda rng, u: ("GET", f"/api/v1/goals/{rng.choice(u['goals'])}", {})),
+    ("goals", "goal_details", lambda rng, u: ("GET", f"/api/v1/goals/{rng.choice(u['goals'])}/details", {})),
+    ("transactions", "list_transactions", lambda rng, u: ("GET", "/api/v1/transactions/", {"params": {"limit": 50}})),
+    ("transactions", "get_transaction", lambda rng, u: ("GET", f"/api/v1/transactions/{rng.choice(u['transactions'])}", {})),
+    ("transactions", "create_transaction", lambda rng, u: ("POST", "/api/v1/transactions/", {"json": _transaction(rng, u)})),
+    ("transactions", "bulk_import_50", lambda rng, u: ("POST", "/api/v1/transactions/bulk", {"json": [_transaction(rng, u) for _ in range(50)]})),
+    ("transactions", "export_ndjson", lambda rng, u: ("GET", "/api/v1/transactions/export", {"params": {"date_from": (datetime.utcnow() - timedelta(days=30)).isoformat()}})),
+    ("analytics", "spend_by_category", lambda rng, u: ("GET", "/api/v1/analytics/spend", {"params": {"group_by": "category", "bucket": "month"}})),
+    ("internal", "metrics", lambda rng, u: ("GET", "/metrics", {"headers": {"Authorization": f"Bearer {os.environ['INTERNAL_TOKEN']}"}})),
+]
+
+
+async def run_scenario(client: httpx.AsyncClient, build, users: list[dict], requests: int, concurrency: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    plan = [(user, build(rng, user)) for user in (rng.choice(users) for _ in range(requests))]
+    latencies, errors = [], 0
+    queue = iter(plan)
+
+    async def worker():
+        nonlocal errors
+        for user, (method, url, kwargs) in queue:
+            started = time.perf_counter()
+            headers = {**user["headers"], **kwargs.pop("headers", {})}
+            response = await client.request(method, url, headers=headers, **kwargs)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive") if len(latencies) > 1 else latencies * 99
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(cuts[49] * 1000, 2),
+        "p95_ms": round(cuts[94] * 1000, 2),
+        "p99_ms": round(cuts[98] * 1000, 2),
+    }
+
+
+async def run(args) -> dict:
+    users = load_fixtures(args.sample_users, args.seed)
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://load") as client:
+        for index, (router, name, build) in enumerate(SCENARIOS):
+            if args.only and name not in args.only and router not in args.only:
+                continue
+            await run_scenario(client, build, users, min(args.warmup, args.requests), args.concurrency, args.seed + index)
+            result = await run_scenario(client, build, users, args.requests, args.concurrency, args.seed + index)
+            results[name] = {"router": router, **result}
+            print(f"{router:18} {name:24} {result['throughput_rps']:8.1f} rps  p50 {result['p50_ms']:8.2f}ms  "
+                  f"p95 {result['p95_ms']:8.2f}ms  p99 {result['p99_ms']:8.2f}ms  errors {result['errors']}")
+    return results
+
+
+def volumes() -> dict:
+    with Session(engine) as session:
+        return {
+            model.__tablename__: session.execute(select(func.count()).select_from(model)).scalar_one()
+            for model in (User, Category, Budget, BudgetCategory, Goal, Transaction)
+        }
+
+
+def _commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline: dict, current: dict):
+    print(f"\n{'scenario':24} {'baseline rps, change':>22} {'baseline p95 ms, change':>24}")
+    for name, result in current["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if before is None:
+            continue
+        rps_change = (result["throughput_rps"] / before["throughput_rps"] - 1) * 100 if before["throughput_rps"] else 0.0
+        p95_change = (result["p95_ms"] / before["p95_ms"] - 1) * 100 if before["p95_ms"] else 0.0
+        print(f"{name:24} {before['throughput_rps']:8.1f} {rps_change:+8.1f}%  {before['p95_ms']:10.2f} {p95_change:+8.1f}%")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Seed a database and load-test every API router in-process")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--categories", type=int, default=20)
+    parser.add_argument("--budgets", type=int, default=12, help="monthly budgets per user")
+    parser.add_argument("--goals", type=int, default=3, help="goals per user")
+    parser.add_argument("--transactions", type=int, default=200000)
+    parser.add_argument("--reseed", action="store_true", help="drop every table and seed again")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--sample-users", type=int, default=200, help="users the requests are spread over")
+    parser.add_argument("--requests", type=int, default=300, help="measured requests per scenario")
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--only", nargs="*", help="scenario or router names to run")
+    parser.add_argument("--output", default=None, help="write results JSON here")
+    parser.add_argument("--baseline", default=None, help="results JSON from an earlier commit to compare against")
+    args = parser.parse_args()
+
+    engine.echo = False
+    logging.getLogger("services.metrics").setLevel(logging.ERROR)
+    if args.reseed:
+        SQLModel.metadata.drop_all(engine)
+    seed(args)
+    scenarios = asyncio.run(run(args))
+
+    results = {
+        "commit": _commit(),
+        "database": engine.dialect.name,
+        "volumes": volumes(),
+        "load": {key: getattr(args, key) for key in ("sample_users", "requests", "concurrency", "seed")},
+        "scenarios": scenarios,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write("\n")
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(json.load(f), results)
@@ -0,0 +1,135 @@
+import argparse
+import os
+import re
+import sys
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DB_ADMIN", "sqlite:///query_plans.db")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event, insert
+from sqlmodel import Session, SQLModel
+
+from authorization.jwt_generator import create_access_token
+from connection import engine
+from main import app
+from models.budget import Budget
+from models.budget_category import BudgetCategory
+from models.category import Category
+from models.goal import Goal
+from models.transaction import Transaction
+from models.user import User
+from services.spend_rollup import rebuild
+
+LARGE_TABLES = {"transaction", "category_month_spend", "goal", "budget", "budgetcategory"}
+SQLITE_FULL_SCAN = re.compile(r"^SCAN (\w+)(?: AS \w+)?$")
+POSTGRES_FULL_SCAN = re.compile(r"Seq Scan on (\w+)")
+
+
+def seed(users: int, transactions: int) -> list[tuple[str, int, int]]:
+    SQLModel.metadata.drop_all(engine)
+    SQLModel.metadata.create_all(engine)
+    fixtures = []
+    with Session(engine) as session:
+        categories = [Category(name=f"category {i}", is_income=i == 0) for i in range(10)]
+        session.add_all(categories)
+        session.commit()
+        for n in range(users):
+            user = User(username=f"plan{n}", email=f"plan{n}@example.com", password_hash="x")
+            session.add(user)
+            session.commit()
+            budget = Budget(user_id=user.id, month=date(2025, 3, 1))
+            goal = Goal(user_id=user.id, title="goal", target_amount=1000, due_date=date(2026, 1, 1))
+            session.add_all([budget, goal])
+            session.commit()
+            session.add_all(BudgetCategory(budget_id=budget.id, category_id=c.id, limit_amount=100) for c in categories)
+            started = datetime(2023, 1, 1)
+            session.execute(insert(Transaction), [
+                {
+                    "user_id": user.id,
+                    "category_id": categories[i % len(categories)].id,
+                    "amount": i % 90 + 1,
+                    "type": "income" if i % 10 == 0 else "expense",
+                    "description": "seed",
+                    "date": started + timedelta(hours=i),
+                    "linked_object_type": ("goal", "budget", None)[i % 3],
+                    "linked_object_id": (goal.id, budget.id, None)[i % 3],
+                }
+                for i in range(transactions)
+            ])
+            session.commit()
+            token = create_access_token({"sub": user.username, "user_id": user.id, "ver": 0})
+            fixtures.append((token, budget.id, goal.id))
+        rebuild(session)
+    return fixtures
+
+
+def capture_statements(fixtures) -> dict:
+    statements = {}
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and not executemany:
+            statements.setdefault(statement, parameters)
+
+    event.listen(engine, "before_cursor_execute", record)
+    token, budget_id, goal_id = fixtures[0]
+    headers = {"Authorization": f"Bearer {token}"}
+    paths = [
+        "/api/v1/transactions/",
+        "/api/v1/transactions/?category_id=1&date_from=2024-01-01T00:00:00",
+        "/api/v1/transactions/?linked_object_type=goal&linked_object_id=%d" % goal_id,
+        "/api/v1/transactions/1",
+        "/api/v1/transactions/export",
+        "/api/v1/budgets/",
+        f"/api/v1/budgets/{budget_id}",
+        f"/api/v1/budgets/{budget_id}/details",
+        "/api/v1/goals/",
+        f"/api/v1/goals/{goal_id}",
+        f"/api/v1/goals/{goal_id}/details",
+        "/api/v1/categories/",
+        "/api/v1/budget-categories/",
+    ]
+    with TestClient(app, raise_server_exceptions=False) as client:
+        for path in paths:
+            client.get(path, headers=headers)
+    event.remove(engine, "before_cursor_execute", record)
+    return statements
+
+
+def full_scans(connection, statement: str, parameters) -> tuple[list[str], list[str]]:
+    cursor = connection.cursor()
+    if engine.dialect.name == "sqlite":
+        cursor.execute("EXPLAIN QUERY PLAN " + statement, parameters)
+        plan = [row[-1] for row in cursor.fetchall()]
+        scans = [m.group(1) for line in plan if (m := SQLITE_FULL_SCAN.match(line))]
+    else:
+        cursor.execute("SET enable_seqscan = off")
+        cursor.execute("EXPLAIN " + statement, parameters)
+        plan = [row[0] for row in cursor.fetchall()]
+        scans = [m.group(1) for line in plan for m in POSTGRES_FULL_SCAN.finditer(line)]
+    return plan, [table.strip('"') for table in scans if table.strip('"') in LARGE_TABLES]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fail if a router query plans a full scan of a large table")
+    parser.add_argument("--users", type=int, default=3)
+    parser.add_argument("--transactions", type=int, default=5000, help="transactions per user")
+    args = parser.parse_args()
+
+    engine.echo = False
+    statements = capture_statements(seed(args.users, args.transactions))
+
+    failures = 0
+    connection = engine.raw_connection()
+    try:
+        for statement, parameters in statements.items():
+            plan, scans = full_scans(connection, statement, parameters)
+            if scans:
+                failures += 1
+                print(f"FULL SCAN of {', '.join(scans)}:\n{statement}\n  " + "\n  ".join(plan) + "\n")
+    finally:
+        connection.close()
+
+    print(f"{len(statements)} queries checked, {failures} with full scans of large tables")
+    sys.exit(1 if failures else 0)
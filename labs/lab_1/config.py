@@ -0,0 +1,64 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def _echo(value: str):
+    value = value.lower()
+    if value == "debug":
+        return "debug"
+    return value in ("1", "true", "yes", "info")
+
+
+class DatabaseSettings:
+    POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 10))
+    MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 20))
+    POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+    POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+    POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+    STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", 0))
+    ECHO = _echo(os.getenv("DB_ECHO", "false"))
+    REPLICA_URLS = [url.strip() for url in os.getenv("DB_REPLICAS", "").split(",") if url.strip()]
+    REPLICA_MAX_LAG = float(os.getenv("DB_REPLICA_MAX_LAG", 5))
+    REPLICA_CHECK_INTERVAL = float(os.getenv("DB_REPLICA_CHECK_INTERVAL", 2))
+    STICKY_SECONDS = float(os.getenv("DB_STICKY_SECONDS", 5))
+
+db_settings = DatabaseSettings()
+
+
+class CacheSettings:
+    RESPONSE_CACHE_URL = os.getenv("RESPONSE_CACHE_URL", "")
+    RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", 300))
+    RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", 1024))
+
+cache_settings = CacheSettings()
+
+
+class OutboxSettings:
+    BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", 500))
+    POLL_INTERVAL = float(os.getenv("OUTBOX_POLL_INTERVAL", 1.0))
+    MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", 10))
+    EMBEDDED_WORKER = os.getenv("OUTBOX_EMBEDDED_WORKER", "true").lower() in ("1", "true", "yes")
+
+outbox_settings = OutboxSettings()
+
+
+class IdempotencySettings:
+    TTL = int(os.getenv("IDEMPOTENCY_TTL", 86400))
+
+idempotency_settings = IdempotencySettings()
+
+
+class MetricsSettings:
+    SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", 200))
+    QUERY_WARN_COUNT = int(os.getenv("QUERY_WARN_COUNT", 20))
+
+metrics_settings = MetricsSettings()
+
+
+class PartitionSettings:
+    TRANSACTION_HASH_PARTITIONS = int(os.getenv("TRANSACTION_HASH_PARTITIONS", 0))
+    TRANSACTION_MONTHS_AHEAD = int(os.getenv("TRANSACTION_MONTHS_AHEAD", 3))
+
+partition_settings = PartitionSettings()
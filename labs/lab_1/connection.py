@@ -1,15 +1,233 @@
+import hashlib
+import itertools
+import logging
 import os
+import threading
+import time
 from dotenv import load_dotenv
+from fastapi import Request
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from sqlmodel import SQLModel, Session, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from config import db_settings
+from services.ttl_cache import TTLCache
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+class PoolWaitTimer:
+    """Records how long callers wait to check a connection out of the pool."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._wait_lock = threading.Lock()
+        self.wait_count = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - started
+            with self._wait_lock:
+                self.wait_count += 1
+                self.wait_total += waited
+                self.wait_max = max(self.wait_max, waited)
+
+
+class TimedQueuePool(PoolWaitTimer, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(PoolWaitTimer, AsyncAdaptedQueuePool):
+    pass
+
+
+def get_async_url(url: str) -> str:
+    url = make_url(url)
+    return url.set(drivername=ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername)).render_as_string(hide_password=False)
+
+def engine_options(url: str, is_async: bool = False) -> dict:
+    options = {"echo": db_settings.ECHO, "pool_pre_ping": db_settings.POOL_PRE_PING}
+    url = make_url(url)
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return options
+
+    options.update(
+        poolclass=TimedAsyncQueuePool if is_async else TimedQueuePool,
+        pool_size=db_settings.POOL_SIZE,
+        max_overflow=db_settings.MAX_OVERFLOW,
+        pool_timeout=db_settings.POOL_TIMEOUT,
+        pool_recycle=db_settings.POOL_RECYCLE,
+    )
+    if db_settings.STATEMENT_TIMEOUT_MS and url.get_backend_name() == "postgresql":
+        timeout = str(db_settings.STATEMENT_TIMEOUT_MS)
+        if is_async:
+            options["connect_args"] = {"server_settings": {"statement_timeout": timeout}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={timeout}"}
+    return options
+
+def pool_stats(engine) -> dict:
+    pool = engine.pool
+    stats = {"pool": type(pool).__name__, "status": pool.status()}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            idle=pool.checkedin(),
+            overflow=pool.overflow(),
+        )
+    if isinstance(pool, PoolWaitTimer):
+        stats.update(
+            wait_count=pool.wait_count,
+            wait_avg_ms=pool.wait_total / pool.wait_count * 1000 if pool.wait_count else 0.0,
+            wait_max_ms=pool.wait_max * 1000,
+        )
+    return stats
+
 db_url = os.getenv('DB_ADMIN')
-engine = create_engine(db_url, echo=True)
+async_db_url = os.getenv('DB_ADMIN_ASYNC') or get_async_url(db_url)
+
+engine = create_engine(db_url, **engine_options(db_url))
+async_engine = create_async_engine(async_db_url, **engine_options(async_db_url, is_async=True))
+
+
+def replica_lag(replica) -> float:
+    """Seconds the replica is behind its primary; SQLite files are never behind.
+
+    A replica that has replayed all WAL it received is caught up, however long
+    ago the primary's last write was.
+    """
+    if replica.dialect.name != "postgresql":
+        return 0.0
+    with replica.connect() as conn:
+        return conn.execute(text(
+            "SELECT CASE "
+            "WHEN NOT pg_is_in_recovery() THEN 0 "
+            "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+            "ELSE coalesce(extract(epoch FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+        )).scalar_one()
+
+
+class ReplicaRouter:
+    """Picks the engine a read-only request should use.
+
+    Replicas whose lag exceeds ``max_lag`` (or that fail the lag probe) are
+    skipped until the next check. Clients that wrote within the last
+    ``sticky_seconds`` are pinned to the primary so they read their own writes.
+    """
+
+    def __init__(self, primary, replicas: list, max_lag: float, check_interval: float, sticky_seconds: float):
+        self.primary = primary
+        self.replicas = replicas
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.sticky_seconds = sticky_seconds
+        self.recent_writes = TTLCache(maxsize=100_000, ttl=sticky_seconds)
+        self._lags = {}
+        self._lock = threading.Lock()
+        self._next = itertools.count()
+
+    def lag(self, replica) -> float | None:
+        with self._lock:
+            checked, lag = self._lags.get(replica, (None, None))
+            if checked is not None and time.monotonic() - checked < self.check_interval:
+                return lag
+        try:
+            lag = replica_lag(replica)
+        except Exception:
+            logger.warning("replica %s failed its lag check", replica.url.render_as_string(), exc_info=True)
+            lag = None
+        with self._lock:
+            self._lags[replica] = (time.monotonic(), lag)
+        return lag
+
+    def engine_for(self, sticky_key: str | None = None):
+        if not self.replicas or (sticky_key is not None and self.recent_writes.get(sticky_key)):
+            return self.primary
+        healthy = [replica for replica in self.replicas if (lag := self.lag(replica)) is not None and lag <= self.max_lag]
+        if not healthy:
+            return self.primary
+        return healthy[next(self._next) % len(healthy)]
+
+    def mark_write(self, sticky_key: str):
+        self.recent_writes.set(sticky_key, True)
+
+    def stats(self) -> list[dict]:
+        return [
+            {
+                "url": replica.url.render_as_string(),
+                "lag": self._lags.get(replica, (None, None))[1],
+                "pool": pool_stats(replica),
+            }
+            for replica in self.replicas
+        ]
+
+
+def sticky_key(request: Request) -> str | None:
+    """Identify the client for read-your-writes stickiness by its bearer token."""
+    authorization = request.headers.get("authorization")
+    if not authorization:
+        return None
+    return hashlib.sha256(authorization.encode()).hexdigest()
+
+
+replica_engines = [create_engine(url, **engine_options(url)) for url in db_settings.REPLICA_URLS]
+replica_router = ReplicaRouter(
+    engine,
+    replica_engines,
+    max_lag=db_settings.REPLICA_MAX_LAG,
+    check_interval=db_settings.REPLICA_CHECK_INTERVAL,
+    sticky_seconds=db_settings.STICKY_SECONDS,
+)
+
+
+@event.listens_for(Session, "after_flush")
+def _flushed(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _executed(orm_execute_state):
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _committed(session):
+    key = session.info.get("sticky_key")
+    if key is not None and session.info.pop("wrote", False):
+        replica_router.mark_write(key)
+
 
 def init_db():
     SQLModel.metadata.create_all(engine)
 
-def get_session():
+def get_session(request: Request):
+    """Primary session; a commit with writes pins the client to the primary for a while."""
     with Session(engine) as session:
+        session.info["sticky_key"] = sticky_key(request)
+        yield session
+
+def get_read_session(request: Request):
+    """Session for read-only handlers, on a replica unless the client wrote recently."""
+    with Session(replica_router.engine_for(sticky_key(request))) as session:
+        yield session
+
+async def get_async_session():
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
         yield session
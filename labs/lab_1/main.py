@@ -1,17 +1,42 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.security import OAuth2PasswordBearer
 from fastapi.openapi.utils import get_openapi
 
-from connection import init_db
-from api import transactions, categories, goals, budgets, budget_categories, auth
+from authorization.hash_service import HashingUnavailable
+from config import outbox_settings
+from connection import init_db, engine, async_engine, replica_engines
+from services.metrics import MetricsMiddleware, instrument_engine
+from services.outbox import start_worker
+from api import transactions, categories, goals, budgets, budget_categories, auth, internal, analytics
 
 app = FastAPI()
+app.add_middleware(MetricsMiddleware)
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
+for replica in replica_engines:
+    instrument_engine(replica)
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/login")
 
 @app.on_event("startup")
 def on_startup():
     init_db()
+    if outbox_settings.EMBEDDED_WORKER:
+        app.state.outbox_worker = start_worker()
+
+@app.on_event("shutdown")
+def on_shutdown():
+    if getattr(app.state, "outbox_worker", None):
+        app.state.outbox_worker.set()
+
+@app.exception_handler(HashingUnavailable)
+def hashing_unavailable_handler(request: Request, exc: HashingUnavailable):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Authentication is temporarily overloaded, retry later"},
+        headers={"Retry-After": "1"},
+    )
 
 app.include_router(auth.router, prefix="/api/v1", tags=["Auth"])
 app.include_router(transactions.router, prefix="/api/v1", tags=["Transactions"])
@@ -19,6 +44,8 @@ app.include_router(categories.router, prefix="/api/v1", tags=["Categories"])
 app.include_router(budgets.router, prefix="/api/v1", tags=["Budgets"])
 app.include_router(goals.router, prefix="/api/v1", tags=["Goals"])
 app.include_router(budget_categories.router, prefix="/api/v1", tags=["BudgetCategories"])
+app.include_router(analytics.router, prefix="/api/v1", tags=["Analytics"])
+app.include_router(internal.router, tags=["Internal"])
 
 def custom_openapi():
     if app.openapi_schema:
@@ -88,3 +88,7 @@ from models.budget import Budget
 from models.budget_category import BudgetCategory
 from models.base import Base
 from models.goal import Goal
+from models.category_month_spend import CategoryMonthSpend
+from models.batch_checkpoint import BatchCheckpoint
+from models.outbox_event import OutboxEvent
+from models.idempotency_key import IdempotencyKey
@@ -0,0 +1,106 @@
+"""DDL helpers for the Postgres-partitioned ``transaction`` table.
+
+The table is range-partitioned by month on ``date``; each month can in turn be
+hash-partitioned by ``user_id``. Rows outside every month land in
+``transaction_default``. Used by the partitioning migration and by
+``services.partitions`` to create future months ahead of time.
+"""
+from datetime import date
+
+from sqlalchemy import text
+
+PARENT = "transaction"
+DEFAULT_PARTITION = "transaction_default"
+
+INDEXES = (
+    'CREATE INDEX IF NOT EXISTS ix_transaction_user_id_date_id ON "transaction" (user_id, date, id)',
+    'CREATE INDEX IF NOT EXISTS ix_transaction_user_id_category_id_date ON "transaction" (user_id, category_id, date)',
+    'CREATE INDEX IF NOT EXISTS ix_transaction_category_id_date ON "transaction" (category_id, date)',
+    'CREATE INDEX IF NOT EXISTS ix_transaction_linked_object_date ON "transaction" '
+    '(linked_object_type, linked_object_id, date) WHERE linked_object_id IS NOT NULL',
+)
+
+
+def next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def months_between(first: date, last: date) -> list[date]:
+    months, month = [], first.replace(day=1)
+    while month <= last:
+        months.append(month)
+        month = next_month(month)
+    return months
+
+
+def partition_name(month: date) -> str:
+    return f"transaction_{month:%Y_%m}"
+
+
+def is_partitioned(conn) -> bool:
+    return conn.execute(text("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('\"transaction\"')")).first() is not None
+
+
+def month_partitions(conn) -> list[str]:
+    return conn.execute(text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = to_regclass('\"transaction\"') AND c.relname <> :default ORDER BY c.relname"
+    ), {"default": DEFAULT_PARTITION}).scalars().all()
+
+
+def hash_partition_count(conn) -> int:
+    """How many user_id hash partitions the newest month has, 0 when months are not subpartitioned."""
+    months = month_partitions(conn)
+    if not months:
+        return 0
+    return conn.execute(
+        text("SELECT count(*) FROM pg_inherits WHERE inhparent = to_regclass(:name)"), {"name": months[-1]}
+    ).scalar_one()
+
+
+def create_parent(conn, source: str):
+    """Create the partitioned parent with ``source``'s columns, defaults and constraints."""
+    conn.execute(text(f'CREATE TABLE "{PARENT}" (LIKE {source} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) PARTITION BY RANGE (date)'))
+    conn.execute(text(f'ALTER TABLE "{PARENT}" ADD PRIMARY KEY (id, user_id, date)'))
+    conn.execute(text(f'ALTER TABLE "{PARENT}" ADD FOREIGN KEY (user_id) REFERENCES "user" (id)'))
+    conn.execute(text(f'ALTER TABLE "{PARENT}" ADD FOREIGN KEY (category_id) REFERENCES category (id)'))
+    conn.execute(text(f'CREATE TABLE {DEFAULT_PARTITION} PARTITION OF "{PARENT}" DEFAULT'))
+
+
+def create_indexes(conn):
+    for statement in INDEXES:
+        conn.execute(text(statement))
+
+
+def create_month_partition(conn, month: date, hash_partitions: int = 0) -> bool:
+    """Create the partition for ``month`` if it is missing; returns whether it was created.
+
+    Rows of that month already sitting in the default partition are moved into it.
+    """
+    name = partition_name(month)
+    if conn.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar() is not None:
+        return False
+
+    start, end = month, next_month(month)
+    bounds = {"start": start, "end": end}
+    stranded = conn.execute(
+        text(f"SELECT 1 FROM {DEFAULT_PARTITION} WHERE date >= :start AND date < :end LIMIT 1"), bounds
+    ).first() is not None
+    if stranded:
+        conn.execute(text(f'ALTER TABLE "{PARENT}" DETACH PARTITION {DEFAULT_PARTITION}'))
+
+    by_hash = " PARTITION BY HASH (user_id)" if hash_partitions else ""
+    conn.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF \"{PARENT}\" FOR VALUES FROM ('{start}') TO ('{end}'){by_hash}"
+    ))
+    for remainder in range(hash_partitions):
+        conn.execute(text(
+            f'CREATE TABLE IF NOT EXISTS {name}_h{remainder} PARTITION OF {name} '
+            f'FOR VALUES WITH (MODULUS {hash_partitions}, REMAINDER {remainder})'
+        ))
+
+    if stranded:
+        conn.execute(text(f'INSERT INTO "{PARENT}" SELECT * FROM {DEFAULT_PARTITION} WHERE date >= :start AND date < :end'), bounds)
+        conn.execute(text(f"DELETE FROM {DEFAULT_PARTITION} WHERE date >= :start AND date < :end"), bounds)
+        conn.execute(text(f'ALTER TABLE "{PARENT}" ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT'))
+    return True
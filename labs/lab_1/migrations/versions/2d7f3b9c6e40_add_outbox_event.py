@@ -0,0 +1,45 @@
+"""Add outbox_event
+
+Revision ID: 2d7f3b9c6e40
+Revises: 9a4c6e2d8b15
+Create Date: 2025-06-07 18:41:09.276318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2d7f3b9c6e40'
+down_revision: Union[str, None] = '9a4c6e2d8b15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('outbox_event',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('key', sa.String(), nullable=False),
+    sa.Column('kind', sa.String(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('last_error', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('processed_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('key')
+    )
+    op.create_index('ix_outbox_event_pending', 'outbox_event', ['id'], unique=False, postgresql_where=sa.text('processed_at IS NULL'))
+    op.create_index('ix_outbox_event_pending_user_id', 'outbox_event', ['user_id'], unique=False, postgresql_where=sa.text('processed_at IS NULL'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_outbox_event_pending_user_id', table_name='outbox_event')
+    op.drop_index('ix_outbox_event_pending', table_name='outbox_event')
+    op.drop_table('outbox_event')
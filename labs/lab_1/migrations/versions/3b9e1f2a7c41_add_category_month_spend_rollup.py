@@ -0,0 +1,52 @@
+"""Add category_month_spend rollup
+
+Revision ID: 3b9e1f2a7c41
+Revises: 
+Create Date: 2025-05-12 19:04:11.518203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9e1f2a7c41'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('category_month_spend',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('category_id', sa.Integer(), nullable=False),
+    sa.Column('month', sa.Date(), nullable=False),
+    sa.Column('income_sum', sa.Numeric(), nullable=False),
+    sa.Column('expense_sum', sa.Numeric(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['category_id'], ['category.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'category_id', 'month')
+    )
+    op.create_index('ix_category_month_spend_category_id_month', 'category_month_spend', ['category_id', 'month'], unique=False)
+    op.execute(
+        """
+        INSERT INTO category_month_spend (user_id, category_id, month, income_sum, expense_sum, count)
+        SELECT user_id, category_id, date_trunc('month', date)::date,
+               coalesce(sum(amount) FILTER (WHERE type = 'income'), 0),
+               coalesce(sum(amount) FILTER (WHERE type = 'expense'), 0),
+               count(*)
+        FROM "transaction"
+        GROUP BY user_id, category_id, date_trunc('month', date)
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_category_month_spend_category_id_month', table_name='category_month_spend')
+    op.drop_table('category_month_spend')
@@ -0,0 +1,30 @@
+"""Add transaction listing indexes
+
+Revision ID: 5f7a9c3e2b18
+Revises: 8d2c4e6f1a93
+Create Date: 2025-05-19 18:42:03.771526
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f7a9c3e2b18'
+down_revision: Union[str, None] = '8d2c4e6f1a93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_transaction_user_id_date_id', 'transaction', ['user_id', 'date', 'id'], unique=False)
+    op.create_index('ix_transaction_user_id_category_id_date', 'transaction', ['user_id', 'category_id', 'date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_transaction_user_id_category_id_date', table_name='transaction')
+    op.drop_index('ix_transaction_user_id_date_id', table_name='transaction')
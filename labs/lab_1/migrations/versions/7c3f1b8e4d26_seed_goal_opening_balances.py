@@ -0,0 +1,157 @@
+"""Turn seeded goal amounts into opening-balance transactions
+
+Goal.current_amount is the sum of the goal's linked transactions, and the
+goals batch job resets it to that. Amounts clients seeded through GoalCreate
+become one linked "Opening balance" transaction per goal, dated at the goal's
+creation, so the job keeps them. Run it with the outbox drained and before the
+first goals run.
+
+Revision ID: 7c3f1b8e4d26
+Revises: b5d9e2f7a318
+Create Date: 2025-06-20 19:41:06.274810
+
+"""
+from collections import defaultdict
+from decimal import Decimal
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c3f1b8e4d26'
+down_revision: Union[str, None] = 'b5d9e2f7a318'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+OPENING_BALANCE = 'Opening balance'
+
+user = sa.table('user', sa.column('id', sa.Integer), sa.column('data_version', sa.Integer))
+category = sa.table('category', sa.column('id', sa.Integer), sa.column('name', sa.String), sa.column('is_income', sa.Boolean))
+goal = sa.table(
+    'goal',
+    sa.column('id', sa.Integer),
+    sa.column('user_id', sa.Integer),
+    sa.column('current_amount', sa.Numeric),
+    sa.column('created_at', sa.DateTime),
+    sa.column('version', sa.Integer),
+)
+transaction = sa.table(
+    'transaction',
+    sa.column('id', sa.Integer),
+    sa.column('user_id', sa.Integer),
+    sa.column('category_id', sa.Integer),
+    sa.column('amount', sa.Numeric),
+    sa.column('type', sa.String),
+    sa.column('description', sa.String),
+    sa.column('date', sa.DateTime),
+    sa.column('linked_object_id', sa.Integer),
+    sa.column('linked_object_type', sa.String),
+)
+spend = sa.table(
+    'category_month_spend',
+    sa.column('id', sa.Integer),
+    sa.column('user_id', sa.Integer),
+    sa.column('category_id', sa.Integer),
+    sa.column('month', sa.Date),
+    sa.column('income_sum', sa.Numeric),
+    sa.column('expense_sum', sa.Numeric),
+    sa.column('count', sa.Integer),
+)
+
+
+def _opening_category(conn, create: bool):
+    category_id = conn.execute(
+        sa.select(sa.func.min(category.c.id)).where(category.c.name == OPENING_BALANCE, category.c.is_income.is_(True))
+    ).scalar()
+    if category_id is None and create:
+        category_id = conn.execute(
+            category.insert().values(name=OPENING_BALANCE, is_income=True).returning(category.c.id)
+        ).scalar_one()
+    return category_id
+
+
+def _add_to_rollup(conn, rows, sign: int):
+    """Add (or with ``sign`` -1 remove) ``rows`` in category_month_spend."""
+    deltas = defaultdict(lambda: [Decimal(0), Decimal(0), 0])
+    for row in rows:
+        key = (row['user_id'], row['category_id'], row['date'].date().replace(day=1))
+        deltas[key][0 if row['type'] == 'income' else 1] += sign * row['amount']
+        deltas[key][2] += sign
+
+    for (user_id, category_id, month), (income, expense, count) in deltas.items():
+        where = (spend.c.user_id == user_id, spend.c.category_id == category_id, spend.c.month == month)
+        updated = conn.execute(
+            spend.update().where(*where).values(
+                income_sum=spend.c.income_sum + income,
+                expense_sum=spend.c.expense_sum + expense,
+                count=spend.c.count + count,
+            )
+        )
+        if not updated.rowcount and sign > 0:
+            conn.execute(spend.insert().values(
+                user_id=user_id, category_id=category_id, month=month, income_sum=income, expense_sum=expense, count=count,
+            ))
+
+
+def _bump(conn, rows):
+    conn.execute(user.update().where(user.c.id.in_({row['user_id'] for row in rows})).values(data_version=user.c.data_version + 1))
+    conn.execute(goal.update().where(goal.c.id.in_({row['linked_object_id'] for row in rows})).values(version=goal.c.version + 1))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    conn = op.get_bind()
+    signed = sa.case((transaction.c.type == 'income', transaction.c.amount), else_=-transaction.c.amount)
+    linked = (
+        sa.select(transaction.c.linked_object_id.label('goal_id'), sa.func.sum(signed).label('amount'))
+        .where(transaction.c.linked_object_type == 'goal')
+        .group_by(transaction.c.linked_object_id)
+        .subquery()
+    )
+    seeded = conn.execute(
+        sa.select(goal.c.id, goal.c.user_id, goal.c.created_at, goal.c.current_amount - sa.func.coalesce(linked.c.amount, 0))
+        .select_from(goal.outerjoin(linked, linked.c.goal_id == goal.c.id))
+        .where(goal.c.current_amount != sa.func.coalesce(linked.c.amount, 0))
+    ).all()
+    if not seeded:
+        return
+
+    category_id = _opening_category(conn, create=True)
+    rows = [
+        {
+            'user_id': user_id,
+            'category_id': category_id,
+            'amount': abs(Decimal(amount)),
+            'type': 'income' if amount > 0 else 'expense',
+            'description': OPENING_BALANCE,
+            'date': created_at,
+            'linked_object_id': goal_id,
+            'linked_object_type': 'goal',
+        }
+        for goal_id, user_id, created_at, amount in seeded
+    ]
+    conn.execute(transaction.insert(), rows)
+    _add_to_rollup(conn, rows, 1)
+    _bump(conn, rows)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    conn = op.get_bind()
+    category_id = _opening_category(conn, create=False)
+    if category_id is None:
+        return
+
+    opening = (
+        transaction.c.category_id == category_id,
+        transaction.c.description == OPENING_BALANCE,
+        transaction.c.linked_object_type == 'goal',
+    )
+    rows = [row._asdict() for row in conn.execute(sa.select(transaction).where(*opening)).all()]
+    if not rows:
+        return
+    conn.execute(transaction.delete().where(*opening))
+    _add_to_rollup(conn, rows, -1)
+    _bump(conn, rows)
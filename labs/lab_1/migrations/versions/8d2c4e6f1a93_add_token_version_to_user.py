@@ -0,0 +1,28 @@
+"""Add token_version to user
+
+Revision ID: 8d2c4e6f1a93
+Revises: 3b9e1f2a7c41
+Create Date: 2025-05-14 21:27:40.102958
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2c4e6f1a93'
+down_revision: Union[str, None] = '3b9e1f2a7c41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('user', sa.Column('token_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('user', 'token_version')
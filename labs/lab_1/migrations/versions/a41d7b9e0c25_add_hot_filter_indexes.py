@@ -0,0 +1,40 @@
+"""Add hot filter indexes
+
+Revision ID: a41d7b9e0c25
+Revises: 5f7a9c3e2b18
+Create Date: 2025-05-23 20:11:56.348107
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a41d7b9e0c25'
+down_revision: Union[str, None] = '5f7a9c3e2b18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_transaction_category_id_date', 'transaction', ['category_id', 'date'], unique=False)
+    op.create_index(
+        'ix_transaction_linked_object_date', 'transaction',
+        ['linked_object_type', 'linked_object_id', 'date'], unique=False,
+        postgresql_where=sa.text('linked_object_id IS NOT NULL'),
+    )
+    op.create_index(op.f('ix_budget_user_id'), 'budget', ['user_id'], unique=False)
+    op.create_index(op.f('ix_goal_user_id'), 'goal', ['user_id'], unique=False)
+    op.create_index(op.f('ix_budgetcategory_budget_id'), 'budgetcategory', ['budget_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_budgetcategory_budget_id'), table_name='budgetcategory')
+    op.drop_index(op.f('ix_goal_user_id'), table_name='goal')
+    op.drop_index(op.f('ix_budget_user_id'), table_name='budget')
+    op.drop_index('ix_transaction_linked_object_date', table_name='transaction')
+    op.drop_index('ix_transaction_category_id_date', table_name='transaction')
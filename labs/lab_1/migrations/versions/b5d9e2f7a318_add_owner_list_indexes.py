@@ -0,0 +1,34 @@
+"""Replace goal/budget user_id indexes with (user_id, id)
+
+Revision ID: b5d9e2f7a318
+Revises: f18c3a7d5e92
+Create Date: 2025-06-14 18:22:40.913527
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5d9e2f7a318'
+down_revision: Union[str, None] = 'f18c3a7d5e92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_goal_user_id_id', 'goal', ['user_id', 'id'], unique=False)
+    op.create_index('ix_budget_user_id_id', 'budget', ['user_id', 'id'], unique=False)
+    op.drop_index(op.f('ix_goal_user_id'), table_name='goal')
+    op.drop_index(op.f('ix_budget_user_id'), table_name='budget')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(op.f('ix_budget_user_id'), 'budget', ['user_id'], unique=False)
+    op.create_index(op.f('ix_goal_user_id'), 'goal', ['user_id'], unique=False)
+    op.drop_index('ix_budget_user_id_id', table_name='budget')
+    op.drop_index('ix_goal_user_id_id', table_name='goal')
@@ -0,0 +1,30 @@
+"""Add version to budget and goal
+
+Revision ID: c7e2f5a8d914
+Revises: a41d7b9e0c25
+Create Date: 2025-05-27 19:36:22.904417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e2f5a8d914'
+down_revision: Union[str, None] = 'a41d7b9e0c25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('budget', sa.Column('version', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('goal', sa.Column('version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('goal', 'version')
+    op.drop_column('budget', 'version')
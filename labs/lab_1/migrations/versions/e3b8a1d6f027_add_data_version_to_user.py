@@ -0,0 +1,28 @@
+"""Add data_version to user
+
+Revision ID: e3b8a1d6f027
+Revises: c7e2f5a8d914
+Create Date: 2025-06-02 20:05:48.617330
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3b8a1d6f027'
+down_revision: Union[str, None] = 'c7e2f5a8d914'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('user', sa.Column('data_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('user', 'data_version')
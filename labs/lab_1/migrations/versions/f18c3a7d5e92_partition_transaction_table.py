@@ -0,0 +1,65 @@
+"""Partition transaction by month and optionally by user_id hash
+
+Revision ID: f18c3a7d5e92
+Revises: 6b1e8d4f2a73
+Create Date: 2025-06-12 20:47:15.602941
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from config import partition_settings
+from migrations.partitioning import create_indexes, create_month_partition, create_parent, months_between, next_month
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f18c3a7d5e92'
+down_revision: Union[str, None] = '6b1e8d4f2a73'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _months_ahead(today: date) -> date:
+    month = today.replace(day=1)
+    for _ in range(partition_settings.TRANSACTION_MONTHS_AHEAD):
+        month = next_month(month)
+    return month
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    conn = op.get_bind()
+    if conn.dialect.name != "postgresql":
+        return
+
+    op.execute('ALTER TABLE "transaction" RENAME TO transaction_unpartitioned')
+    create_parent(conn, "transaction_unpartitioned")
+
+    first = conn.execute(sa.text("SELECT min(date) FROM transaction_unpartitioned")).scalar()
+    for month in months_between(first.date() if first else date.today(), _months_ahead(date.today())):
+        create_month_partition(conn, month, partition_settings.TRANSACTION_HASH_PARTITIONS)
+
+    op.execute('INSERT INTO "transaction" SELECT * FROM transaction_unpartitioned')
+    op.execute('ALTER SEQUENCE transaction_id_seq OWNED BY "transaction".id')
+    op.execute('DROP TABLE transaction_unpartitioned')
+    create_indexes(conn)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    conn = op.get_bind()
+    if conn.dialect.name != "postgresql":
+        return
+
+    op.execute('CREATE TABLE transaction_unpartitioned (LIKE "transaction" INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+    op.execute('INSERT INTO transaction_unpartitioned SELECT * FROM "transaction"')
+    op.execute('ALTER SEQUENCE transaction_id_seq OWNED BY transaction_unpartitioned.id')
+    op.execute('DROP TABLE "transaction" CASCADE')
+    op.execute('ALTER TABLE transaction_unpartitioned RENAME TO "transaction"')
+    op.execute('ALTER TABLE "transaction" ADD PRIMARY KEY (id)')
+    op.execute('ALTER TABLE "transaction" ADD FOREIGN KEY (user_id) REFERENCES "user" (id)')
+    op.execute('ALTER TABLE "transaction" ADD FOREIGN KEY (category_id) REFERENCES category (id)')
+    create_indexes(conn)
@@ -0,0 +1,13 @@
+from datetime import datetime
+from typing import Optional
+from sqlmodel import SQLModel, Field
+
+class BatchCheckpoint(SQLModel, table=True):
+    __tablename__ = "batch_checkpoint"
+    job: str = Field(primary_key=True)
+    last_user_id: int = Field(default=0)
+    users: int = Field(default=0)
+    changed: int = Field(default=0)
+    started_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    finished_at: Optional[datetime] = None
@@ -1,18 +1,20 @@
 from datetime import datetime, date
 from decimal import Decimal
 from typing import List, Optional
-from sqlmodel import SQLModel, Field, Relationship
+from sqlmodel import SQLModel, Field, Index, Relationship
 
 from models.transaction import Transaction
 
 
 class Budget(SQLModel, table=True):
     __tablename__ = "budget"
+    __table_args__ = (Index("ix_budget_user_id_id", "user_id", "id"),)
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="user.id")
     month: date
     current_amount: Decimal = Field(default=0)
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    version: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
 
     user: Optional["User"] = Relationship(back_populates="budgets")
     categories: List["BudgetCategory"] = Relationship(back_populates="budget")
\ No newline at end of file
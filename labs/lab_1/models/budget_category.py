@@ -5,7 +5,7 @@ from sqlmodel import SQLModel, Field, Relationship
 class BudgetCategory(SQLModel, table=True):
     __tablename__ = "budgetcategory"
     id: Optional[int] = Field(default=None, primary_key=True)
-    budget_id: int = Field(foreign_key="budget.id")
+    budget_id: int = Field(foreign_key="budget.id", index=True)
     category_id: int = Field(foreign_key="category.id")
     limit_amount: Decimal
 
@@ -0,0 +1,18 @@
+from datetime import date
+from decimal import Decimal
+from typing import Optional
+from sqlmodel import SQLModel, Field, Index, UniqueConstraint
+
+class CategoryMonthSpend(SQLModel, table=True):
+    __tablename__ = "category_month_spend"
+    __table_args__ = (
+        UniqueConstraint("user_id", "category_id", "month"),
+        Index("ix_category_month_spend_category_id_month", "category_id", "month"),
+    )
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="user.id")
+    category_id: int = Field(foreign_key="category.id")
+    month: date
+    income_sum: Decimal = Field(default=0)
+    expense_sum: Decimal = Field(default=0)
+    count: int = Field(default=0)
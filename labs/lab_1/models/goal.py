@@ -1,10 +1,11 @@
 from datetime import datetime, date
 from typing import Optional
 from decimal import Decimal
-from sqlmodel import SQLModel, Field, Relationship
+from sqlmodel import SQLModel, Field, Index, Relationship
 
 class Goal(SQLModel, table=True):
     __tablename__ = "goal"
+    __table_args__ = (Index("ix_goal_user_id_id", "user_id", "id"),)
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="user.id")
     title: str
@@ -12,5 +13,6 @@ class Goal(SQLModel, table=True):
     current_amount: Decimal = 0
     due_date: date
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    version: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
 
     user: Optional["User"] = Relationship(back_populates="goals")
\ No newline at end of file
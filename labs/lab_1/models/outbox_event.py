@@ -0,0 +1,30 @@
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import JSON, Column, text
+from sqlmodel import SQLModel, Field, Index
+
+class OutboxEvent(SQLModel, table=True):
+    __tablename__ = "outbox_event"
+    __table_args__ = (
+        Index(
+            "ix_outbox_event_pending",
+            "id",
+            postgresql_where=text("processed_at IS NULL"),
+            sqlite_where=text("processed_at IS NULL"),
+        ),
+        Index(
+            "ix_outbox_event_pending_user_id",
+            "user_id",
+            postgresql_where=text("processed_at IS NULL"),
+            sqlite_where=text("processed_at IS NULL"),
+        ),
+    )
+    id: Optional[int] = Field(default=None, primary_key=True)
+    key: str = Field(unique=True)
+    kind: str
+    user_id: int = Field(foreign_key="user.id")
+    payload: dict = Field(sa_column=Column(JSON, nullable=False))
+    attempts: int = Field(default=0)
+    last_error: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    processed_at: Optional[datetime] = None
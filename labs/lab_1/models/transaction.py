@@ -2,7 +2,8 @@ from datetime import datetime
 from typing import Optional
 from decimal import Decimal
 from enum import Enum
-from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import text
+from sqlmodel import SQLModel, Field, Index, Relationship
 
 class TransactionType(str, Enum):
     income = "income"
@@ -14,6 +15,17 @@ class LinkedObjectType(str, Enum):
 
 class Transaction(SQLModel, table=True):
     __tablename__ = "transaction"
+    __table_args__ = (
+        Index("ix_transaction_user_id_date_id", "user_id", "date", "id"),
+        Index("ix_transaction_user_id_category_id_date", "user_id", "category_id", "date"),
+        Index("ix_transaction_category_id_date", "category_id", "date"),
+        Index(
+            "ix_transaction_linked_object_date",
+            "linked_object_type", "linked_object_id", "date",
+            postgresql_where=text("linked_object_id IS NOT NULL"),
+            sqlite_where=text("linked_object_id IS NOT NULL"),
+        ),
+    )
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="user.id")
     category_id: int = Field(foreign_key="category.id")
@@ -8,6 +8,8 @@ class User(SQLModel, table=True):
     username: str = Field(unique=True, nullable=False)
     email: str = Field(unique=True, nullable=False)
     password_hash: str
+    token_version: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    data_version: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
     transactions: List["Transaction"] = Relationship(back_populates="user")
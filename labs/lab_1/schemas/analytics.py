@@ -0,0 +1,23 @@
+from datetime import date
+from decimal import Decimal
+from typing import Dict, List, Optional, Union
+
+from sqlmodel import SQLModel
+
+
+class SpendPoint(SQLModel):
+    period: date
+    total: Decimal
+    count: int
+    rolling_avg: Optional[Decimal] = None
+
+class SpendSeries(SQLModel):
+    key: Dict[str, Union[int, str, None]]
+    points: List[SpendPoint]
+
+class SpendAnalytics(SQLModel):
+    bucket: str
+    group_by: List[str]
+    date_from: date
+    date_to: date
+    series: List[SpendSeries]
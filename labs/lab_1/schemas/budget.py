@@ -1,5 +1,5 @@
 from datetime import date, datetime
-from typing import List
+from typing import List, Optional
 from sqlmodel import SQLModel, Field
 from schemas.category import CategoryRead
 
@@ -17,7 +17,7 @@ class BudgetCategoryRead(SQLModel):
     category_id: int
     limit_amount: float
     category: CategoryRead
-    current_amount: float
+    current_amount: float = 0.0
 
     class Config:
         orm_mode = True
@@ -52,4 +52,18 @@ class BudgetUpdate(SQLModel):
     categories: List[BudgetCategoryUpdate]
 
     class Config:
-        orm_mode = True
\ No newline at end of file
+        orm_mode = True
+
+class CategoryForecast(SQLModel):
+    category_id: int
+    budget_id: Optional[int] = None
+    limit_amount: float
+    month_to_date: float
+    projected: float
+    seasonal_index: float
+    over_limit: bool
+
+class BudgetForecast(SQLModel):
+    month: date
+    as_of: date
+    categories: List[CategoryForecast]
@@ -2,6 +2,7 @@ from datetime import date, datetime
 from decimal import Decimal
 from typing import Optional, List
 
+from pydantic import field_validator
 from sqlmodel import SQLModel
 
 
@@ -12,7 +13,13 @@ class GoalBase(SQLModel):
     due_date: date
 
 class GoalCreate(GoalBase):
-    pass
+    @field_validator("current_amount")
+    @classmethod
+    def starts_empty(cls, value: Decimal) -> Decimal:
+        # progress is the sum of goal-linked transactions; the nightly recompute would drop a seeded amount
+        if value:
+            raise ValueError("must be 0, deposit with an income transaction linked to the goal")
+        return value
 
 class GoalUpdate(SQLModel):
     name: Optional[str] = None
@@ -38,7 +45,7 @@ class GoalRead(GoalBase):
     user_id: int
     created_at: datetime
     due_date: datetime
-    transactions: List[TransactionRead]
+    transactions: List[TransactionRead] = []
 
     class Config:
         orm_mode = True
\ No newline at end of file
@@ -1,8 +1,9 @@
 from datetime import datetime
 from decimal import Decimal
 from enum import Enum
-from typing import Optional
+from typing import List, Optional
 
+from pydantic import field_validator
 from sqlmodel import SQLModel
 
 from models.transaction import LinkedObjectType
@@ -30,11 +31,42 @@ class TransactionRead(TransactionBase):
     class Config:
         orm_mode = True
 
+class TransactionPage(SQLModel):
+    items: List[TransactionRead]
+    next_cursor: Optional[str] = None
+
+class TransactionImportError(SQLModel):
+    row: int
+    errors: List[str]
+
+class TransactionImportResult(SQLModel):
+    received: int
+    inserted: int
+    errors: List[TransactionImportError]
+
+class TransactionFilters(SQLModel):
+    date_from: Optional[datetime] = None
+    date_to: Optional[datetime] = None
+    category_id: Optional[int] = None
+    type: Optional[TransactionType] = None
+    linked_object_type: Optional[LinkedObjectType] = None
+    linked_object_id: Optional[int] = None
+    amount_min: Optional[Decimal] = None
+    amount_max: Optional[Decimal] = None
+
 class TransactionUpdate(SQLModel):
     category_id: Optional[int] = None
     type: Optional[TransactionType] = None
     description: Optional[str] = None
     amount: Optional[Decimal] = None
-    date: Optional[str] = None
+    date: Optional[datetime] = None
     linked_object_id: Optional[int] = None
-    linked_object_type: Optional[LinkedObjectType] = None
\ No newline at end of file
+    linked_object_type: Optional[LinkedObjectType] = None
+
+    @field_validator("category_id", "type", "amount", "date")
+    @classmethod
+    def not_null(cls, value):
+        # omitted means "keep"; these columns are NOT NULL, so an explicit null can't be stored
+        if value is None:
+            raise ValueError("may be omitted but not null")
+        return value
\ No newline at end of file
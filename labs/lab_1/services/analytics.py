@@ -0,0 +1,119 @@
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from enum import Enum
+from itertools import accumulate
+
+from sqlalchemy import func
+from sqlmodel import Session
+
+from models.transaction import Transaction, TransactionType
+from schemas.analytics import SpendAnalytics, SpendPoint, SpendSeries
+from schemas.transaction import TransactionFilters
+from services.time_buckets import bucket_count, bucket_range, time_bucket, to_date
+from services.transaction_query import filter_transactions
+
+DIMENSIONS = {
+    "category": (Transaction.category_id,),
+    "type": (Transaction.type,),
+    "linked_object": (Transaction.linked_object_type, Transaction.linked_object_id),
+}
+DEFAULT_PERIOD = timedelta(days=730)
+MAX_PERIODS = 2000
+
+
+class InvalidWindow(ValueError):
+    pass
+
+
+def _naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value
+    try:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    except OverflowError as exc:
+        raise InvalidWindow(f"{value.isoformat()} is out of range") from exc
+
+
+def spend_window(filters: TransactionFilters, bucket: str) -> TransactionFilters:
+    """Fill in the default window and reject ones that can't be densified.
+
+    ``date_to`` defaults to now and ``date_from`` to ``DEFAULT_PERIOD`` before it,
+    clamped to datetime.min. The window must be non-empty and span at most
+    ``MAX_PERIODS`` buckets.
+    """
+    date_to = _naive_utc(filters.date_to or datetime.utcnow())
+    if filters.date_from:
+        date_from = _naive_utc(filters.date_from)
+    else:
+        date_from = date_to - min(DEFAULT_PERIOD, date_to - datetime.min)
+    if date_from >= date_to:
+        raise InvalidWindow("date_from must be before date_to")
+    periods = bucket_count(date_from, date_to - timedelta(microseconds=1), bucket)
+    if periods > MAX_PERIODS:
+        raise InvalidWindow(f"The window spans {periods} {bucket} buckets, at most {MAX_PERIODS} are allowed")
+    return filters.model_copy(update={"date_from": date_from, "date_to": date_to})
+
+
+def rolling_mean(values: list, window: int) -> list:
+    """Trailing mean over ``window`` buckets in O(n) using prefix sums."""
+    prefix = [Decimal(0), *accumulate(values)]
+    return [
+        (prefix[i + 1] - prefix[max(0, i + 1 - window)]) / min(i + 1, window)
+        for i in range(len(values))
+    ]
+
+
+def _plain(value):
+    return value.value if isinstance(value, Enum) else value
+
+
+def spend_series(
+    session: Session,
+    user_id: int,
+    filters: TransactionFilters,
+    group_by: list[str],
+    bucket: str,
+    rolling: int = 0,
+) -> SpendAnalytics:
+    """Sum transactions per group and time bucket in SQL, then densify each series.
+
+    ``filters`` must come from ``spend_window``. Without ``type`` among the
+    dimensions (or a type filter) only expenses count.
+    """
+    date_from, date_to = filters.date_from, filters.date_to
+
+    columns = [column for dimension in group_by for column in DIMENSIONS[dimension]]
+    period = time_bucket(session, Transaction.date, bucket).label("period")
+    query = filter_transactions(
+        user_id, filters, *columns, period, func.sum(Transaction.amount), func.count()
+    ).group_by(*columns, period)
+    if "type" not in group_by and filters.type is None:
+        query = query.where(Transaction.type == TransactionType.expense)
+
+    totals = defaultdict(dict)
+    for row in session.execute(query).all():
+        key = tuple(_plain(value) for value in row[:len(columns)])
+        totals[key][to_date(row[-3])] = (row[-2] or Decimal(0), row[-1])
+
+    periods = bucket_range(date_from, date_to - timedelta(microseconds=1), bucket)
+    names = [column.key for column in columns]
+    series = []
+    for key, by_period in sorted(totals.items(), key=lambda item: tuple(str(value) for value in item[0])):
+        values = [by_period.get(p, (Decimal(0), 0)) for p in periods]
+        averages = rolling_mean([total for total, _ in values], rolling) if rolling else [None] * len(values)
+        series.append(SpendSeries(
+            key=dict(zip(names, key)),
+            points=[
+                SpendPoint(period=p, total=total, count=count, rolling_avg=average)
+                for p, (total, count), average in zip(periods, values, averages)
+            ],
+        ))
+
+    return SpendAnalytics(
+        bucket=bucket,
+        group_by=group_by,
+        date_from=to_date(date_from),
+        date_to=to_date(date_to),
+        series=series,
+    )
@@ -0,0 +1,210 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from functools import partial
+
+from sqlalchemy import func, insert
+from sqlmodel import Session, select
+
+from connection import engine, init_db
+from models.batch_checkpoint import BatchCheckpoint
+from models.budget import Budget
+from models.budget_category import BudgetCategory
+from models.category import Category  # noqa: F401  resolves BudgetCategory.category
+from models.goal import Goal
+from models.transaction import LinkedObjectType
+from models.user import User
+from services.budget_spend import month_range
+from services.entity_versions import bump_category_months
+from services.linked_balances import recompute_linked
+from services.outbox import pending_users
+from services.response_cache import response_cache, budget_categories_key
+from services.spend_rollup import repair
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def _count_users(session: Session, first_id: int, last_id: int) -> int:
+    return session.execute(select(func.count(User.id)).where(User.id > first_id, User.id <= last_id)).scalar_one()
+
+
+def _lock_users(session: Session, first_id: int, last_id: int):
+    """Row-lock the chunk's users until this chunk commits.
+
+    Requests and outbox drains bump User.data_version in the same transaction
+    that adds a transaction or applies its deltas, so with these locks held
+    the pending-event check and the totals read see the same transactions.
+    """
+    session.execute(
+        select(User.id).where(User.id > first_id, User.id <= last_id).order_by(User.id).with_for_update()
+    ).all()
+
+
+def rollover_chunk(first_id: int, last_id: int, month: date) -> dict:
+    """Copy each user's ``month`` budget and its category limits into the next month.
+
+    Users who already have a budget next month are skipped, so reruns are no-ops.
+    """
+    start, end = month_range(month)
+    next_end = month_range(end)[1]
+    in_chunk = (Budget.user_id > first_id, Budget.user_id <= last_id)
+
+    with Session(engine) as session:
+        sources = session.execute(
+            select(Budget.user_id, func.max(Budget.id))
+            .where(
+                *in_chunk,
+                Budget.month >= start,
+                Budget.month < end,
+                Budget.user_id.not_in(select(Budget.user_id).where(*in_chunk, Budget.month >= end, Budget.month < next_end)),
+            )
+            .group_by(Budget.user_id)
+        ).all()
+        if sources:
+            created = session.scalars(
+                insert(Budget).returning(Budget.id, sort_by_parameter_order=True),
+                [
+                    {"user_id": user_id, "month": end, "current_amount": 0, "created_at": datetime.utcnow(), "version": 0}
+                    for user_id, _ in sources
+                ],
+            ).all()
+            new_ids = dict(zip((budget_id for _, budget_id in sources), created))
+            limits = session.execute(
+                select(BudgetCategory.budget_id, BudgetCategory.category_id, BudgetCategory.limit_amount)
+                .where(BudgetCategory.budget_id.in_(new_ids))
+            ).all()
+            if limits:
+                session.execute(insert(BudgetCategory), [
+                    {"budget_id": new_ids[budget_id], "category_id": category_id, "limit_amount": limit_amount}
+                    for budget_id, category_id, limit_amount in limits
+                ])
+        users = _count_users(session, first_id, last_id)
+        session.commit()
+    response_cache.invalidate(*(budget_categories_key(user_id) for user_id, _ in sources))
+    return {"users": users, "changed": len(sources)}
+
+
+def goals_chunk(first_id: int, last_id: int, month: date) -> dict:
+    """Recompute goal current_amount from linked transactions.
+
+    Users with undrained outbox events are skipped, their balances are still in flight.
+    """
+    with Session(engine) as session:
+        _lock_users(session, first_id, last_id)
+        skip = pending_users(session, first_id, last_id)
+        changed = recompute_linked(
+            session, LinkedObjectType.goal, Goal.user_id > first_id, Goal.user_id <= last_id, Goal.user_id.not_in(skip)
+        )
+        users = _count_users(session, first_id, last_id)
+        session.commit()
+    return {"users": users, "changed": changed}
+
+
+def reconcile_chunk(first_id: int, last_id: int, month: date) -> dict:
+    """Repair drifted category_month_spend rows and budget balances, skipping users with undrained outbox events."""
+    with Session(engine) as session:
+        _lock_users(session, first_id, last_id)
+        skip = pending_users(session, first_id, last_id)
+        repaired = repair(session, first_id, last_id, skip)
+        bump_category_months(session, set(repaired))
+        changed = len(repaired) + recompute_linked(
+            session, LinkedObjectType.budget, Budget.user_id > first_id, Budget.user_id <= last_id, Budget.user_id.not_in(skip)
+        )
+        users = _count_users(session, first_id, last_id)
+        session.commit()
+    return {"users": users, "changed": changed}
+
+
+JOBS = {
+    "rollover": rollover_chunk,
+    "goals": goals_chunk,
+    "reconcile": reconcile_chunk,
+}
+
+
+def _init_worker():
+    engine.dispose(close=False)
+
+
+def _load_checkpoint(session: Session, name: str, restart: bool) -> BatchCheckpoint:
+    checkpoint = session.get(BatchCheckpoint, name)
+    if checkpoint is None or restart:
+        checkpoint = session.merge(BatchCheckpoint(job=name))
+        session.commit()
+    return checkpoint
+
+
+def run(job: str, month: date, run_key: str, chunk_size: int, workers: int, stop_after: float | None = None, restart: bool = False) -> BatchCheckpoint:
+    """Run ``job`` over all users in id chunks, checkpointing after every finished chunk.
+
+    Chunks are (first_id, last_id] ranges handed to a process pool; results come
+    back in order so the checkpoint only ever covers a contiguous prefix, and a
+    rerun under the same ``run_key`` resumes after it. Every job is idempotent,
+    so chunks finished after the last checkpoint are safely redone.
+    """
+    name = f"{job}:{run_key}"
+    worker = partial(JOBS[job], month=month)
+
+    with Session(engine) as session:
+        checkpoint = _load_checkpoint(session, name, restart)
+        if checkpoint.finished_at:
+            print(f"{name}: already finished at {checkpoint.finished_at:%Y-%m-%d %H:%M:%S}, use --restart to run again")
+            return checkpoint
+
+        max_id = session.execute(select(func.max(User.id))).scalar() or 0
+        chunks = [(first_id, min(first_id + chunk_size, max_id)) for first_id in range(checkpoint.last_user_id, max_id, chunk_size)]
+        pool = ProcessPoolExecutor(workers, initializer=_init_worker) if workers > 1 else None
+        results = pool.map(worker, *zip(*chunks)) if pool and chunks else map(lambda chunk: worker(*chunk), chunks)
+
+        started = time.perf_counter()
+        users = 0
+        try:
+            for (_, last_id), result in zip(chunks, results):
+                users += result["users"]
+                checkpoint.last_user_id = last_id
+                checkpoint.users += result["users"]
+                checkpoint.changed += result["changed"]
+                checkpoint.updated_at = datetime.utcnow()
+                session.commit()
+
+                elapsed = time.perf_counter() - started
+                rate = users / elapsed if elapsed else 0.0
+                eta = (max_id - last_id) / (last_id - chunks[0][0]) * elapsed
+                print(f"{name}: through user {last_id}/{max_id}, {checkpoint.users} users, {checkpoint.changed} changed, {rate:.0f} users/s, ~{eta:.0f}s left")
+                if stop_after is not None and elapsed >= stop_after:
+                    print(f"{name}: stopping after {elapsed:.0f}s, rerun to resume from user {last_id}")
+                    return checkpoint
+            checkpoint.finished_at = datetime.utcnow()
+            session.commit()
+        finally:
+            if pool:
+                pool.shutdown(cancel_futures=True)
+
+        elapsed = time.perf_counter() - started
+        print(f"{name}: finished {users} users in {elapsed:.1f}s ({users / elapsed if elapsed else 0:.0f} users/s), {checkpoint.changed} changed")
+        return checkpoint
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run nightly batch jobs over all users")
+    parser.add_argument("job", choices=list(JOBS))
+    parser.add_argument("--month", type=date.fromisoformat, default=None,
+                        help="month to roll over from (default: the current month)")
+    parser.add_argument("--run-key", default=None,
+                        help="checkpoint key; reruns with the same key resume (default: month for rollover, today otherwise)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: CPU count, 1 on SQLite)")
+    parser.add_argument("--stop-after", type=float, default=None,
+                        help="stop cleanly after this many seconds; the next run resumes")
+    parser.add_argument("--restart", action="store_true", help="ignore the checkpoint and start over")
+    args = parser.parse_args()
+
+    month = (args.month or date.today()).replace(day=1)
+    run_key = args.run_key or (month.isoformat() if args.job == "rollover" else date.today().isoformat())
+    workers = args.workers or (1 if engine.dialect.name == "sqlite" else os.cpu_count())
+
+    init_db()
+    run(args.job, month, run_key, args.chunk_size, workers, args.stop_after, args.restart)
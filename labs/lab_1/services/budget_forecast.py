@@ -0,0 +1,110 @@
+import calendar
+from datetime import date
+
+import numpy as np
+from sqlmodel import Session, select
+
+from models.budget import Budget
+from models.budget_category import BudgetCategory
+from models.category_month_spend import CategoryMonthSpend
+from schemas.budget import BudgetForecast, CategoryForecast
+from services.budget_spend import ROLLUP_SPEND, month_range
+from services.time_buckets import to_date
+
+HISTORY_MONTHS = 12
+SEASONAL_CLIP = (0.5, 2.0)
+
+
+def month_index(month: date) -> int:
+    return month.year * 12 + month.month - 1
+
+
+def elapsed_days(month: date, as_of: date) -> tuple[int, int]:
+    days = calendar.monthrange(month.year, month.month)[1]
+    start, end = month_range(month)
+    if as_of < start:
+        return 0, days
+    if as_of >= end:
+        return days, days
+    return as_of.day, days
+
+
+def project(history: np.ndarray, mtd: np.ndarray, elapsed: int, days: int) -> tuple[np.ndarray, np.ndarray]:
+    """Project month-end spend for every row at once.
+
+    ``history`` holds the previous ``HISTORY_MONTHS`` months per row, oldest first,
+    so column 0 is the same calendar month last year. The remaining days are
+    filled at a daily rate blending month-to-date velocity with the seasonal
+    expectation, weighted by how much of the month has passed.
+    """
+    observed = (history != 0).sum(axis=1)
+    baseline = np.divide(history.sum(axis=1), observed, out=np.zeros(len(history)), where=observed > 0)
+    same_month = history[:, 0]
+    seasonal = np.divide(same_month, baseline, out=np.ones(len(history)), where=(baseline > 0) & (same_month > 0))
+    seasonal = np.clip(seasonal, *SEASONAL_CLIP)
+
+    expected_rate = baseline * seasonal / days
+    velocity_rate = mtd / elapsed if elapsed else expected_rate
+    weight = np.where(observed > 0, elapsed / days, 1.0)
+    rate = weight * velocity_rate + (1 - weight) * expected_rate
+    return mtd + rate * (days - elapsed), seasonal
+
+
+def forecast_users(session: Session, user_ids, month: date, as_of: date | None = None) -> dict[int, BudgetForecast]:
+    """Forecast every budgeted or active category of ``user_ids`` for ``month`` in one pass.
+
+    History comes from the ``category_month_spend`` rollup and limits from the
+    users' budgets for the month; the projection itself runs vectorized over all
+    (user, category) rows.
+    """
+    month = month.replace(day=1)
+    as_of = as_of or date.today()
+    current = month_index(month)
+    start, end = month_range(month)
+
+    spend_rows = session.execute(
+        select(CategoryMonthSpend.user_id, CategoryMonthSpend.category_id, CategoryMonthSpend.month, ROLLUP_SPEND)
+        .where(
+            CategoryMonthSpend.user_id.in_(user_ids),
+            CategoryMonthSpend.month >= date(start.year - 1, start.month, 1),
+            CategoryMonthSpend.month < end,
+        )
+    ).all()
+    limit_rows = session.execute(
+        select(Budget.user_id, BudgetCategory.category_id, Budget.id, BudgetCategory.limit_amount)
+        .join(BudgetCategory, BudgetCategory.budget_id == Budget.id)
+        .where(Budget.user_id.in_(user_ids), Budget.month >= start, Budget.month < end)
+    ).all()
+
+    rows = {}
+    for user_id, category_id, *_ in (*spend_rows, *limit_rows):
+        rows.setdefault((user_id, category_id), len(rows))
+
+    spend = np.zeros((len(rows), HISTORY_MONTHS + 1))
+    if spend_rows:
+        index = [rows[(user_id, category_id)] for user_id, category_id, _, _ in spend_rows]
+        offset = [HISTORY_MONTHS - current + month_index(to_date(m)) for _, _, m, _ in spend_rows]
+        np.add.at(spend, (index, offset), [float(amount or 0) for *_, amount in spend_rows])
+
+    limits = np.zeros(len(rows))
+    budget_ids = {}
+    for user_id, category_id, budget_id, limit_amount in limit_rows:
+        limits[rows[(user_id, category_id)]] = float(limit_amount or 0)
+        budget_ids[(user_id, category_id)] = budget_id
+
+    elapsed, days = elapsed_days(month, as_of)
+    projected, seasonal = project(spend[:, :HISTORY_MONTHS], spend[:, HISTORY_MONTHS], elapsed, days)
+    over_limit = (limits > 0) & (projected > limits)
+
+    forecasts = {user_id: BudgetForecast(month=month, as_of=as_of, categories=[]) for user_id in user_ids}
+    for (user_id, category_id), i in rows.items():
+        forecasts[user_id].categories.append(CategoryForecast(
+            category_id=category_id,
+            budget_id=budget_ids.get((user_id, category_id)),
+            limit_amount=round(limits[i], 2),
+            month_to_date=round(spend[i, HISTORY_MONTHS], 2),
+            projected=round(projected[i], 2),
+            seasonal_index=round(seasonal[i], 3),
+            over_limit=bool(over_limit[i]),
+        ))
+    return forecasts
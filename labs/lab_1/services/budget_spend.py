@@ -0,0 +1,88 @@
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+
+from sqlalchemy import func
+from sqlmodel import Session, select
+
+from models.category_month_spend import CategoryMonthSpend
+from models.transaction import Transaction, LinkedObjectType
+from services.time_buckets import time_bucket, truncate
+
+ROLLUP_SPEND = CategoryMonthSpend.income_sum + CategoryMonthSpend.expense_sum
+
+
+def month_range(month: date) -> tuple[date, date]:
+    start_date = month.replace(day=1)
+    next_month = (start_date + timedelta(days=32)).replace(day=1)
+    return start_date, next_month
+
+
+def month_bucket(session: Session, column):
+    return time_bucket(session, column, "month")
+
+
+def to_month(value) -> date:
+    return truncate(value, "month")
+
+
+def _rollup_sums(session: Session, budgets) -> dict:
+    rows = session.exec(
+        select(
+            CategoryMonthSpend.user_id,
+            CategoryMonthSpend.category_id,
+            CategoryMonthSpend.month,
+            func.sum(ROLLUP_SPEND),
+        )
+        .where(
+            CategoryMonthSpend.user_id.in_({b.user_id for b in budgets}),
+            CategoryMonthSpend.category_id.in_({bc.category_id for b in budgets for bc in b.categories}),
+            CategoryMonthSpend.month.in_({b.month.replace(day=1) for b in budgets}),
+        )
+        .group_by(CategoryMonthSpend.user_id, CategoryMonthSpend.category_id, CategoryMonthSpend.month)
+    ).all()
+    return {(user_id, category_id, month): amount or 0 for user_id, category_id, month, amount in rows}
+
+
+def _linked_sums(session: Session, budgets) -> dict:
+    ranges = [month_range(b.month) for b in budgets]
+    bucket = month_bucket(session, Transaction.date).label("month")
+
+    rows = session.exec(
+        select(Transaction.linked_object_id, Transaction.category_id, bucket, func.sum(Transaction.amount))
+        .where(
+            Transaction.user_id.in_({b.user_id for b in budgets}),
+            Transaction.linked_object_type == LinkedObjectType.budget,
+            Transaction.linked_object_id.in_({b.id for b in budgets}),
+            Transaction.date >= min(start for start, _ in ranges),
+            Transaction.date < max(end for _, end in ranges),
+        )
+        .group_by(Transaction.linked_object_id, Transaction.category_id, bucket)
+    ).all()
+
+    sums = defaultdict(Decimal)
+    for budget_id, category_id, month, amount in rows:
+        sums[(budget_id, category_id, to_month(month))] += amount or 0
+    return sums
+
+
+def get_budget_spend(session: Session, budgets, linked_only: bool = False) -> dict:
+    """Sum transaction amounts for every (budget, category) pair in one grouped query.
+
+    With ``linked_only`` only transactions linked to the budget itself are counted,
+    otherwise every transaction of the budget owner's category within the budget
+    month is, read from the ``category_month_spend`` rollup.
+    """
+    budgets = [b for b in budgets if b.categories]
+    if not budgets:
+        return {}
+
+    sums = _linked_sums(session, budgets) if linked_only else _rollup_sums(session, budgets)
+
+    spend = {}
+    for budget in budgets:
+        month = budget.month.replace(day=1)
+        for bc in budget.categories:
+            key = (budget.id, bc.category_id, month) if linked_only else (budget.user_id, bc.category_id, month)
+            spend[(budget.id, bc.category_id)] = sums.get(key, 0.0)
+    return spend
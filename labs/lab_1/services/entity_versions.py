@@ -0,0 +1,91 @@
+import hashlib
+
+from fastapi import Request, Response
+from sqlalchemy import select, update
+from sqlmodel import Session
+
+from models.budget import Budget
+from models.budget_category import BudgetCategory
+from models.goal import Goal
+from models.transaction import LinkedObjectType
+from models.user import User
+from services.budget_spend import month_range, to_month
+from services.response_cache import etag_matches
+
+
+def bump_budget(session: Session, budget_id: int):
+    session.execute(update(Budget).where(Budget.id == budget_id).values(version=Budget.version + 1))
+
+
+def bump_category(session: Session, category_id: int):
+    """Bump every budget tracking ``category_id``; budget responses nest the category row."""
+    session.execute(
+        update(Budget)
+        .where(Budget.id.in_(select(BudgetCategory.budget_id).where(BudgetCategory.category_id == category_id)))
+        .values(version=Budget.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def bump_for_transactions(session: Session, transactions):
+    """Bump every goal/budget whose response depends on the given transactions.
+
+    That is each linked goal or budget, plus the owner's budgets of each
+    transaction's month that track its category. The owners' data_version is bumped too.
+    """
+    user_ids = set()
+    goal_ids = set()
+    budget_ids = set()
+    category_months = set()
+    for tr in transactions:
+        user_ids.add(tr.user_id)
+        if tr.linked_object_type == LinkedObjectType.goal:
+            goal_ids.add(tr.linked_object_id)
+        elif tr.linked_object_type == LinkedObjectType.budget:
+            budget_ids.add(tr.linked_object_id)
+        category_months.add((tr.user_id, tr.category_id, to_month(tr.date)))
+
+    if user_ids:
+        session.execute(update(User).where(User.id.in_(user_ids)).values(data_version=User.data_version + 1))
+    if goal_ids:
+        session.execute(update(Goal).where(Goal.id.in_(goal_ids)).values(version=Goal.version + 1))
+    if budget_ids:
+        session.execute(update(Budget).where(Budget.id.in_(budget_ids)).values(version=Budget.version + 1))
+    bump_category_months(session, category_months)
+
+
+def bump_category_months(session: Session, category_months):
+    """Bump the budgets of each (user_id, category_id, month) whose spend changed.
+
+    Budget.month may be any day of its month, so match the whole month.
+    """
+    for user_id, category_id, month in category_months:
+        start, end = month_range(month)
+        session.execute(
+            update(Budget)
+            .where(
+                Budget.user_id == user_id,
+                Budget.month >= start,
+                Budget.month < end,
+                Budget.id.in_(select(BudgetCategory.budget_id).where(BudgetCategory.category_id == category_id)),
+            )
+            .values(version=Budget.version + 1)
+            .execution_options(synchronize_session=False)
+        )
+
+
+def entity_etag(kind: str, entity_id: int, version: int) -> str:
+    return f'W/"{kind}-{entity_id}-{version}"'
+
+
+def collection_etag(kind: str, versions) -> str:
+    digest = hashlib.sha256(",".join(f"{entity_id}:{version}" for entity_id, version in versions).encode())
+    return f'W/"{kind}-{digest.hexdigest()[:32]}"'
+
+
+def not_modified(request: Request, response: Response, etag: str) -> Response | None:
+    """Return a 304 when the client already has ``etag``, otherwise tag ``response`` with it."""
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return None
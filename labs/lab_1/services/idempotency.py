@@ -0,0 +1,85 @@
+import argparse
+import hashlib
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session
+
+from config import idempotency_settings
+from models.idempotency_key import IdempotencyKey
+
+
+class KeyInFlight(Exception):
+    """Another request holds the key and its response isn't visible yet; the client should retry."""
+
+
+def request_hash(body: str) -> str:
+    return hashlib.sha256(body.encode()).hexdigest()
+
+
+def claim_key(session: Session, user_id: int, key: str, digest: str) -> IdempotencyKey | None:
+    """Reserve ``key`` for this request, or return the stored record to replay.
+
+    The reservation is flushed before any work is done, so a concurrent
+    duplicate blocks on the primary key until the first request commits and
+    then replays its response instead of executing again. Returns None when
+    the caller should execute and then ``complete_key`` in the same commit.
+    Raises ``KeyInFlight`` when the key is taken but there is nothing to
+    replay yet, e.g. the winner rolled back or isn't visible to this snapshot.
+    """
+    record = session.get(IdempotencyKey, (user_id, key))
+    if record is not None and record.expires_at > datetime.utcnow():
+        if record.response is None:
+            raise KeyInFlight(key)
+        return record
+    if record is not None:
+        session.delete(record)
+        session.flush()
+
+    now = datetime.utcnow()
+    session.add(IdempotencyKey(
+        user_id=user_id,
+        key=key,
+        request_hash=digest,
+        created_at=now,
+        expires_at=now + timedelta(seconds=idempotency_settings.TTL),
+    ))
+    try:
+        session.flush()
+    except IntegrityError:
+        session.rollback()
+        record = session.get(IdempotencyKey, (user_id, key))
+        if record is None or record.response is None:
+            raise KeyInFlight(key)
+        return record
+    return None
+
+
+def complete_key(session: Session, user_id: int, key: str, status_code: int, response: str):
+    record = session.get(IdempotencyKey, (user_id, key))
+    record.status_code = status_code
+    record.response = response
+
+
+def purge(session: Session) -> int:
+    result = session.execute(delete(IdempotencyKey).where(IdempotencyKey.expires_at <= datetime.utcnow()))
+    session.commit()
+    return result.rowcount
+
+
+if __name__ == "__main__":
+    from connection import engine
+    from models.user import User
+    from models.transaction import Transaction
+    from models.category import Category
+    from models.budget import Budget
+    from models.budget_category import BudgetCategory
+    from models.goal import Goal
+
+    parser = argparse.ArgumentParser(description="Maintain the idempotency key store")
+    parser.add_argument("command", choices=["purge"])
+    parser.parse_args()
+
+    with Session(engine) as session:
+        print(f"Purged {purge(session)} expired idempotency keys")
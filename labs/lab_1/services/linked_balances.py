@@ -0,0 +1,75 @@
+from decimal import Decimal
+
+from sqlalchemy import bindparam, case, func, select, update
+from sqlmodel import Session
+
+from models.budget import Budget
+from models.goal import Goal
+from models.transaction import LinkedObjectType, Transaction, TransactionType
+from services.tenant_query import owned
+
+LINKED_MODELS = {
+    LinkedObjectType.goal: Goal,
+    LinkedObjectType.budget: Budget,
+}
+
+
+def linked_delta(linked_type, tr_type, amount) -> Decimal:
+    """Income raises a goal and lowers a budget's spend; expense does the opposite."""
+    signed = Decimal(amount) if tr_type == TransactionType.income else -Decimal(amount)
+    return signed if linked_type == LinkedObjectType.goal else -signed
+
+
+def linked_exists(session: Session, linked_type, linked_id: int, user_id: int) -> bool:
+    model = LINKED_MODELS[linked_type]
+    return session.execute(owned(model, user_id, model.id).where(model.id == linked_id)).first() is not None
+
+
+def adjust_linked(session: Session, linked_type, linked_id: int, delta: Decimal) -> bool:
+    """Atomically add ``delta`` to the linked object's current_amount.
+
+    Runs as ``UPDATE ... SET current_amount = current_amount + :delta`` so
+    concurrent writers never lose each other's updates. Returns False when
+    the object does not exist.
+    """
+    model = LINKED_MODELS[linked_type]
+    result = session.execute(
+        update(model)
+        .where(model.id == linked_id)
+        .values(current_amount=model.current_amount + delta)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount > 0
+
+
+def recompute_linked(session: Session, linked_type, *criteria) -> int:
+    """Reset current_amount of the matching goals/budgets to the sum of their linked transactions.
+
+    ``criteria`` filter the goal/budget rows. Only drifted rows are written,
+    and their version is bumped; returns how many were corrected.
+    """
+    model = LINKED_MODELS[linked_type]
+    signed = case((Transaction.type == TransactionType.income, Transaction.amount), else_=-Transaction.amount)
+    if linked_type == LinkedObjectType.budget:
+        signed = -signed
+
+    totals = dict(session.execute(
+        select(Transaction.linked_object_id, func.sum(signed))
+        .join(model, (model.id == Transaction.linked_object_id) & (model.user_id == Transaction.user_id))
+        .where(Transaction.linked_object_type == linked_type, *criteria)
+        .group_by(Transaction.linked_object_id)
+    ).all())
+    drifted = [
+        {"_id": linked_id, "_amount": Decimal(totals.get(linked_id) or 0)}
+        for linked_id, current_amount in session.execute(select(model.id, model.current_amount).where(*criteria)).all()
+        if Decimal(current_amount or 0) != Decimal(totals.get(linked_id) or 0)
+    ]
+    if drifted:
+        table = model.__table__
+        session.execute(
+            update(table)
+            .where(table.c.id == bindparam("_id"))
+            .values(current_amount=bindparam("_amount"), version=table.c.version + 1),
+            drifted,
+        )
+    return len(drifted)
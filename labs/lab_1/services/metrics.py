@@ -0,0 +1,193 @@
+import bisect
+import contextvars
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from sqlalchemy import event
+
+from config import metrics_settings
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, buckets: tuple):
+        self.name = name
+        self.help = help
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._series = defaultdict(lambda: [[0] * (len(buckets) + 1), 0.0, 0])
+
+    def observe(self, labels: tuple, value: float):
+        with self._lock:
+            counts, _, _ = series = self._series[labels]
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self, label_names: tuple) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {labels: (list(counts), total, count) for labels, (counts, total, count) in self._series.items()}
+        for labels, (counts, total, count) in sorted(series.items()):
+            base = _labels(label_names, labels)
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{{{base},le="{bound}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{base}}} {total}")
+            lines.append(f"{self.name}_count{{{base}}} {count}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self._lock = threading.Lock()
+        self._values = defaultdict(int)
+
+    def inc(self, labels: tuple, amount: int = 1):
+        with self._lock:
+            self._values[labels] += amount
+
+    def render(self, label_names: tuple) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = dict(self._values)
+        lines.extend(f"{self.name}{{{_labels(label_names, labels)}}} {value}" for labels, value in sorted(values.items()))
+        return lines
+
+
+def _labels(names: tuple, values: tuple) -> str:
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+ROUTE_LABELS = ("method", "route")
+
+request_latency = Histogram("http_request_duration_seconds", "Request latency", LATENCY_BUCKETS)
+request_db_time = Histogram("http_request_db_seconds", "Time spent in database cursor calls per request", LATENCY_BUCKETS)
+request_queries = Histogram("http_request_queries", "Database queries per request", QUERY_BUCKETS)
+requests_total = Counter("http_requests_total", "Requests served")
+slow_queries = Counter("db_slow_queries_total", "Queries slower than SLOW_QUERY_MS")
+
+METRICS = (
+    (request_latency, ROUTE_LABELS),
+    (request_db_time, ROUTE_LABELS),
+    (request_queries, ROUTE_LABELS),
+    (requests_total, ("method", "route", "status")),
+    (slow_queries, ROUTE_LABELS),
+)
+
+
+class RequestStats:
+    def __init__(self, scope: dict):
+        self.scope = scope
+        self.queries = 0
+        self.db_time = 0.0
+
+    @property
+    def labels(self) -> tuple:
+        return self.scope["method"], route_template(self.scope)
+
+
+def route_template(scope: dict) -> str:
+    """The matched route's path template, keeping label cardinality bounded.
+
+    ``include_router`` copies each route with the prefix already in its
+    ``path_format``. Releases that resolve included routers lazily hand over the
+    router's own route instead, whose template lacks the prefix; there the
+    prefix is whatever of the request path precedes the route's concrete path.
+    """
+    route = scope.get("route")
+    if route is None:
+        return UNMATCHED_ROUTE
+    template = route.path_format
+    path = scope["path"]
+    if route.path_regex.match(path):
+        return template
+    concrete = template
+    for name, value in scope.get("path_params", {}).items():
+        concrete = concrete.replace(f"{{{name}}}", str(value))
+    return path[:-len(concrete)] + template if path.endswith(concrete) else template
+
+
+_current = contextvars.ContextVar("request_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_time += elapsed
+    if elapsed * 1000 >= metrics_settings.SLOW_QUERY_MS:
+        labels = stats.labels if stats is not None else ("", UNMATCHED_ROUTE)
+        slow_queries.inc(labels)
+        logger.warning("slow query %.1fms on %s %s: %s", elapsed * 1000, *labels, " ".join(statement.split())[:500])
+
+
+def _handle_error(context):
+    """Failed statements never reach after_cursor_execute; drop their start time."""
+    started = context.connection.info.get("query_started") if context.connection is not None else None
+    if started:
+        started.pop()
+
+
+def instrument_engine(engine):
+    """Count and time every cursor execution of ``engine`` against the current request."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+class MetricsMiddleware:
+    """Records latency, DB time and query count per route, and warns about chatty requests."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = RequestStats(scope)
+        token = _current.set(stats)
+        status = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            labels = stats.labels
+            request_latency.observe(labels, time.perf_counter() - started)
+            request_db_time.observe(labels, stats.db_time)
+            request_queries.observe(labels, stats.queries)
+            requests_total.inc((*labels, status))
+            if stats.queries > metrics_settings.QUERY_WARN_COUNT:
+                logger.warning("%s %s issued %d queries (%.1fms in the database)", *labels, stats.queries, stats.db_time * 1000)
+
+
+def render_metrics() -> str:
+    return "\n".join(line for metric, label_names in METRICS for line in metric.render(label_names)) + "\n"
@@ -0,0 +1,257 @@
+import argparse
+import logging
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import delete
+from sqlmodel import Session, select
+
+from config import outbox_settings
+from connection import engine
+from models.goal import Goal
+from models.outbox_event import OutboxEvent
+from models.transaction import LinkedObjectType, Transaction, TransactionType
+from services.entity_versions import bump_for_transactions
+from services.linked_balances import adjust_linked, linked_delta
+from services.spend_rollup import apply_deltas, transaction_deltas
+
+logger = logging.getLogger(__name__)
+notifications = logging.getLogger("outbox.notifications")
+
+TRANSACTION_EFFECTS = "transaction_effects"
+GOAL_REACHED = "goal_reached"
+
+
+def enqueue(session: Session, kind: str, user_id: int, payload: dict, key: str | None = None) -> OutboxEvent:
+    """Add an event to the caller's session so it commits together with the write it describes."""
+    event = OutboxEvent(key=key or uuid.uuid4().hex, kind=kind, user_id=user_id, payload=payload)
+    session.add(event)
+    return event
+
+
+def transaction_entry(tr: Transaction, sign: int = 1) -> dict:
+    return {
+        "sign": sign,
+        "user_id": tr.user_id,
+        "category_id": tr.category_id,
+        "date": tr.date if isinstance(tr.date, str) else tr.date.isoformat(),
+        "type": TransactionType(tr.type).value,
+        "amount": str(tr.amount),
+        "linked_object_type": LinkedObjectType(tr.linked_object_type).value if tr.linked_object_type else None,
+        "linked_object_id": tr.linked_object_id,
+    }
+
+
+def enqueue_transaction_effects(session: Session, user_id: int, *entries: dict) -> OutboxEvent:
+    """Queue the rollup and linked balance updates for added (sign=1) or removed (sign=-1) transactions.
+
+    Versions are bumped right away, in the caller's transaction, because the
+    detail and analytics responses list the raw transactions before the outbox
+    drains; draining bumps them again once the balances move.
+    """
+    bump_for_transactions(session, [_entry_transaction(entry) for entry in entries])
+    return enqueue(session, TRANSACTION_EFFECTS, user_id, {"entries": list(entries)})
+
+
+def _entry_transaction(entry: dict) -> Transaction:
+    return Transaction(
+        user_id=entry["user_id"],
+        category_id=entry["category_id"],
+        date=datetime.fromisoformat(entry["date"]),
+        type=TransactionType(entry["type"]),
+        amount=Decimal(entry["amount"]),
+        linked_object_type=LinkedObjectType(entry["linked_object_type"]) if entry["linked_object_type"] else None,
+        linked_object_id=entry["linked_object_id"],
+    )
+
+
+def apply_transaction_effects(session: Session, events: list[OutboxEvent]):
+    """Apply every entry of ``events`` with one rollup upsert and one update per linked object.
+
+    Queues a ``goal_reached`` event for every goal whose target was crossed;
+    it commits with the balances it describes and is delivered by a later drain.
+    """
+    entries = [(_entry_transaction(entry), entry["sign"]) for event in events for entry in event.payload["entries"]]
+    by_sign = defaultdict(list)
+    linked = defaultdict(Decimal)
+    for tr, sign in entries:
+        by_sign[sign].append(tr)
+        if tr.linked_object_type:
+            linked[(tr.linked_object_type, tr.linked_object_id)] += sign * linked_delta(tr.linked_object_type, tr.type, tr.amount)
+
+    # bumping first takes the owners' row locks before any balance row, the order batch jobs lock in
+    bump_for_transactions(session, [tr for tr, _ in entries])
+    apply_deltas(session, [delta for sign, trs in by_sign.items() for delta in transaction_deltas(trs, sign)])
+    for (linked_type, linked_id), delta in linked.items():
+        if delta and not adjust_linked(session, linked_type, linked_id, delta):
+            logger.warning("outbox: %s %s no longer exists, skipped %s", linked_type.value, linked_id, delta)
+
+    goal_deltas = {linked_id: delta for (linked_type, linked_id), delta in linked.items() if linked_type == LinkedObjectType.goal and delta > 0}
+    if not goal_deltas:
+        return
+    reached = {
+        # one key per goal and target, however the events that crossed it were batched
+        f"{GOAL_REACHED}:{goal_id}:{target_amount}": (goal_id, user_id, target_amount)
+        for goal_id, user_id, current_amount, target_amount in session.execute(
+            select(Goal.id, Goal.user_id, Goal.current_amount, Goal.target_amount).where(Goal.id.in_(goal_deltas))
+        ).all()
+        if current_amount >= target_amount > current_amount - goal_deltas[goal_id]
+    }
+    queued = set(session.exec(select(OutboxEvent.key).where(OutboxEvent.key.in_(reached))).all())
+    for key, (goal_id, user_id, target_amount) in reached.items():
+        if key not in queued:
+            enqueue(session, GOAL_REACHED, user_id, {"goal_id": goal_id, "target_amount": str(target_amount)}, key)
+
+
+def send_notifications(session: Session, events: list[OutboxEvent]):
+    for event in events:
+        notify({"key": event.key, "kind": event.kind, "user_id": event.user_id, **event.payload})
+
+
+HANDLERS = {
+    TRANSACTION_EFFECTS: apply_transaction_effects,
+    GOAL_REACHED: send_notifications,
+}
+
+
+def notify(notification: dict):
+    """Deliver a notification; consumers dedupe on its ``key`` since delivery is at-least-once."""
+    notifications.info("%s", notification)
+
+
+def _claim(session: Session, limit: int, *criteria) -> list[OutboxEvent]:
+    return session.exec(
+        select(OutboxEvent)
+        .where(OutboxEvent.processed_at.is_(None), OutboxEvent.attempts < outbox_settings.MAX_ATTEMPTS, *criteria)
+        .order_by(OutboxEvent.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    ).all()
+
+
+def _process(session: Session, events: list[OutboxEvent]):
+    by_kind = defaultdict(list)
+    for event in events:
+        by_kind[event.kind].append(event)
+    for kind, batch in by_kind.items():
+        HANDLERS[kind](session, batch)
+
+    now = datetime.utcnow()
+    for event in events:
+        event.processed_at = now
+        event.attempts += 1
+    session.commit()
+
+
+def drain(session: Session, batch_size: int = outbox_settings.BATCH_SIZE) -> int:
+    """Apply up to ``batch_size`` pending events in one transaction; returns how many were claimed.
+
+    Marking an event processed commits atomically with its database effects,
+    so those apply exactly once. If the batch fails, events are retried one
+    by one so a single bad event only fails itself and is given up on after
+    ``OUTBOX_MAX_ATTEMPTS``.
+    """
+    events = _claim(session, batch_size)
+    if not events:
+        return 0
+    ids = [event.id for event in events]
+    try:
+        _process(session, events)
+    except Exception:
+        session.rollback()
+        logger.exception("outbox: batch of %d failed, retrying events one by one", len(ids))
+        for event_id in ids:
+            events = _claim(session, 1, OutboxEvent.id == event_id)
+            if not events:
+                continue
+            try:
+                _process(session, events)
+            except Exception as exc:
+                session.rollback()
+                logger.exception("outbox: event %s failed", event_id)
+                event = session.get(OutboxEvent, event_id)
+                event.attempts += 1
+                event.last_error = repr(exc)[:1000]
+                session.commit()
+    return len(ids)
+
+
+def pending_users(session: Session, first_user_id: int, last_user_id: int) -> set:
+    return set(session.exec(
+        select(OutboxEvent.user_id)
+        .where(
+            OutboxEvent.kind == TRANSACTION_EFFECTS,
+            OutboxEvent.processed_at.is_(None),
+            OutboxEvent.attempts < outbox_settings.MAX_ATTEMPTS,
+            OutboxEvent.user_id > first_user_id,
+            OutboxEvent.user_id <= last_user_id,
+        )
+        .distinct()
+    ).all())
+
+
+def purge(session: Session, older_than: timedelta) -> int:
+    result = session.execute(
+        delete(OutboxEvent).where(OutboxEvent.processed_at < datetime.utcnow() - older_than)
+    )
+    session.commit()
+    return result.rowcount
+
+
+def work(session: Session, batch_size: int, poll_interval: float, once: bool = False, stop: threading.Event | None = None):
+    started = time.perf_counter()
+    processed = 0
+    stop = stop or threading.Event()
+    while not stop.is_set():
+        drained = drain(session, batch_size)
+        processed += drained
+        if drained:
+            logger.info("outbox: %d events, %.0f events/s", processed, processed / (time.perf_counter() - started))
+        elif once:
+            break
+        else:
+            stop.wait(poll_interval)
+    return processed
+
+
+def start_worker() -> threading.Event:
+    """Drain the outbox from a daemon thread of this process; set the returned event to stop it."""
+    stop = threading.Event()
+
+    def run():
+        while not stop.is_set():
+            try:
+                with Session(engine) as session:
+                    work(session, outbox_settings.BATCH_SIZE, outbox_settings.POLL_INTERVAL, stop=stop)
+            except Exception:
+                logger.exception("outbox: worker failed, restarting")
+                stop.wait(outbox_settings.POLL_INTERVAL)
+
+    threading.Thread(target=run, name="outbox-worker", daemon=True).start()
+    return stop
+
+
+if __name__ == "__main__":
+    from models.user import User
+    from models.category import Category
+    from models.budget import Budget
+    from models.budget_category import BudgetCategory
+
+    parser = argparse.ArgumentParser(description="Drain the transaction side-effect outbox")
+    parser.add_argument("command", choices=["work", "purge"])
+    parser.add_argument("--batch-size", type=int, default=outbox_settings.BATCH_SIZE)
+    parser.add_argument("--poll-interval", type=float, default=outbox_settings.POLL_INTERVAL)
+    parser.add_argument("--once", action="store_true", help="exit once the outbox is empty")
+    parser.add_argument("--days", type=int, default=7, help="purge processed events older than this")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+    with Session(engine) as session:
+        if args.command == "purge":
+            print(f"Purged {purge(session, timedelta(days=args.days))} processed events")
+        else:
+            print(f"Processed {work(session, args.batch_size, args.poll_interval, args.once)} events")
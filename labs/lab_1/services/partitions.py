@@ -0,0 +1,56 @@
+import argparse
+from datetime import date
+
+from sqlalchemy import text
+from sqlmodel import Session
+
+from config import partition_settings
+from migrations.partitioning import (
+    create_month_partition, hash_partition_count, is_partitioned, month_partitions, months_between, next_month
+)
+
+
+def ensure_month_partitions(session: Session, months_ahead: int = partition_settings.TRANSACTION_MONTHS_AHEAD) -> list[date]:
+    """Create any missing ``transaction`` partitions from this month to ``months_ahead`` months out.
+
+    A no-op unless the table has been partitioned (Postgres only). New months
+    reuse the hash layout of the newest existing month. Returns the months created.
+    Concurrent runs serialize on an advisory lock, so run it from cron rather
+    than at app startup: moving stranded rows locks the default partition.
+    """
+    if session.get_bind().dialect.name != "postgresql":
+        return []
+    conn = session.connection()
+    conn.execute(text("SELECT pg_advisory_xact_lock(hashtext('transaction_partitions'))"))
+    if not is_partitioned(conn):
+        return []
+
+    hash_partitions = hash_partition_count(conn)
+    last = date.today().replace(day=1)
+    for _ in range(months_ahead):
+        last = next_month(last)
+    created = [
+        month for month in months_between(date.today(), last)
+        if create_month_partition(conn, month, hash_partitions)
+    ]
+    session.commit()
+    return created
+
+
+if __name__ == "__main__":
+    from connection import engine
+
+    parser = argparse.ArgumentParser(description="Maintain the monthly partitions of the transaction table")
+    parser.add_argument("command", choices=["ensure", "list"])
+    parser.add_argument("--months-ahead", type=int, default=partition_settings.TRANSACTION_MONTHS_AHEAD)
+    args = parser.parse_args()
+
+    with Session(engine) as session:
+        if args.command == "ensure":
+            created = ensure_month_partitions(session, args.months_ahead)
+            print(f"Created {len(created)} partitions: {', '.join(f'{month:%Y-%m}' for month in created) or '-'}")
+        elif engine.dialect.name == "postgresql" and is_partitioned(session.connection()):
+            for name in month_partitions(session.connection()):
+                print(name)
+        else:
+            print("transaction is not partitioned")
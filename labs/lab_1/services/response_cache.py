@@ -0,0 +1,105 @@
+import hashlib
+import uuid
+
+from fastapi import Request, Response
+
+from config import cache_settings
+from services.ttl_cache import TTLCache
+
+CATEGORIES_KEY = "categories:list"
+BUDGET_CATEGORIES_KEY = "budget-categories:list"
+
+
+class MemoryBackend:
+    def __init__(self, maxsize: int):
+        self._cache = TTLCache(maxsize, cache_settings.RESPONSE_CACHE_TTL)
+
+    def get(self, key: str) -> bytes | None:
+        return self._cache.get(key)
+
+    def set(self, key: str, value: bytes, ttl: int):
+        self._cache.set(key, value, ttl=ttl)
+
+    def delete(self, *keys: str):
+        for key in keys:
+            self._cache.pop(key)
+
+
+class RedisBackend:
+    """Works with any client exposing redis-py's get/set(ex=)/delete, e.g. a fake in tests."""
+
+    def __init__(self, client, prefix: str = "finance:response:"):
+        self._client = client
+        self._prefix = prefix
+
+    def get(self, key: str) -> bytes | None:
+        return self._client.get(self._prefix + key)
+
+    def set(self, key: str, value: bytes, ttl: int):
+        self._client.set(self._prefix + key, value, ex=ttl)
+
+    def delete(self, *keys: str):
+        if keys:
+            self._client.delete(*(self._prefix + key for key in keys))
+
+
+def create_backend():
+    url = cache_settings.RESPONSE_CACHE_URL
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        import redis
+
+        return RedisBackend(redis.Redis.from_url(url))
+    return MemoryBackend(cache_settings.RESPONSE_CACHE_SIZE)
+
+
+def etag_for(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+
+class ResponseCache:
+    def __init__(self, backend, ttl: int):
+        self.backend = backend
+        self.ttl = ttl
+
+    def respond(self, request: Request, key: str, build) -> Response:
+        """Serve the cached JSON body for ``key``, building and storing it on a miss.
+
+        ``build`` returns the serialized JSON bytes. Requests whose If-None-Match
+        matches the body's ETag get an empty 304.
+        """
+        body = self.backend.get(key)
+        if body is None:
+            body = build()
+            self.backend.set(key, body, self.ttl)
+
+        etag = etag_for(body)
+        if etag_matches(request, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+    def invalidate(self, *keys: str):
+        self.backend.delete(*keys)
+
+    def generation(self, name: str) -> str:
+        """Token to embed in keys that must all go stale together when ``name`` is bumped."""
+        value = self.backend.get(f"generation:{name}")
+        return value.decode() if value else "0"
+
+    def bump_generation(self, name: str):
+        self.backend.set(f"generation:{name}", uuid.uuid4().hex.encode(), self.ttl * 10)
+
+
+response_cache = ResponseCache(create_backend(), cache_settings.RESPONSE_CACHE_TTL)
+
+
+def budget_categories_key(user_id: int) -> str:
+    """Per-user key; embeds the categories generation since every list nests category rows."""
+    return f"{BUDGET_CATEGORIES_KEY}:{user_id}:{response_cache.generation(CATEGORIES_KEY)}"
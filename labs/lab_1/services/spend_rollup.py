@@ -0,0 +1,177 @@
+import argparse
+from collections import defaultdict
+from decimal import Decimal
+
+from sqlalchemy import delete, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import Session, select
+
+from models.category_month_spend import CategoryMonthSpend
+from models.transaction import Transaction, TransactionType
+from services.budget_spend import month_bucket, to_month
+
+
+def _insert(session: Session):
+    if session.get_bind().dialect.name == "sqlite":
+        return sqlite_insert(CategoryMonthSpend)
+    return pg_insert(CategoryMonthSpend)
+
+
+def apply_deltas(session: Session, deltas: list[dict]):
+    """Upsert rollup deltas (user_id, category_id, month, income_sum, expense_sum, count) in one executemany.
+
+    The upsert runs on the caller's session, so it commits or rolls back
+    together with the transaction rows themselves.
+    """
+    if not deltas:
+        return
+    stmt = _insert(session)
+    table = CategoryMonthSpend.__table__
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id", "category_id", "month"],
+        set_={
+            "income_sum": table.c.income_sum + stmt.excluded.income_sum,
+            "expense_sum": table.c.expense_sum + stmt.excluded.expense_sum,
+            "count": table.c.count + stmt.excluded.count,
+        },
+    )
+    session.execute(stmt, deltas)
+
+
+def transaction_deltas(transactions, sign: int = 1) -> list[dict]:
+    totals = defaultdict(lambda: [Decimal(0), Decimal(0), 0])
+    for tr in transactions:
+        entry = totals[(tr.user_id, tr.category_id, to_month(tr.date))]
+        entry[0 if tr.type == TransactionType.income else 1] += Decimal(tr.amount) * sign
+        entry[2] += sign
+    return [
+        {
+            "user_id": user_id,
+            "category_id": category_id,
+            "month": month,
+            "income_sum": income_sum,
+            "expense_sum": expense_sum,
+            "count": count,
+        }
+        for (user_id, category_id, month), (income_sum, expense_sum, count) in totals.items()
+    ]
+
+
+def _expected(session: Session, *criteria) -> dict:
+    bucket = month_bucket(session, Transaction.date)
+    rows = session.exec(
+        select(
+            Transaction.user_id,
+            Transaction.category_id,
+            bucket,
+            Transaction.type,
+            func.sum(Transaction.amount),
+            func.count(),
+        )
+        .where(*criteria)
+        .group_by(Transaction.user_id, Transaction.category_id, bucket, Transaction.type)
+    ).all()
+
+    expected = defaultdict(lambda: [Decimal(0), Decimal(0), 0])
+    for user_id, category_id, month, tr_type, amount, count in rows:
+        entry = expected[(user_id, category_id, to_month(month))]
+        entry[0 if tr_type == TransactionType.income else 1] += amount or 0
+        entry[2] += count
+    return expected
+
+
+def rebuild(session: Session) -> int:
+    expected = _expected(session)
+    session.execute(delete(CategoryMonthSpend))
+    session.add_all(
+        CategoryMonthSpend(
+            user_id=user_id,
+            category_id=category_id,
+            month=month,
+            income_sum=income_sum,
+            expense_sum=expense_sum,
+            count=count,
+        )
+        for (user_id, category_id, month), (income_sum, expense_sum, count) in expected.items()
+    )
+    session.commit()
+    return len(expected)
+
+
+def repair(session: Session, first_user_id: int, last_user_id: int, skip_users=()) -> list:
+    """Rewrite the rollup rows of users in (first_user_id, last_user_id] that drifted.
+
+    Users in ``skip_users`` are left alone. Returns the repaired
+    (user_id, category_id, month) keys; the caller commits.
+    """
+    expected = _expected(
+        session,
+        Transaction.user_id > first_user_id,
+        Transaction.user_id <= last_user_id,
+        Transaction.user_id.not_in(skip_users),
+    )
+    repaired = []
+    for row in session.exec(
+        select(CategoryMonthSpend).where(
+            CategoryMonthSpend.user_id > first_user_id,
+            CategoryMonthSpend.user_id <= last_user_id,
+            CategoryMonthSpend.user_id.not_in(skip_users),
+        )
+    ).all():
+        key = (row.user_id, row.category_id, row.month)
+        values = expected.pop(key, [0, 0, 0])
+        if [row.income_sum, row.expense_sum, row.count] != values:
+            row.income_sum, row.expense_sum, row.count = values
+            repaired.append(key)
+    session.add_all(
+        CategoryMonthSpend(
+            user_id=user_id,
+            category_id=category_id,
+            month=month,
+            income_sum=income_sum,
+            expense_sum=expense_sum,
+            count=count,
+        )
+        for (user_id, category_id, month), (income_sum, expense_sum, count) in expected.items()
+    )
+    return repaired + list(expected)
+
+
+def verify(session: Session) -> list:
+    expected = _expected(session)
+    mismatches = []
+    seen = set()
+    for row in session.exec(select(CategoryMonthSpend)).all():
+        key = (row.user_id, row.category_id, row.month)
+        seen.add(key)
+        actual = [row.income_sum, row.expense_sum, row.count]
+        if actual != expected.get(key, [0, 0, 0]):
+            mismatches.append((key, actual, expected.get(key)))
+    for key, values in expected.items():
+        if key not in seen:
+            mismatches.append((key, None, values))
+    return mismatches
+
+
+if __name__ == "__main__":
+    from connection import engine
+    from models.user import User
+    from models.category import Category
+    from models.budget import Budget
+    from models.budget_category import BudgetCategory
+    from models.goal import Goal
+
+    parser = argparse.ArgumentParser(description="Maintain the category_month_spend rollup")
+    parser.add_argument("command", choices=["rebuild", "verify"])
+    args = parser.parse_args()
+
+    with Session(engine) as session:
+        if args.command == "rebuild":
+            print(f"Rebuilt {rebuild(session)} rollup rows")
+        else:
+            mismatches = verify(session)
+            for key, actual, expected in mismatches:
+                print(f"{key}: stored={actual} expected={expected}")
+            print(f"{len(mismatches)} mismatched rollup rows")
+            raise SystemExit(1 if mismatches else 0)
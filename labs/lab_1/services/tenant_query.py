@@ -0,0 +1,24 @@
+from sqlmodel import select
+
+from models.budget import Budget
+from models.budget_category import BudgetCategory
+
+
+def owner_column(model):
+    """Column holding the owner's user id; budget categories belong to the owner of their budget."""
+    return Budget.user_id if model is BudgetCategory else model.user_id
+
+
+def owned(model, user_id: int, *columns):
+    """select() over ``model`` (or only ``columns`` of it) that can only see ``user_id``'s rows."""
+    query = select(*(columns or (model,)))
+    if model is BudgetCategory:
+        query = query.join(Budget, Budget.id == BudgetCategory.budget_id)
+    return query.where(owner_column(model) == user_id)
+
+
+def get_owned(session, model, object_id: int, user_id: int, *options):
+    """The user's ``model`` row with this id, or None when it is missing or belongs to someone else."""
+    return session.execute(
+        owned(model, user_id).where(model.id == object_id).options(*options)
+    ).unique().scalars().first()
@@ -0,0 +1,80 @@
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import func
+from sqlmodel import Session
+
+BUCKETS = ("day", "week", "month", "year")
+
+SQLITE_FORMATS = {
+    "day": "%Y-%m-%d",
+    "month": "%Y-%m-01",
+    "year": "%Y-01-01",
+}
+
+
+def time_bucket(session: Session, column, unit: str):
+    """SQL expression truncating ``column`` to the start of its day/week/month/year.
+
+    Weeks start on Monday, matching Postgres' date_trunc('week').
+    """
+    if session.get_bind().dialect.name == "sqlite":
+        if unit == "week":
+            return func.date(column, "weekday 0", "-6 days")
+        return func.strftime(SQLITE_FORMATS[unit], column)
+    return func.date_trunc(unit, column)
+
+
+def to_date(value) -> date:
+    if isinstance(value, str):
+        value = datetime.strptime(value[:10], "%Y-%m-%d")
+    if isinstance(value, datetime):
+        value = value.date()
+    return value
+
+
+def truncate(value, unit: str) -> date:
+    value = to_date(value)
+    if unit == "week":
+        return value - timedelta(days=value.weekday())
+    if unit == "month":
+        return value.replace(day=1)
+    if unit == "year":
+        return value.replace(month=1, day=1)
+    return value
+
+
+def next_bucket(value: date, unit: str) -> date:
+    if unit == "day":
+        return value + timedelta(days=1)
+    if unit == "week":
+        return value + timedelta(days=7)
+    if unit == "month":
+        return (value + timedelta(days=32)).replace(day=1)
+    return value.replace(year=value.year + 1)
+
+
+def bucket_range(start, end, unit: str) -> list[date]:
+    """Every bucket start from the bucket containing ``start`` up to ``end`` inclusive."""
+    current, end = truncate(start, unit), truncate(end, unit)
+    buckets = []
+    while current <= end:
+        buckets.append(current)
+        if current == end:
+            # the bucket after 9999-12 is past date.max
+            break
+        current = next_bucket(current, unit)
+    return buckets
+
+
+def bucket_count(start, end, unit: str) -> int:
+    """len(bucket_range(start, end, unit)) without building the list."""
+    start, end = truncate(start, unit), truncate(end, unit)
+    if start > end:
+        return 0
+    if unit == "day":
+        return (end - start).days + 1
+    if unit == "week":
+        return (end - start).days // 7 + 1
+    if unit == "month":
+        return (end.year - start.year) * 12 + end.month - start.month + 1
+    return end.year - start.year + 1
@@ -0,0 +1,76 @@
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from decimal import Decimal
+from enum import Enum
+
+from sqlmodel import Session
+
+from connection import engine
+from models.transaction import Transaction
+from schemas.transaction import TransactionFilters
+from services.transaction_query import filter_transactions
+
+EXPORT_COLUMNS = (
+    Transaction.id,
+    Transaction.user_id,
+    Transaction.category_id,
+    Transaction.type,
+    Transaction.amount,
+    Transaction.description,
+    Transaction.date,
+    Transaction.linked_object_type,
+    Transaction.linked_object_id,
+)
+EXPORT_FIELDS = [column.key for column in EXPORT_COLUMNS]
+BATCH_SIZE = 1000
+
+
+def _plain(value):
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _ndjson(rows) -> str:
+    return "".join(json.dumps(dict(zip(EXPORT_FIELDS, map(_plain, row)))) + "\n" for row in rows)
+
+
+def _csv(rows) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows([_plain(value) for value in row] for row in rows)
+    return buffer.getvalue()
+
+
+def _csv_header() -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(EXPORT_FIELDS)
+    return buffer.getvalue()
+
+
+def stream_transactions(user_id: int, filters: TransactionFilters, fmt: str, bind=engine):
+    """Yield encoded chunks of BATCH_SIZE rows, reading through a server-side cursor."""
+    encode = _csv if fmt == "csv" else _ndjson
+    if fmt == "csv":
+        yield _csv_header().encode()
+
+    query = filter_transactions(user_id, filters, *EXPORT_COLUMNS).order_by(Transaction.date, Transaction.id)
+    with Session(bind) as session:
+        result = session.execute(query.execution_options(stream_results=True, yield_per=BATCH_SIZE))
+        for rows in result.partitions():
+            yield encode(rows).encode()
+
+
+def gzip_chunks(chunks):
+    compressor = zlib.compressobj(wbits=31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
@@ -0,0 +1,138 @@
+import csv
+import io
+import json
+import re
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlmodel import Session, select
+
+from models.budget import Budget
+from models.category import Category
+from models.goal import Goal
+from models.transaction import Transaction, LinkedObjectType
+from schemas.transaction import TransactionCreate, TransactionType, TransactionImportError, TransactionImportResult
+from services.spend_rollup import apply_deltas, transaction_deltas
+from services.entity_versions import bump_for_transactions
+from services.linked_balances import linked_delta, adjust_linked
+
+MAX_IMPORT_ROWS = 10000
+
+OFX_TRANSACTION = re.compile(r"<STMTTRN>(.*?)</STMTTRN>", re.S | re.I)
+OFX_FIELD = re.compile(r"<(\w+)>([^<\r\n]*)")
+
+
+class ImportFormatError(ValueError):
+    pass
+
+
+def parse_json(body: bytes) -> list[dict]:
+    try:
+        rows = json.loads(body)
+    except ValueError as exc:
+        raise ImportFormatError(f"Invalid JSON: {exc}") from exc
+    if not isinstance(rows, list):
+        raise ImportFormatError("Expected a JSON array of transactions")
+    return rows
+
+
+def parse_csv(body: bytes) -> list[dict]:
+    try:
+        reader = csv.DictReader(io.StringIO(body.decode("utf-8-sig")))
+        return [{key: value for key, value in row.items() if value not in (None, "")} for row in reader]
+    except (UnicodeDecodeError, csv.Error) as exc:
+        raise ImportFormatError(f"Invalid CSV: {exc}") from exc
+
+
+def parse_ofx(body: bytes, category_id: int | None) -> list[dict]:
+    if category_id is None:
+        raise ImportFormatError("category_id is required for OFX imports")
+
+    rows = []
+    for block in OFX_TRANSACTION.findall(body.decode("utf-8", errors="replace")):
+        fields = {key.upper(): value.strip() for key, value in OFX_FIELD.findall(block)}
+        row = {"category_id": category_id, "description": fields.get("MEMO") or fields.get("NAME")}
+        try:
+            amount = Decimal(fields["TRNAMT"])
+            row["amount"] = abs(amount)
+            row["type"] = TransactionType.expense if amount < 0 else TransactionType.income
+        except (KeyError, InvalidOperation):
+            row["amount"] = fields.get("TRNAMT")
+        try:
+            row["date"] = datetime.strptime(fields["DTPOSTED"][:8], "%Y%m%d")
+        except (KeyError, ValueError):
+            row["date"] = fields.get("DTPOSTED")
+        rows.append(row)
+    return rows
+
+
+def _errors(exc: ValidationError) -> list[str]:
+    return [f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in exc.errors()]
+
+
+def _owned_ids(db: Session, model, ids: set, user_id: int) -> set:
+    if not ids:
+        return set()
+    return set(db.exec(select(model.id).where(model.id.in_(ids), model.user_id == user_id)).all())
+
+
+def import_transactions(db: Session, user_id: int, rows: list[dict]) -> TransactionImportResult:
+    """Validate all rows, insert the valid ones with a single executemany and apply
+    goal/budget/rollup adjustments once per affected object."""
+    errors = []
+    valid = []
+    for index, row in enumerate(rows):
+        if not isinstance(row, dict):
+            errors.append(TransactionImportError(row=index, errors=["Expected an object"]))
+            continue
+        try:
+            tr = TransactionCreate(**row)
+        except ValidationError as exc:
+            errors.append(TransactionImportError(row=index, errors=_errors(exc)))
+            continue
+        if bool(tr.linked_object_id) != bool(tr.linked_object_type):
+            errors.append(TransactionImportError(
+                row=index, errors=["Both linked_object_id and linked_object_type must be set together."]
+            ))
+            continue
+        valid.append((index, tr))
+
+    category_ids = set(db.exec(select(Category.id).where(Category.id.in_({tr.category_id for _, tr in valid}))).all())
+    goals = _owned_ids(db, Goal, {tr.linked_object_id for _, tr in valid if tr.linked_object_type == LinkedObjectType.goal}, user_id)
+    budgets = _owned_ids(db, Budget, {tr.linked_object_id for _, tr in valid if tr.linked_object_type == LinkedObjectType.budget}, user_id)
+
+    accepted = []
+    for index, tr in valid:
+        if tr.category_id not in category_ids:
+            errors.append(TransactionImportError(row=index, errors=["Category not found"]))
+        elif tr.linked_object_type == LinkedObjectType.goal and tr.linked_object_id not in goals:
+            errors.append(TransactionImportError(row=index, errors=["Goal not found"]))
+        elif tr.linked_object_type == LinkedObjectType.budget and tr.linked_object_id not in budgets:
+            errors.append(TransactionImportError(row=index, errors=["Budget not found"]))
+        else:
+            accepted.append(Transaction(**tr.dict(), user_id=user_id))
+
+    if accepted:
+        db.execute(insert(Transaction), [
+            {column: getattr(tr, column) for column in Transaction.__table__.columns.keys() if column != "id"}
+            for tr in accepted
+        ])
+        # user row first, as the outbox drain and batch jobs lock, so an import can't deadlock them
+        bump_for_transactions(db, accepted)
+        apply_deltas(db, transaction_deltas(accepted))
+
+        linked_deltas = defaultdict(Decimal)
+        for tr in accepted:
+            if tr.linked_object_type:
+                key = (tr.linked_object_type, tr.linked_object_id)
+                linked_deltas[key] += linked_delta(tr.linked_object_type, tr.type, tr.amount)
+        for (linked_type, linked_id), delta in linked_deltas.items():
+            adjust_linked(db, linked_type, linked_id, delta)
+
+        db.commit()
+
+    errors.sort(key=lambda error: error.row)
+    return TransactionImportResult(received=len(rows), inserted=len(accepted), errors=errors)
@@ -0,0 +1,54 @@
+import base64
+from datetime import datetime
+
+from sqlalchemy import tuple_
+
+from models.transaction import Transaction
+from schemas.transaction import TransactionFilters
+from services.tenant_query import owned
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(tr: Transaction) -> str:
+    raw = f"{tr.date.isoformat()}|{tr.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        date, tr_id = raw.split("|")
+        return datetime.fromisoformat(date), int(tr_id)
+    except ValueError as exc:
+        raise InvalidCursor(cursor) from exc
+
+
+def filter_transactions(user_id: int, filters: TransactionFilters, *columns):
+    query = owned(Transaction, user_id, *columns)
+    if filters.date_from is not None:
+        query = query.where(Transaction.date >= filters.date_from)
+    if filters.date_to is not None:
+        query = query.where(Transaction.date < filters.date_to)
+    if filters.category_id is not None:
+        query = query.where(Transaction.category_id == filters.category_id)
+    if filters.type is not None:
+        query = query.where(Transaction.type == filters.type)
+    if filters.linked_object_type is not None:
+        query = query.where(Transaction.linked_object_type == filters.linked_object_type)
+    if filters.linked_object_id is not None:
+        query = query.where(Transaction.linked_object_id == filters.linked_object_id)
+    if filters.amount_min is not None:
+        query = query.where(Transaction.amount >= filters.amount_min)
+    if filters.amount_max is not None:
+        query = query.where(Transaction.amount <= filters.amount_max)
+    return query
+
+
+def paginate_transactions(query, cursor: str | None, limit: int):
+    """Newest-first keyset page over (date, id); fetches one extra row to detect the next page."""
+    if cursor:
+        query = query.where(tuple_(Transaction.date, Transaction.id) < decode_cursor(cursor))
+    return query.order_by(Transaction.date.desc(), Transaction.id.desc()).limit(limit + 1)
@@ -0,0 +1,66 @@
+import os
+import tempfile
+from types import SimpleNamespace
+
+os.environ["DB_ADMIN"] = f"sqlite:///{tempfile.mkdtemp(prefix='lab1-tests-')}/test.db"
+os.environ["BCRYPT_ROUNDS"] = "4"
+os.environ["OUTBOX_EMBEDDED_WORKER"] = "false"
+for name in ("DB_ADMIN_ASYNC", "DB_REPLICAS", "RESPONSE_CACHE_URL", "AUTH_CLAIMS_ONLY"):
+    os.environ.pop(name, None)
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, SQLModel
+
+from main import app
+from authorization.jwt_generator import create_access_token, token_cache
+from authorization.principal_cache import principal_cache, token_version_cache
+from connection import engine, replica_router
+from models.category import Category
+from models.user import User
+from services.response_cache import create_backend, response_cache
+
+
+@pytest.fixture(autouse=True)
+def database():
+    """Every test starts from empty tables and empty in-process caches."""
+    SQLModel.metadata.drop_all(engine)
+    SQLModel.metadata.create_all(engine)
+    response_cache.backend = create_backend()
+    principal_cache.clear()
+    token_cache.clear()
+    token_version_cache.clear()
+    replica_router.recent_writes.clear()
+    yield
+    engine.dispose()
+
+
+@pytest.fixture
+def session():
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def make_user(session):
+    def make(username: str) -> SimpleNamespace:
+        user = User(username=username, email=f"{username}@example.com", password_hash="x")
+        session.add(user)
+        session.commit()
+        token = create_access_token({"sub": username, "user_id": user.id, "ver": user.token_version})
+        return SimpleNamespace(id=user.id, headers={"Authorization": f"Bearer {token}"})
+    return make
+
+
+@pytest.fixture
+def category(session) -> int:
+    category = Category(name="food")
+    session.add(category)
+    session.commit()
+    return category.id
@@ -0,0 +1,87 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+import services.analytics
+from models.transaction import Transaction
+from services.analytics import DEFAULT_PERIOD
+
+
+def test_open_ended_window_is_not_frozen_by_the_cache(client, make_user, category, monkeypatch):
+    user = make_user("alice")
+    tomorrow = datetime.utcnow() + timedelta(days=1)
+    client.post(
+        "/api/v1/transactions/",
+        json={"amount": "10", "type": "expense", "date": tomorrow.isoformat(), "category_id": category},
+        headers=user.headers,
+    ).raise_for_status()
+    path = "/api/v1/analytics/spend?bucket=day"
+    assert client.get(path, headers=user.headers).json()["series"] == []
+
+    class Later(datetime):
+        @classmethod
+        def utcnow(cls):
+            return tomorrow + timedelta(days=1)
+
+    monkeypatch.setattr(services.analytics, "datetime", Later)
+    series = client.get(path, headers=user.headers).json()["series"]
+    assert sum(float(point["total"]) for point in series[0]["points"]) == 10
+
+
+def test_closed_window_is_cached_per_data_version(client, make_user, category):
+    user = make_user("alice")
+    path = "/api/v1/analytics/spend?date_from=2025-01-01T00:00:00&date_to=2025-02-01T00:00:00"
+    etag = client.get(path, headers=user.headers).headers["etag"]
+    assert client.get(path, headers={**user.headers, "If-None-Match": etag}).status_code == 304
+
+    client.post(
+        "/api/v1/transactions/",
+        json={"amount": "10", "type": "expense", "date": "2025-01-10T00:00:00", "category_id": category},
+        headers=user.headers,
+    ).raise_for_status()
+    assert client.get(path, headers={**user.headers, "If-None-Match": etag}).status_code == 200
+
+
+def test_default_window_is_clamped_to_the_first_date(client, make_user):
+    user = make_user("alice")
+    response = client.get("/api/v1/analytics/spend?date_to=0001-06-01T00:00:00", headers=user.headers)
+    assert response.status_code == 200
+    assert response.json()["date_from"] == "0001-01-01"
+
+
+@pytest.mark.parametrize("bucket", ["day", "week", "month", "year"])
+def test_window_ending_at_the_last_date(client, make_user, bucket):
+    user = make_user("alice")
+    path = f"/api/v1/analytics/spend?date_from=9999-12-30T00:00:00&date_to=9999-12-31T23:59:59&bucket={bucket}"
+    assert client.get(path, headers=user.headers).status_code == 200
+
+
+@pytest.mark.parametrize("bucket,periods", [("day", 366), ("week", 53), ("month", 13), ("year", 2)])
+def test_points_cover_every_bucket_up_to_the_last_date(client, session, make_user, category, bucket, periods):
+    user = make_user("alice")
+    session.add(Transaction(user_id=user.id, category_id=category, amount=10, type="expense", date=datetime(9999, 12, 31, 12)))
+    session.commit()
+    path = f"/api/v1/analytics/spend?date_from=9998-12-31T00:00:00&date_to=9999-12-31T23:59:59&bucket={bucket}"
+    points = client.get(path, headers=user.headers).json()["series"][0]["points"]
+    assert len(points) == periods
+    assert float(points[-1]["total"]) == 10
+
+
+@pytest.mark.parametrize("query", [
+    "date_to=0001-01-01T00:00:00",
+    "date_from=2025-02-01T00:00:00&date_to=2025-01-01T00:00:00",
+    "date_from=2025-01-01T00:00:00&date_to=2025-01-01T00:00:00",
+    "date_from=0001-01-01T00:00:00&date_to=9999-12-31T00:00:00&bucket=day",
+    "date_from=1000-01-01T00:00:00&date_to=9999-01-01T00:00:00&bucket=month",
+    "date_from=0001-01-01T00:30:00%2B01:00&date_to=2025-01-01T00:00:00&bucket=year",
+])
+def test_invalid_windows_are_rejected(client, make_user, query):
+    user = make_user("alice")
+    assert client.get(f"/api/v1/analytics/spend?{query}", headers=user.headers).status_code == 422
+
+
+def test_period_cap_allows_the_default_daily_window(client, make_user):
+    user = make_user("alice")
+    response = client.get("/api/v1/analytics/spend?bucket=day&date_to=2025-01-01T00:00:00", headers=user.headers)
+    assert response.status_code == 200
+    assert response.json()["date_from"] == (datetime(2025, 1, 1) - DEFAULT_PERIOD).date().isoformat()
@@ -0,0 +1,95 @@
+import time
+from datetime import timedelta
+
+import pytest
+from jose import jwt
+from sqlalchemy import update
+
+from authorization.config import settings
+from authorization.jwt_generator import create_access_token, token_cache
+from authorization.principal_cache import principal_cache, token_version_cache
+from models.user import User
+
+
+@pytest.fixture
+def claims_only(monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_CLAIMS_ONLY", True)
+
+
+def login(client, username: str, password: str) -> dict:
+    response = client.post("/api/v1/login", json={"username": username, "password": password})
+    assert response.status_code == 200
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def registered(client):
+    response = client.post("/api/v1/register", json={"username": "alice", "email": "alice@example.com", "password": "old"})
+    assert response.status_code == 200
+    return response.json()["id"]
+
+
+@pytest.mark.parametrize("mode", ["database", "claims_only"])
+def test_password_change_revokes_old_tokens(client, registered, monkeypatch, mode):
+    monkeypatch.setattr(settings, "AUTH_CLAIMS_ONLY", mode == "claims_only")
+    headers = login(client, "alice", "old")
+    assert client.get("/api/v1/goals/", headers=headers).status_code == 200
+
+    client.put(f"/api/v1/users/{registered}/change-password", params={"new_password": "new"}).raise_for_status()
+
+    assert client.get("/api/v1/goals/", headers=headers).status_code == 401
+    assert client.get("/api/v1/goals/", headers=login(client, "alice", "new")).status_code == 200
+
+
+def test_claims_only_sees_other_process_revocations_after_ttl(client, session, registered, claims_only, monkeypatch):
+    monkeypatch.setattr(token_version_cache, "ttl", 0.1)
+    headers = login(client, "alice", "old")
+    assert client.get("/api/v1/goals/", headers=headers).status_code == 200
+
+    # another worker process bumped the version; this one only has its cached copy
+    session.execute(update(User).where(User.id == registered).values(token_version=User.token_version + 1))
+    session.commit()
+    time.sleep(0.2)
+
+    assert client.get("/api/v1/goals/", headers=headers).status_code == 401
+
+
+def test_cached_token_is_rejected_once_it_expires(client, make_user):
+    user = make_user("alice")
+    token = create_access_token({"sub": "alice", "user_id": user.id, "ver": 0}, expires_delta=timedelta(seconds=2))
+    headers = {"Authorization": f"Bearer {token}"}
+    before = token_cache.stats()
+    assert client.get("/api/v1/goals/", headers=headers).status_code == 200
+    assert client.get("/api/v1/goals/", headers=headers).status_code == 200
+    after = token_cache.stats()
+    assert (after["misses"] - before["misses"], after["hits"] - before["hits"]) == (1, 1)
+
+    # jose compares whole seconds, so the token is rejected from exp + 1 on
+    time.sleep(max(0, jwt.get_unverified_claims(token)["exp"] + 1 - time.time()) + 0.05)
+    assert client.get("/api/v1/goals/", headers=headers).status_code == 401
+
+
+@pytest.mark.parametrize("mode", ["database", "claims_only"])
+def test_password_change_revokes_tokens_still_in_the_jwt_cache(client, registered, monkeypatch, mode):
+    monkeypatch.setattr(settings, "AUTH_CLAIMS_ONLY", mode == "claims_only")
+    headers = login(client, "alice", "old")
+    client.get("/api/v1/goals/", headers=headers).raise_for_status()
+    hits = token_cache.stats()["hits"]
+
+    client.put(f"/api/v1/users/{registered}/change-password", params={"new_password": "new"}).raise_for_status()
+
+    # the payload is still served from the cache, the bumped ver rejects it
+    assert client.get("/api/v1/goals/", headers=headers).status_code == 401
+    assert token_cache.stats()["hits"] == hits + 1
+
+
+def test_cached_principal_sees_other_process_revocations_after_ttl(client, session, registered, monkeypatch):
+    monkeypatch.setattr(principal_cache, "ttl", 0.1)
+    headers = login(client, "alice", "old")
+    assert client.get("/api/v1/goals/", headers=headers).status_code == 200
+
+    session.execute(update(User).where(User.id == registered).values(token_version=User.token_version + 1))
+    session.commit()
+    time.sleep(0.2)
+
+    assert client.get("/api/v1/goals/", headers=headers).status_code == 401
@@ -0,0 +1,97 @@
+import importlib.util
+from datetime import date
+from pathlib import Path
+
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from sqlmodel import select
+
+from connection import engine
+from models.goal import Goal
+from models.transaction import Transaction
+from services import outbox
+from services.batch_jobs import goals_chunk
+from services.spend_rollup import verify
+
+MONTH = date(2025, 6, 1)
+OPENING_BALANCES = Path(__file__).parents[1] / "migrations" / "versions" / "7c3f1b8e4d26_seed_goal_opening_balances.py"
+
+
+def migrate(direction: str):
+    spec = importlib.util.spec_from_file_location("seed_goal_opening_balances", OPENING_BALANCES)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    with engine.begin() as conn, Operations.context(MigrationContext.configure(conn)):
+        getattr(migration, direction)()
+
+
+def deposit(client, user, category, goal_id, amount):
+    body = {
+        "amount": amount, "type": "income", "description": "x", "date": "2025-06-05T00:00:00", "category_id": category,
+        "linked_object_type": "goal", "linked_object_id": goal_id,
+    }
+    assert client.post("/api/v1/transactions/", json=body, headers=user.headers).status_code == 200
+
+
+def test_goal_create_rejects_seeded_amount(client, make_user):
+    user = make_user("alice")
+    body = {"title": "car", "target_amount": "100", "due_date": "2026-01-01"}
+    assert client.post("/api/v1/goals/", json={**body, "current_amount": "50"}, headers=user.headers).status_code == 422
+    response = client.post("/api/v1/goals/", json=body, headers=user.headers)
+    assert response.status_code == 200
+    assert float(response.json()["current_amount"]) == 0
+
+
+def test_goals_chunk_skips_users_with_pending_events(client, session, make_user, category):
+    user = make_user("alice")
+    goal = Goal(user_id=user.id, title="car", target_amount=100, due_date=date(2026, 1, 1))
+    session.add(goal)
+    session.commit()
+    goal_id = goal.id
+
+    deposit(client, user, category, goal_id, "30")
+    assert goals_chunk(0, user.id, MONTH)["changed"] == 0
+    session.expire_all()
+    assert session.get(Goal, goal_id).current_amount == 0
+
+    while outbox.drain(session):
+        pass
+    session.expire_all()
+    assert session.get(Goal, goal_id).current_amount == 30
+
+    session.get(Goal, goal_id).current_amount = 5
+    session.commit()
+    assert goals_chunk(0, user.id, MONTH)["changed"] == 1
+    session.expire_all()
+    assert session.get(Goal, goal_id).current_amount == 30
+
+
+def test_seeded_goal_amounts_survive_the_goals_job(client, session, make_user, category):
+    user = make_user("alice")
+    seeded = Goal(user_id=user.id, title="car", target_amount=100, current_amount=50, due_date=date(2026, 1, 1))
+    overdrawn = Goal(user_id=user.id, title="trip", target_amount=100, current_amount=-5, due_date=date(2026, 1, 1))
+    untouched = Goal(user_id=user.id, title="flat", target_amount=100, due_date=date(2026, 1, 1))
+    session.add_all([seeded, overdrawn, untouched])
+    session.commit()
+    ids = seeded.id, overdrawn.id, untouched.id
+    deposit(client, user, category, ids[0], "20")
+    seeded_amount = session.get(Goal, ids[0]).current_amount
+    while outbox.drain(session):
+        pass
+    session.get(Goal, ids[0]).current_amount = seeded_amount
+    session.commit()
+
+    migrate("upgrade")
+    session.expire_all()
+    opening = session.exec(select(Transaction).where(Transaction.description == "Opening balance").order_by(Transaction.linked_object_id)).all()
+    assert [(tr.linked_object_id, tr.type, tr.amount) for tr in opening] == [(ids[0], "income", 30), (ids[1], "expense", 5)]
+    assert verify(session) == []
+
+    assert goals_chunk(0, user.id, MONTH)["changed"] == 0
+    session.expire_all()
+    assert [session.get(Goal, goal_id).current_amount for goal_id in ids] == [50, -5, 0]
+
+    migrate("downgrade")
+    session.expire_all()
+    assert session.exec(select(Transaction).where(Transaction.description == "Opening balance")).all() == []
+    assert verify(session) == []
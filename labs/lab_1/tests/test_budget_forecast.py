@@ -0,0 +1,67 @@
+from datetime import date
+
+import numpy as np
+import pytest
+
+from models.budget import Budget
+from models.budget_category import BudgetCategory
+from models.category_month_spend import CategoryMonthSpend
+from services.budget_forecast import HISTORY_MONTHS, elapsed_days, forecast_users, project
+
+
+def test_project_blends_velocity_and_seasonality():
+    # seasonal: a year of 100s with 150 in the same month last year
+    seasonal = [150] + [100] * (HISTORY_MONTHS - 1)
+    history = np.array([seasonal, [0] * HISTORY_MONTHS], dtype=float)
+    projected, index = project(history, np.array([80.0, 30.0]), elapsed=10, days=30)
+
+    # baseline 1250/12, index 150/baseline = 1.44, expected rate 150/30 = 5 a day,
+    # velocity 8 a day, weight 10/30: rate 6, 80 + 6 * 20 = 200
+    assert index[0] == pytest.approx(1.44)
+    assert projected[0] == pytest.approx(200)
+    # no history: velocity only, 3 a day
+    assert index[1] == 1
+    assert projected[1] == pytest.approx(90)
+
+
+def test_project_clips_the_seasonal_index_before_the_month_starts():
+    history = np.array([[1000] + [10] * (HISTORY_MONTHS - 1)], dtype=float)
+    projected, index = project(history, np.zeros(1), elapsed=0, days=30)
+
+    # baseline 1110/12 = 92.5, index 1000/92.5 clipped to 2
+    assert index[0] == 2
+    assert projected[0] == pytest.approx(185)
+
+
+@pytest.mark.parametrize("as_of,expected", [
+    (date(2025, 5, 31), (0, 30)),
+    (date(2025, 6, 10), (10, 30)),
+    (date(2025, 7, 1), (30, 30)),
+])
+def test_elapsed_days(as_of, expected):
+    assert elapsed_days(date(2025, 6, 1), as_of) == expected
+
+
+def test_forecast_flags_categories_over_limit(session, make_user, category):
+    alice, bob = make_user("alice"), make_user("bob")
+    budget = Budget(user_id=alice.id, month=date(2025, 6, 1))
+    session.add(budget)
+    session.commit()
+    session.add(BudgetCategory(budget_id=budget.id, category_id=category, limit_amount=120))
+    history = [(date(2024, 6, 1), 150)] + [(date(2024 + (m > 12), (m - 1) % 12 + 1, 1), 100) for m in range(7, 18)]
+    session.add_all(
+        CategoryMonthSpend(user_id=alice.id, category_id=category, month=month, expense_sum=amount, count=1)
+        for month, amount in [*history, (date(2025, 6, 1), 80), (date(2023, 6, 1), 999)]
+    )
+    session.add(CategoryMonthSpend(user_id=bob.id, category_id=category, month=date(2025, 6, 1), expense_sum=30, count=1))
+    session.commit()
+
+    forecasts = forecast_users(session, [alice.id, bob.id], date(2025, 6, 1), as_of=date(2025, 6, 10))
+
+    [food] = forecasts[alice.id].categories
+    assert (food.budget_id, food.limit_amount, food.month_to_date) == (budget.id, 120, 80)
+    assert food.projected == 200
+    assert food.seasonal_index == 1.44
+    assert food.over_limit
+    [other] = forecasts[bob.id].categories
+    assert (other.budget_id, other.limit_amount, other.projected, other.over_limit) == (None, 0, 90, False)
@@ -0,0 +1,84 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import event
+from sqlmodel import select
+
+from api.budgets import WITH_CATEGORIES
+from connection import engine
+from models.budget import Budget
+from models.budget_category import BudgetCategory
+from models.category import Category
+from services import outbox
+from services.budget_spend import get_budget_spend
+
+
+@pytest.fixture
+def owner(client, session, make_user, category):
+    """June and July budgets over food and rent, with spend posted through the API."""
+    user = make_user("alice")
+    rent = Category(name="rent")
+    june = Budget(user_id=user.id, month=date(2025, 6, 1))
+    july = Budget(user_id=user.id, month=date(2025, 7, 15))
+    session.add_all([rent, june, july])
+    session.commit()
+    session.add_all(
+        BudgetCategory(budget_id=budget.id, category_id=category_id, limit_amount=200)
+        for budget in (june, july) for category_id in (category, rent.id)
+    )
+    session.commit()
+
+    for amount, day, category_id, budget in [
+        ("10", "2025-06-03", category, june),
+        ("15", "2025-06-20", category, None),
+        ("100", "2025-06-01", rent.id, None),
+        ("7", "2025-07-31", category, july),
+        ("3", "2025-08-01", category, None),
+    ]:
+        body = {"amount": amount, "type": "expense", "description": "x", "date": f"{day}T12:00:00", "category_id": category_id}
+        if budget:
+            body.update(linked_object_type="budget", linked_object_id=budget.id)
+        client.post("/api/v1/transactions/", json=body, headers=user.headers).raise_for_status()
+    while outbox.drain(session):
+        pass
+
+    user.food, user.rent, user.june, user.july = category, rent.id, june.id, july.id
+    return user
+
+
+def amounts(budget: dict) -> dict:
+    return {row["category_id"]: row["current_amount"] for row in budget["categories"]}
+
+
+def test_budget_list_sums_category_spend_per_month(client, owner):
+    budgets = client.get("/api/v1/budgets/", headers=owner.headers).json()
+    assert [amounts(budget) for budget in budgets] == [
+        {owner.food: 25, owner.rent: 100},
+        {owner.food: 7, owner.rent: 0},
+    ]
+    assert amounts(client.get(f"/api/v1/budgets/{owner.july}", headers=owner.headers).json()) == {owner.food: 7, owner.rent: 0}
+
+
+def test_budget_detail_counts_only_linked_spend(client, owner):
+    june = client.get(f"/api/v1/budgets/{owner.june}/details", headers=owner.headers).json()
+    assert amounts(june) == {owner.food: 10, owner.rent: 0}
+    assert [row["amount"] for row in june["transactions"]] == [10]
+
+
+def test_spend_takes_one_query_however_many_budgets(session, owner):
+    budgets = session.exec(select(Budget).options(WITH_CATEGORIES).order_by(Budget.id)).unique().all()
+    statements = []
+
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        for linked_only in (False, True):
+            for subset in (budgets[:1], budgets):
+                statements.clear()
+                spend = get_budget_spend(session, subset, linked_only)
+                assert len(statements) == 1
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    assert spend == {(owner.june, owner.food): 10, (owner.june, owner.rent): 0, (owner.july, owner.food): 7, (owner.july, owner.rent): 0}
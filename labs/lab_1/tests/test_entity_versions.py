@@ -0,0 +1,65 @@
+from datetime import date
+
+import pytest
+
+from models.budget import Budget
+from models.budget_category import BudgetCategory
+
+
+@pytest.mark.parametrize("month", [date(2025, 6, 1), date(2025, 6, 15), date(2025, 6, 30)])
+def test_unlinked_spend_bumps_budget_of_any_day_in_month(client, session, make_user, category, month):
+    user = make_user("alice")
+    budget = Budget(user_id=user.id, month=month)
+    session.add(budget)
+    session.commit()
+    session.add(BudgetCategory(budget_id=budget.id, category_id=category, limit_amount=500))
+    session.commit()
+
+    path = f"/api/v1/budgets/{budget.id}"
+    etag = client.get(path, headers=user.headers).headers["etag"]
+    client.post(
+        "/api/v1/transactions/",
+        json={"amount": "10", "type": "expense", "date": "2025-06-20T00:00:00", "category_id": category},
+        headers=user.headers,
+    ).raise_for_status()
+
+    assert client.get(path, headers={**user.headers, "If-None-Match": etag}).status_code == 200
+
+
+def test_spend_leaves_other_users_budgets_alone(client, session, make_user, category):
+    alice, bob = make_user("alice"), make_user("bob")
+    budget = Budget(user_id=bob.id, month=date(2025, 6, 1))
+    session.add(budget)
+    session.commit()
+    session.add(BudgetCategory(budget_id=budget.id, category_id=category, limit_amount=500))
+    session.commit()
+
+    path = f"/api/v1/budgets/{budget.id}"
+    etag = client.get(path, headers=bob.headers).headers["etag"]
+    client.post(
+        "/api/v1/transactions/",
+        json={"amount": "10", "type": "expense", "date": "2025-06-20T00:00:00", "category_id": category},
+        headers=alice.headers,
+    ).raise_for_status()
+
+    assert client.get(path, headers={**bob.headers, "If-None-Match": etag}).status_code == 304
+
+
+@pytest.mark.parametrize("change", [{"name": "groceries"}, {"is_income": True}])
+def test_category_update_bumps_budgets_nesting_it(client, session, make_user, category, change):
+    user = make_user("alice")
+    budget = Budget(user_id=user.id, month=date(2025, 6, 1))
+    session.add(budget)
+    session.commit()
+    session.add(BudgetCategory(budget_id=budget.id, category_id=category, limit_amount=500))
+    session.commit()
+
+    paths = [f"/api/v1/budgets/{budget.id}", f"/api/v1/budgets/{budget.id}/details", "/api/v1/budgets/"]
+    etags = [client.get(path, headers=user.headers).headers["etag"] for path in paths]
+    client.put(f"/api/v1/categories/{category}", json=change).raise_for_status()
+
+    for path, etag in zip(paths, etags):
+        response = client.get(path, headers={**user.headers, "If-None-Match": etag})
+        assert response.status_code == 200
+        [row] = (response.json() if path.endswith("/") else [response.json()])[0]["categories"]
+        assert {key: row["category"][key] for key in change} == change
@@ -0,0 +1,30 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from decimal import Decimal
+
+from sqlmodel import Session
+
+from connection import engine
+from models.goal import Goal
+from models.transaction import LinkedObjectType
+from services.linked_balances import adjust_linked
+
+
+def test_concurrent_adjustments_lose_no_updates(session, make_user):
+    user = make_user("alice")
+    goal = Goal(user_id=user.id, title="car", target_amount=10**6, due_date=date(2026, 1, 1))
+    session.add(goal)
+    session.commit()
+    goal_id = goal.id
+    amounts = [Decimal(i % 7 + 1) for i in range(400)]
+
+    def adjust(amount):
+        with Session(engine) as writer:
+            adjust_linked(writer, LinkedObjectType.goal, goal_id, amount)
+            writer.commit()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(adjust, amounts))
+
+    session.expire_all()
+    assert session.get(Goal, goal_id).current_amount == sum(amounts)
@@ -0,0 +1,59 @@
+import asyncio
+import threading
+
+import pytest
+
+from authorization.hash_service import HashingUnavailable, HashWorkerPool
+
+
+def test_cancelled_caller_keeps_slot_until_hash_finishes():
+    pool = HashWorkerPool(workers=1, queue_depth=0)
+    running, release = threading.Event(), threading.Event()
+
+    def slow_hash():
+        running.set()
+        release.wait(5)
+
+    async def scenario():
+        caller = asyncio.create_task(pool.run(slow_hash))
+        await asyncio.to_thread(running.wait, 5)
+        caller.cancel()
+        await asyncio.gather(caller, return_exceptions=True)
+
+        assert pool.stats()["in_flight"] == 1
+        with pytest.raises(HashingUnavailable):
+            await pool.run(lambda: None)
+
+        release.set()
+        await asyncio.to_thread(lambda: pool._executor.submit(lambda: None).result())
+        assert pool.stats()["in_flight"] == 0
+        assert pool.stats()["completed"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_queued_job_releases_its_slot():
+    pool = HashWorkerPool(workers=1, queue_depth=1)
+    running, release = threading.Event(), threading.Event()
+
+    def slow_hash():
+        running.set()
+        release.wait(5)
+
+    async def scenario():
+        first = asyncio.create_task(pool.run(slow_hash))
+        await asyncio.to_thread(running.wait, 5)
+        queued = asyncio.create_task(pool.run(lambda: None))
+        await asyncio.sleep(0)
+        queued.cancel()
+        await asyncio.gather(queued, return_exceptions=True)
+
+        assert pool.stats()["in_flight"] == 1
+        release.set()
+        await first
+        assert pool.stats() | {"queue_time_avg_ms": 0, "queue_time_max_ms": 0} == {
+            "in_flight": 0, "limit": 2, "started": 1, "completed": 1, "rejected": 0,
+            "queue_time_avg_ms": 0, "queue_time_max_ms": 0,
+        }
+
+    asyncio.run(scenario())
@@ -0,0 +1,93 @@
+import threading
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import select
+
+from models.idempotency_key import IdempotencyKey
+from models.transaction import Transaction
+from services.idempotency import KeyInFlight, claim_key
+
+BODY = {"amount": "10.5", "type": "expense", "description": "x", "date": "2025-06-05T00:00:00"}
+
+
+def post(client, user, category, key, **fields):
+    return client.post(
+        "/api/v1/transactions/",
+        json={**BODY, "category_id": category, **fields},
+        headers={**user.headers, "Idempotency-Key": key},
+    )
+
+
+def test_replay_returns_the_original_body(client, session, make_user, category):
+    user = make_user("alice")
+    first = post(client, user, category, "k1")
+    replay = post(client, user, category, "k1")
+
+    assert first.status_code == replay.status_code == 200
+    assert replay.headers["idempotent-replayed"] == "true"
+    assert "idempotent-replayed" not in first.headers
+    assert replay.content == first.content
+    assert len(session.exec(select(Transaction)).all()) == 1
+
+
+def test_key_reused_for_another_body_is_rejected(client, session, make_user, category):
+    user = make_user("alice")
+    assert post(client, user, category, "k1").status_code == 200
+    assert post(client, user, category, "k1", amount="11").status_code == 422
+    assert len(session.exec(select(Transaction)).all()) == 1
+
+
+def test_keys_are_scoped_per_user(client, session, make_user, category):
+    alice, bob = make_user("alice"), make_user("bob")
+    assert post(client, alice, category, "k1").json()["user_id"] == alice.id
+    assert post(client, bob, category, "k1").json()["user_id"] == bob.id
+    assert len(session.exec(select(Transaction)).all()) == 2
+
+
+def test_concurrent_duplicates_execute_once(client, session, make_user, category):
+    user = make_user("alice")
+    barrier = threading.Barrier(6)
+    responses = []
+
+    def send():
+        barrier.wait()
+        responses.append(post(client, user, category, "k1"))
+
+    threads = [threading.Thread(target=send) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(session.exec(select(Transaction)).all()) == 1
+    ok = [response for response in responses if response.status_code == 200]
+    assert ok and {response.content for response in ok} == {ok[0].content}
+    assert {response.status_code for response in responses} <= {200, 409}
+
+
+def test_lost_race_without_a_visible_winner_is_a_conflict(session, make_user, monkeypatch):
+    user = make_user("alice")
+
+    flush = session.flush
+
+    def lost_race(*args, **kwargs):
+        if not session.new:
+            return flush(*args, **kwargs)
+        monkeypatch.setattr(session, "flush", flush)
+        raise IntegrityError("INSERT INTO idempotency_key", {}, Exception("duplicate key"))
+
+    monkeypatch.setattr(session, "flush", lost_race)
+    with pytest.raises(KeyInFlight):
+        claim_key(session, user.id, "k1", "digest")
+
+
+def test_unfinished_key_answers_409(client, session, make_user, category):
+    user = make_user("alice")
+    claim_key(session, user.id, "k1", "digest")
+    session.commit()
+    assert session.get(IdempotencyKey, (user.id, "k1")).response is None
+
+    response = post(client, user, category, "k1")
+    assert response.status_code == 409
+    assert response.headers["retry-after"] == "1"
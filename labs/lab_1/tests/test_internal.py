@@ -0,0 +1,19 @@
+import pytest
+
+from authorization.config import settings
+
+PATHS = ["/internal/pool", "/internal/hash", "/internal/caches", "/metrics"]
+
+
+@pytest.mark.parametrize("path", PATHS)
+def test_internal_endpoints_are_hidden_without_configured_token(client, monkeypatch, path):
+    monkeypatch.setattr(settings, "INTERNAL_TOKEN", "")
+    assert client.get(path, headers={"Authorization": "Bearer anything"}).status_code == 404
+
+
+@pytest.mark.parametrize("path", PATHS)
+def test_internal_endpoints_require_the_token(client, make_user, monkeypatch, path):
+    monkeypatch.setattr(settings, "INTERNAL_TOKEN", "s3cret")
+    assert client.get(path).status_code == 401
+    assert client.get(path, headers=make_user("alice").headers).status_code == 401
+    assert client.get(path, headers={"Authorization": "Bearer s3cret"}).status_code == 200
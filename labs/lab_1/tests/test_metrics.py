@@ -0,0 +1,55 @@
+import pytest
+from fastapi import APIRouter, FastAPI, Request
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from services.metrics import UNMATCHED_ROUTE, instrument_engine, route_template
+
+router = APIRouter()
+
+
+@router.get("/files/{name}/versions/{version}")
+def file_version(name: str, version: int, request: Request):
+    return route_template(request.scope)
+
+
+@router.get("/docs/{rest:path}")
+def docs(rest: str, request: Request):
+    return route_template(request.scope)
+
+
+app = FastAPI()
+app.include_router(router, prefix="/api/v1")
+
+
+@pytest.mark.parametrize("path,template", [
+    ("/api/v1/files/v1/versions/1", "/api/v1/files/{name}/versions/{version}"),
+    ("/api/v1/files/api/versions/2", "/api/v1/files/{name}/versions/{version}"),
+    ("/api/v1/docs/a/b/c", "/api/v1/docs/{rest}"),
+])
+def test_route_template_keeps_literal_segments(path, template):
+    with TestClient(app) as client:
+        assert client.get(path).json() == template
+
+
+def test_prefixed_route_template_is_used_as_is():
+    # what include_router hands over when it copies routes with their prefix
+    route = APIRoute("/api/v1/files/{name}/versions/{version}", file_version)
+    scope = {"route": route, "path": "/api/v1/files/api/versions/2", "path_params": {"name": "api", "version": "2"}}
+    assert route_template(scope) == "/api/v1/files/{name}/versions/{version}"
+
+
+def test_unmatched_route():
+    assert route_template({"path": "/nowhere"}) == UNMATCHED_ROUTE
+
+
+def test_failed_statement_does_not_leak_timing():
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    with engine.connect() as conn:
+        with pytest.raises(OperationalError):
+            conn.execute(text("SELECT * FROM missing"))
+        conn.execute(text("SELECT 1"))
+        assert conn.info["query_started"] == []
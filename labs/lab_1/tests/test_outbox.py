@@ -0,0 +1,145 @@
+import time
+from datetime import date
+
+import pytest
+from sqlmodel import select
+
+from models.budget import Budget
+from models.budget_category import BudgetCategory
+from models.category_month_spend import CategoryMonthSpend
+from models.goal import Goal
+from services import outbox
+
+
+def drain(session):
+    while outbox.drain(session):
+        pass
+    session.expire_all()
+
+
+@pytest.fixture
+def owner(session, make_user, category):
+    user = make_user("alice")
+    budget = Budget(user_id=user.id, month=date(2025, 6, 1))
+    goal = Goal(user_id=user.id, title="car", target_amount=100, due_date=date(2026, 1, 1))
+    session.add_all([budget, goal])
+    session.commit()
+    session.add(BudgetCategory(budget_id=budget.id, category_id=category, limit_amount=500))
+    session.commit()
+    user.budget, user.goal, user.category = budget.id, goal.id, category
+    return user
+
+
+def post_transaction(client, user, **fields):
+    body = {"amount": "10", "type": "expense", "description": "x", "date": "2025-06-05T00:00:00", "category_id": user.category, **fields}
+    response = client.post("/api/v1/transactions/", json=body, headers=user.headers)
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_patch_date_moves_rollup_month(client, session, owner):
+    tr = post_transaction(client, owner)
+    response = client.patch(f"/api/v1/transactions/{tr['id']}", json={"date": "2025-07-05"}, headers=owner.headers)
+    assert response.status_code == 200
+    assert response.json()["date"].startswith("2025-07-05")
+
+    drain(session)
+    spend = dict(session.execute(select(CategoryMonthSpend.month, CategoryMonthSpend.expense_sum)).all())
+    assert spend == {date(2025, 6, 1): 0, date(2025, 7, 1): 10}
+
+
+@pytest.mark.parametrize("field", ["amount", "type", "date", "category_id"])
+def test_patch_rejects_null_for_required_fields(client, session, owner, field):
+    tr = post_transaction(client, owner)
+    response = client.patch(f"/api/v1/transactions/{tr['id']}", json={field: None}, headers=owner.headers)
+    assert response.status_code == 422
+    assert client.get(f"/api/v1/transactions/{tr['id']}", headers=owner.headers).json() == tr
+
+
+def test_patch_allows_clearing_the_description(client, owner):
+    tr = post_transaction(client, owner)
+    response = client.patch(f"/api/v1/transactions/{tr['id']}", json={"description": None}, headers=owner.headers)
+    assert response.status_code == 200
+    assert response.json()["description"] is None
+
+
+def test_transaction_write_invalidates_before_drain(client, owner):
+    detail = f"/api/v1/budgets/{owner.budget}/details"
+    etag = client.get(detail, headers=owner.headers).headers["etag"]
+    analytics = "/api/v1/analytics/spend?date_from=2025-01-01T00:00:00&date_to=2026-01-01T00:00:00"
+    assert client.get(analytics, headers=owner.headers).json()["series"] == []
+
+    post_transaction(client, owner, linked_object_type="budget", linked_object_id=owner.budget)
+
+    response = client.get(detail, headers={**owner.headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert len(response.json()["transactions"]) == 1
+    assert len(client.get(analytics, headers=owner.headers).json()["series"]) == 1
+
+
+def test_drain_bumps_goal_version(client, session, owner):
+    path = f"/api/v1/goals/{owner.goal}"
+    post_transaction(client, owner, type="income", linked_object_type="goal", linked_object_id=owner.goal)
+    etag = client.get(path, headers=owner.headers).headers["etag"]
+
+    drain(session)
+    response = client.get(path, headers={**owner.headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert float(response.json()["current_amount"]) == 10
+
+
+def test_embedded_worker_drains_outbox(client, session, owner):
+    stop = outbox.start_worker()
+    try:
+        post_transaction(client, owner, type="income", linked_object_type="goal", linked_object_id=owner.goal)
+        deadline = time.monotonic() + 5
+        while session.get(Goal, owner.goal).current_amount != 10 and time.monotonic() < deadline:
+            time.sleep(0.05)
+            session.expire_all()
+    finally:
+        stop.set()
+    assert session.get(Goal, owner.goal).current_amount == 10
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    sent = []
+    monkeypatch.setattr(outbox, "notify", sent.append)
+    return sent
+
+
+@pytest.mark.parametrize("batch_size", [1, 2])
+def test_goal_reached_is_keyed_on_goal_and_target(client, session, owner, sent, batch_size):
+    for _ in range(2):
+        post_transaction(client, owner, type="income", amount="60", linked_object_type="goal", linked_object_id=owner.goal)
+    while outbox.drain(session, batch_size):
+        pass
+
+    target = session.get(Goal, owner.goal).target_amount
+    assert sent == [{"key": f"goal_reached:{owner.goal}:{target}", "kind": "goal_reached", "user_id": owner.id, "goal_id": owner.goal, "target_amount": str(target)}]
+
+
+def test_goal_reached_is_sent_only_after_the_balance_commits(client, session, owner, sent, monkeypatch):
+    post_transaction(client, owner, type="income", amount="100", linked_object_type="goal", linked_object_id=owner.goal)
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("lost the connection")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(session, "commit", fail)
+        with pytest.raises(RuntimeError):
+            outbox._process(session, outbox._claim(session, 10))
+    session.rollback()
+    assert sent == []
+
+    assert outbox.drain(session) == 1
+    assert sent == []
+    assert outbox.drain(session) == 1
+    assert [notification["goal_id"] for notification in sent] == [owner.goal]
+
+
+def test_goal_reached_again_reuses_the_key(client, session, owner, sent):
+    for tr_type in ("income", "expense", "income"):
+        post_transaction(client, owner, type=tr_type, amount="100", linked_object_type="goal", linked_object_id=owner.goal)
+        drain(session)
+    assert len(sent) == 1
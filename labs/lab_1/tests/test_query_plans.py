@@ -0,0 +1,18 @@
+from bench.query_plans import capture_statements, full_scans, seed
+from connection import engine
+
+
+def test_router_queries_do_not_scan_large_tables():
+    statements = capture_statements(seed(users=3, transactions=300))
+    assert len(statements) > 10
+
+    connection = engine.raw_connection()
+    try:
+        scans = {
+            statement: scanned
+            for statement, parameters in statements.items()
+            if (scanned := full_scans(connection, statement, parameters)[1])
+        }
+    finally:
+        connection.close()
+    assert scans == {}
@@ -0,0 +1,54 @@
+import time
+
+import pytest
+from sqlmodel import Session, SQLModel, create_engine
+
+import connection
+from connection import ReplicaRouter, engine
+from models.category import Category
+
+
+@pytest.fixture
+def router(tmp_path, monkeypatch):
+    """A replica file holding a differently named category, so each read shows which database served it."""
+    replica = create_engine(f"sqlite:///{tmp_path}/replica.db")
+    for bind, name in ((engine, "from-primary"), (replica, "from-replica")):
+        SQLModel.metadata.create_all(bind)
+        with Session(bind) as session:
+            session.add(Category(id=1, name=name))
+            session.commit()
+    router = ReplicaRouter(engine, [replica], max_lag=5, check_interval=0, sticky_seconds=0.3)
+    monkeypatch.setattr(connection, "replica_router", router)
+    yield router
+    replica.dispose()
+
+
+def served_by(client, user) -> str:
+    return client.get("/api/v1/categories/1", headers=user.headers).json()["name"]
+
+
+def test_reads_go_to_replica(client, router, make_user):
+    assert served_by(client, make_user("alice")) == "from-replica"
+
+
+def test_writer_reads_primary_within_sticky_window(client, router, make_user):
+    alice, bob = make_user("alice"), make_user("bob")
+    client.post("/api/v1/categories/", json={"name": "written", "is_income": False}, headers=alice.headers).raise_for_status()
+
+    assert served_by(client, alice) == "from-primary"
+    assert served_by(client, bob) == "from-replica"
+    time.sleep(router.sticky_seconds + 0.1)
+    assert served_by(client, alice) == "from-replica"
+
+
+def test_lagging_replica_falls_back_to_primary(client, router, make_user, monkeypatch):
+    monkeypatch.setattr(connection, "replica_lag", lambda replica: router.max_lag + 1)
+    assert served_by(client, make_user("alice")) == "from-primary"
+
+
+def test_failing_lag_probe_falls_back_to_primary(client, router, make_user, monkeypatch):
+    def unreachable(replica):
+        raise ConnectionError("replica down")
+
+    monkeypatch.setattr(connection, "replica_lag", unreachable)
+    assert served_by(client, make_user("alice")) == "from-primary"
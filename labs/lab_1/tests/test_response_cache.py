@@ -0,0 +1,75 @@
+import time
+
+import pytest
+from sqlalchemy import text
+
+from services.response_cache import RedisBackend, response_cache
+
+
+class FakeRedis:
+    """The slice of redis-py RedisBackend uses, with ``ex`` expiry."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        value, expires = self.data.get(key, (None, None))
+        if expires is not None and expires <= time.monotonic():
+            del self.data[key]
+            return None
+        return value
+
+    def set(self, key, value, ex=None):
+        self.data[key] = (value, time.monotonic() + ex if ex else None)
+
+    def delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+
+@pytest.fixture(params=["memory", "redis"])
+def backend(request, monkeypatch):
+    if request.param == "redis":
+        monkeypatch.setattr(response_cache, "backend", RedisBackend(FakeRedis()))
+    return response_cache.backend
+
+
+def test_redis_backend_prefixes_and_expires_keys():
+    client = FakeRedis()
+    backend = RedisBackend(client, prefix="test:")
+    backend.set("a", b"1", ttl=60)
+    backend.set("b", b"2", ttl=0.05)
+    assert set(client.data) == {"test:a", "test:b"}
+    assert backend.get("a") == b"1"
+
+    time.sleep(0.1)
+    assert backend.get("b") is None
+    backend.delete("a")
+    assert backend.get("a") is None
+
+
+def test_categories_are_served_from_cache_until_a_write(client, session, backend, make_user):
+    user = make_user("alice")
+    client.post("/api/v1/categories/", json={"name": "food", "is_income": False}, headers=user.headers).raise_for_status()
+    first = client.get("/api/v1/categories/")
+    assert [row["name"] for row in first.json()] == ["food"]
+
+    session.execute(text("UPDATE category SET name = 'changed behind the cache'"))
+    session.commit()
+    assert client.get("/api/v1/categories/").json() == first.json()
+    assert client.get("/api/v1/categories/", headers={"If-None-Match": first.headers["etag"]}).status_code == 304
+
+    client.post("/api/v1/categories/", json={"name": "rent", "is_income": False}, headers=user.headers).raise_for_status()
+    assert [row["name"] for row in client.get("/api/v1/categories/").json()] == ["changed behind the cache", "rent"]
+
+
+def test_category_write_invalidates_every_users_budget_categories(client, backend, make_user):
+    alice, bob = make_user("alice"), make_user("bob")
+    category = client.post("/api/v1/categories/", json={"name": "food", "is_income": False}, headers=alice.headers).json()
+    for user in (alice, bob):
+        client.post("/api/v1/budgets/", json={"month": "2025-06-01", "categories": [category["id"]]}, headers=user.headers).raise_for_status()
+        assert client.get("/api/v1/budget-categories/", headers=user.headers).json()[0]["category"]["name"] == "food"
+
+    client.put(f"/api/v1/categories/{category['id']}", json={"name": "groceries"}, headers=alice.headers).raise_for_status()
+
+    for user in (alice, bob):
+        assert client.get("/api/v1/budget-categories/", headers=user.headers).json()[0]["category"]["name"] == "groceries"
@@ -0,0 +1,78 @@
+from datetime import date, datetime
+
+from sqlmodel import select
+
+from models.category import Category
+from models.category_month_spend import CategoryMonthSpend
+from models.transaction import Transaction
+from services import outbox, spend_rollup
+
+JUNE, JULY = date(2025, 6, 1), date(2025, 7, 1)
+
+
+def rollup(session) -> dict:
+    session.expire_all()
+    return {
+        (row.category_id, row.month): (row.income_sum, row.expense_sum, row.count)
+        for row in session.exec(select(CategoryMonthSpend)).all()
+    }
+
+
+def drain(session):
+    while outbox.drain(session):
+        pass
+
+
+def test_writes_keep_the_rollup_in_step(client, session, make_user, category):
+    user = make_user("alice")
+    rent = Category(name="rent")
+    session.add(rent)
+    session.commit()
+    rent_id = rent.id
+
+    def post(amount, tr_type, day):
+        body = {"amount": amount, "type": tr_type, "description": "x", "date": f"{day}T08:00:00", "category_id": category}
+        return client.post("/api/v1/transactions/", json=body, headers=user.headers).json()["id"]
+
+    first = post("10", "expense", "2025-06-02")
+    second = post("4.5", "expense", "2025-06-30")
+    post("100", "income", "2025-06-15")
+    drain(session)
+    assert rollup(session) == {(category, JUNE): (100, 14.5, 3)}
+
+    client.patch(f"/api/v1/transactions/{first}", json={"date": "2025-07-01T00:00:00", "amount": "12"}, headers=user.headers).raise_for_status()
+    client.patch(f"/api/v1/transactions/{second}", json={"category_id": rent_id}, headers=user.headers).raise_for_status()
+    drain(session)
+    assert rollup(session) == {
+        (category, JUNE): (100, 0, 1),
+        (category, JULY): (0, 12, 1),
+        (rent_id, JUNE): (0, 4.5, 1),
+    }
+
+    client.delete(f"/api/v1/transactions/{first}", headers=user.headers).raise_for_status()
+    drain(session)
+    assert rollup(session)[(category, JULY)] == (0, 0, 0)
+    assert spend_rollup.verify(session) == []
+
+
+def test_verify_finds_drift_and_rebuild_fixes_it(session, make_user, category):
+    user = make_user("alice")
+    session.add_all([
+        Transaction(user_id=user.id, category_id=category, amount=10, type="expense", date=datetime(2025, 6, 1)),
+        Transaction(user_id=user.id, category_id=category, amount=5, type="expense", date=datetime(2025, 6, 30, 23)),
+        Transaction(user_id=user.id, category_id=category, amount=7, type="income", date=datetime(2025, 7, 1)),
+        CategoryMonthSpend(user_id=user.id, category_id=category, month=JUNE, income_sum=0, expense_sum=11, count=2),
+        CategoryMonthSpend(user_id=user.id, category_id=category, month=date(2025, 5, 1), income_sum=0, expense_sum=1, count=1),
+    ])
+    session.commit()
+
+    mismatches = {key[2]: (actual, expected) for key, actual, expected in spend_rollup.verify(session)}
+    assert mismatches == {
+        JUNE: ([0, 11, 2], [0, 15, 2]),
+        date(2025, 5, 1): ([0, 1, 1], None),
+        JULY: (None, [7, 0, 1]),
+    }
+
+    assert spend_rollup.rebuild(session) == 2
+    assert rollup(session) == {(category, JUNE): (0, 15, 2), (category, JULY): (7, 0, 1)}
+    assert spend_rollup.verify(session) == []
@@ -0,0 +1,121 @@
+from datetime import date, datetime
+
+import pytest
+
+from models.budget import Budget
+from models.budget_category import BudgetCategory
+from models.goal import Goal
+from models.transaction import Transaction
+from services import outbox
+
+ROWS = ((Goal, "goal"), (Budget, "budget"), (BudgetCategory, "budget_category"), (Transaction, "transaction"))
+
+DETAILS = [
+    ("GET", "/api/v1/goals/{goal}", None),
+    ("GET", "/api/v1/goals/{goal}/details", None),
+    ("PUT", "/api/v1/goals/{goal}", {"target_amount": 1}),
+    ("DELETE", "/api/v1/goals/{goal}", None),
+    ("GET", "/api/v1/budgets/{budget}", None),
+    ("GET", "/api/v1/budgets/{budget}/details", None),
+    ("PUT", "/api/v1/budgets/{budget}", {"month": "2025-07-01", "categories": []}),
+    ("DELETE", "/api/v1/budgets/{budget}", None),
+    ("GET", "/api/v1/budget-categories/{budget_category}", None),
+    ("DELETE", "/api/v1/budget-categories/{budget_category}", None),
+    ("GET", "/api/v1/transactions/{transaction}", None),
+    ("PATCH", "/api/v1/transactions/{transaction}", {"amount": 1}),
+    ("DELETE", "/api/v1/transactions/{transaction}", None),
+]
+
+
+@pytest.fixture
+def tenants(session, make_user, category):
+    """Two users with one goal, budget, budget category and linked transaction each."""
+    tenants = {}
+    for limit, name in enumerate(("alice", "bob"), start=1):
+        user = make_user(name)
+        budget = Budget(user_id=user.id, month=date(2025, 6, 1))
+        goal = Goal(user_id=user.id, title=f"{name} goal", target_amount=1000, due_date=date(2026, 1, 1))
+        session.add_all([budget, goal])
+        session.commit()
+        budget_category = BudgetCategory(budget_id=budget.id, category_id=category, limit_amount=limit)
+        tr = Transaction(
+            user_id=user.id, category_id=category, amount=10, type="expense",
+            date=datetime(2025, 6, 2), linked_object_type="budget", linked_object_id=budget.id,
+        )
+        session.add_all([budget_category, tr])
+        session.commit()
+        user.ids = {"goal": goal.id, "budget": budget.id, "budget_category": budget_category.id, "transaction": tr.id}
+        user.limit = limit
+        tenants[name] = user
+    return tenants
+
+
+@pytest.mark.parametrize("path", ["/api/v1/goals/", "/api/v1/budgets/"])
+def test_lists_only_return_own_rows(client, tenants, path):
+    for user in tenants.values():
+        response = client.get(path, headers=user.headers)
+        assert response.status_code == 200
+        assert {row["user_id"] for row in response.json()} == {user.id}
+
+
+def test_transaction_list_only_returns_own_rows(client, tenants):
+    for user in tenants.values():
+        response = client.get("/api/v1/transactions/", headers=user.headers)
+        assert response.status_code == 200
+        assert [row["id"] for row in response.json()["items"]] == [user.ids["transaction"]]
+
+
+def test_budget_category_list_only_returns_own_rows(client, tenants):
+    for user in tenants.values():
+        response = client.get("/api/v1/budget-categories/", headers=user.headers)
+        assert response.status_code == 200
+        assert [row["limit_amount"] for row in response.json()] == [user.limit]
+
+
+def test_budget_spend_only_counts_own_transactions(client, session, tenants, category):
+    for amount, user in zip(("23", "77"), tenants.values()):
+        body = {"amount": amount, "type": "expense", "description": "x", "date": "2025-06-05T00:00:00", "category_id": category}
+        client.post("/api/v1/transactions/", json=body, headers=user.headers).raise_for_status()
+    while outbox.drain(session):
+        pass
+
+    for amount, user in zip((23, 77), tenants.values()):
+        budgets = client.get("/api/v1/budgets/", headers=user.headers).json()
+        assert [row["current_amount"] for row in budgets[0]["categories"]] == [amount]
+        budget = client.get(f"/api/v1/budgets/{user.ids['budget']}", headers=user.headers).json()
+        assert [row["current_amount"] for row in budget["categories"]] == [amount]
+
+
+@pytest.mark.parametrize("method,template,body", DETAILS)
+def test_other_users_rows_are_not_found(client, session, tenants, method, template, body):
+    alice, bob = tenants["alice"], tenants["bob"]
+    response = client.request(method, template.format(**bob.ids), headers=alice.headers, json=body)
+    assert response.status_code == 404
+
+    for model, key in ROWS:
+        assert session.get(model, bob.ids[key]) is not None
+
+
+@pytest.mark.parametrize("method,template,body", [detail for detail in DETAILS if detail[0] == "GET"])
+def test_anonymous_requests_are_rejected(client, tenants, method, template, body):
+    assert client.get(template.format(**tenants["bob"].ids)).status_code == 401
+
+
+def test_owner_can_create_and_update_budget(client, session, make_user, category):
+    user = make_user("carol")
+    created = client.post("/api/v1/budgets/", json={"month": "2025-06-01", "categories": [category]}, headers=user.headers)
+    assert created.status_code == 200
+    assert [row["category_id"] for row in created.json()["categories"]] == [category]
+
+    budget_id = created.json()["id"]
+    updated = client.put(
+        f"/api/v1/budgets/{budget_id}",
+        json={"month": "2025-07-01", "categories": [{"category_id": category, "limit_amount": 250}]},
+        headers=user.headers,
+    )
+    assert updated.status_code == 200
+    assert updated.json()["month"] == "2025-07-01"
+    assert [row["limit_amount"] for row in updated.json()["categories"]] == [250]
+
+    listed = client.get("/api/v1/budget-categories/", headers=user.headers).json()
+    assert [row["limit_amount"] for row in listed] == [250]
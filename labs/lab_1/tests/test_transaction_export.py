@@ -0,0 +1,75 @@
+import csv
+import gzip
+import io
+import json
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from models.transaction import Transaction
+from services import transaction_export
+
+PATH = "/api/v1/transactions/export"
+PLAIN = {"Accept-Encoding": "identity"}
+
+
+@pytest.fixture
+def owner(session, make_user, category):
+    user = make_user("alice")
+    other = make_user("bob")
+    session.add_all([
+        Transaction(user_id=user.id, category_id=category, amount="12.50", type="expense", description='rent, "june"', date=datetime(2025, 6, 2)),
+        Transaction(user_id=user.id, category_id=category, amount=40, type="income", date=datetime(2025, 6, 1), linked_object_type="goal", linked_object_id=7),
+        Transaction(user_id=user.id, category_id=category, amount=3, type="expense", date=datetime(2025, 7, 1)),
+        Transaction(user_id=other.id, category_id=category, amount=99, type="expense", date=datetime(2025, 6, 1)),
+    ])
+    session.commit()
+    user.category = category
+    return user
+
+
+@pytest.fixture(autouse=True)
+def small_batches(monkeypatch):
+    monkeypatch.setattr(transaction_export, "BATCH_SIZE", 2)
+
+
+def test_ndjson(client, owner):
+    response = client.get(PATH, headers={**owner.headers, **PLAIN})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.headers["content-disposition"] == 'attachment; filename="transactions.ndjson"'
+    assert "content-encoding" not in response.headers
+
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [(row["date"], Decimal(row["amount"]), row["type"]) for row in rows] == [
+        ("2025-06-01T00:00:00", 40, "income"),
+        ("2025-06-02T00:00:00", Decimal("12.5"), "expense"),
+        ("2025-07-01T00:00:00", 3, "expense"),
+    ]
+    assert rows[0]["linked_object_type"] == "goal" and rows[0]["linked_object_id"] == 7
+    assert {row["user_id"] for row in rows} == {owner.id}
+    assert list(rows[0]) == transaction_export.EXPORT_FIELDS
+
+
+def test_csv_with_filters(client, owner):
+    response = client.get(PATH, params={"format": "csv", "date_to": "2025-07-01T00:00:00"}, headers={**owner.headers, **PLAIN})
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.headers["content-disposition"] == 'attachment; filename="transactions.csv"'
+
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [(Decimal(row["amount"]), row["description"], row["linked_object_id"]) for row in rows] == [
+        (40, "", "7"),
+        (Decimal("12.5"), 'rent, "june"', ""),
+    ]
+
+
+@pytest.mark.parametrize("fmt", ["ndjson", "csv"])
+def test_gzip(client, owner, fmt):
+    plain = client.get(PATH, params={"format": fmt}, headers={**owner.headers, **PLAIN}).content
+    with client.stream("GET", PATH, params={"format": fmt}, headers={**owner.headers, "Accept-Encoding": "gzip"}) as response:
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["content-disposition"] == f'attachment; filename="transactions.{fmt}"'
+        raw = b"".join(response.iter_raw())
+    assert raw[:2] == b"\x1f\x8b"
+    assert gzip.decompress(raw) == plain
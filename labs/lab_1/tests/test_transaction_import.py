@@ -0,0 +1,124 @@
+import json
+from datetime import date
+
+import pytest
+from sqlmodel import select
+
+import api.transactions
+from models.budget import Budget
+from models.category_month_spend import CategoryMonthSpend
+from models.goal import Goal
+from models.transaction import Transaction
+from services.spend_rollup import verify
+
+PATH = "/api/v1/transactions/bulk"
+
+
+@pytest.fixture
+def owner(session, make_user, category):
+    user = make_user("alice")
+    budget = Budget(user_id=user.id, month=date(2025, 6, 1))
+    goal = Goal(user_id=user.id, title="car", target_amount=100, due_date=date(2026, 1, 1))
+    session.add_all([budget, goal])
+    session.commit()
+    user.budget, user.goal, user.category = budget.id, goal.id, category
+    return user
+
+
+def upload(client, user, body, content_type="application/json", **params):
+    return client.post(PATH, content=body, headers={**user.headers, "Content-Type": content_type}, params=params)
+
+
+@pytest.mark.parametrize("body,content_type,params", [
+    (b"[{", "application/json", {}),
+    (b'{"amount": 1}', "application/json", {}),
+    (b"\xff\xfe\x00amount", "application/json", {}),
+    (b"amount,type\n\xff,expense\n", "text/csv", {}),
+    (b'amount,type\n"1' + b"x" * (1 << 17) + b'",expense\n', "text/csv", {}),
+    (b"<OFX><STMTTRN><TRNAMT>-5</STMTTRN></OFX>", "application/x-ofx", {}),
+], ids=["json-syntax", "json-object", "json-encoding", "csv-encoding", "csv-field-size", "ofx-no-category"])
+def test_unparseable_bodies_are_rejected(client, session, owner, body, content_type, params):
+    response = upload(client, owner, body, content_type, **params)
+    assert response.status_code == 400
+    assert session.exec(select(Transaction)).all() == []
+
+
+def test_too_many_rows(client, session, owner, monkeypatch):
+    monkeypatch.setattr(api.transactions, "MAX_IMPORT_ROWS", 2)
+    row = {"amount": "1", "type": "expense", "date": "2025-06-01T00:00:00", "category_id": owner.category}
+    assert upload(client, owner, json.dumps([row] * 2)).status_code == 200
+    assert upload(client, owner, json.dumps([row] * 3)).status_code == 413
+    assert len(session.exec(select(Transaction)).all()) == 2
+
+
+def test_foreign_and_invalid_rows_are_reported(client, session, owner, make_user):
+    bob = make_user("bob")
+    goal = Goal(user_id=bob.id, title="bob goal", target_amount=100, due_date=date(2026, 1, 1))
+    budget = Budget(user_id=bob.id, month=date(2025, 6, 1))
+    session.add_all([goal, budget])
+    session.commit()
+    base = {"amount": "10", "type": "income", "date": "2025-06-01T00:00:00", "category_id": owner.category}
+    rows = [
+        {**base, "linked_object_type": "goal", "linked_object_id": goal.id},
+        {**base, "linked_object_type": "budget", "linked_object_id": budget.id},
+        {**base, "linked_object_type": "goal"},
+        {**base, "category_id": 999},
+        {**base, "amount": "ten"},
+        "not an object",
+        base,
+    ]
+    result = upload(client, owner, json.dumps(rows)).json()
+
+    assert result["received"] == 7
+    assert result["inserted"] == 1
+    assert [(error["row"], error["errors"][0]) for error in result["errors"][:4]] == [
+        (0, "Goal not found"),
+        (1, "Budget not found"),
+        (2, "Both linked_object_id and linked_object_type must be set together."),
+        (3, "Category not found"),
+    ]
+    assert [error["row"] for error in result["errors"][4:]] == [4, 5]
+    session.refresh(goal)
+    assert goal.current_amount == 0
+    assert [tr.user_id for tr in session.exec(select(Transaction)).all()] == [owner.id]
+
+
+@pytest.mark.parametrize("content_type", ["application/json", "text/csv", "application/x-ofx"])
+def test_import_applies_balances_and_rollup(client, session, owner, content_type):
+    rows = [
+        ("income", "30", "2025-06-02", "goal", owner.goal),
+        ("income", "15", "2025-06-03", "goal", owner.goal),
+        ("expense", "40", "2025-06-04", "budget", owner.budget),
+        ("expense", "5", "2025-07-01", None, None),
+    ]
+    if content_type == "application/x-ofx":
+        # OFX has no linked objects, only signed amounts
+        body = "".join(
+            f"<STMTTRN><TRNAMT>{'-' if tr_type == 'expense' else ''}{amount}<DTPOSTED>{day.replace('-', '')}120000<MEMO>x</STMTTRN>"
+            for tr_type, amount, day, _, _ in rows
+        ).encode()
+        params = {"category_id": owner.category}
+    elif content_type == "text/csv":
+        lines = ["type,amount,date,category_id,linked_object_type,linked_object_id"]
+        lines += [f"{t},{a},{d}T00:00:00,{owner.category},{lt or ''},{li or ''}" for t, a, d, lt, li in rows]
+        body, params = "\n".join(lines).encode(), {}
+    else:
+        body = json.dumps([
+            {"type": t, "amount": a, "date": f"{d}T00:00:00", "category_id": owner.category,
+             "linked_object_type": lt, "linked_object_id": li}
+            for t, a, d, lt, li in rows
+        ])
+        params = {}
+
+    result = upload(client, owner, body, content_type, **params).json()
+    assert result["inserted"] == 4 and result["errors"] == []
+
+    linked = content_type != "application/x-ofx"
+    assert session.get(Goal, owner.goal).current_amount == (45 if linked else 0)
+    assert session.get(Budget, owner.budget).current_amount == (40 if linked else 0)
+    spend = {
+        row.month: (row.income_sum, row.expense_sum, row.count)
+        for row in session.exec(select(CategoryMonthSpend).where(CategoryMonthSpend.user_id == owner.id)).all()
+    }
+    assert spend == {date(2025, 6, 1): (45, 40, 3), date(2025, 7, 1): (0, 5, 1)}
+    assert verify(session) == []
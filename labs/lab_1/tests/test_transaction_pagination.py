@@ -0,0 +1,88 @@
+import base64
+from datetime import datetime, timedelta
+
+import pytest
+from sqlmodel import select
+
+from models.category import Category
+from models.transaction import Transaction
+
+PATH = "/api/v1/transactions/"
+
+
+def pages(client, user, limit, **params):
+    """Follow next_cursor to the end, returning every page's ids."""
+    result, cursor = [], None
+    while True:
+        page = client.get(PATH, params={**params, "limit": limit, **({"cursor": cursor} if cursor else {})}, headers=user.headers)
+        assert page.status_code == 200
+        body = page.json()
+        result.append([row["id"] for row in body["items"]])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return result
+
+
+@pytest.fixture
+def rows(session, make_user, category):
+    """Three timestamps with several transactions each, inserted out of order."""
+    user = make_user("alice")
+    other = Category(name="rent")
+    session.add(other)
+    session.commit()
+    start = datetime(2025, 6, 1, 12)
+    for i in (4, 0, 7, 2, 5, 1, 6, 3, 8):
+        session.add(Transaction(
+            user_id=user.id, category_id=other.id if i % 2 else category, amount=10 + i,
+            type="income" if i % 3 == 0 else "expense", date=start + timedelta(days=i % 3),
+        ))
+    session.commit()
+    user.other = other.id
+    user.transactions = sorted(session.exec(select(Transaction)).all(), key=lambda tr: (tr.date, tr.id), reverse=True)
+    user.expected = [tr.id for tr in user.transactions]
+    return user
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 4, 9])
+def test_pages_cover_equal_timestamps_without_gaps(client, rows, limit):
+    result = pages(client, rows, limit)
+    assert [tr_id for page in result for tr_id in page] == rows.expected
+    assert all(len(page) == limit for page in result[:-1])
+
+
+def test_last_page_has_no_cursor(client, rows):
+    body = client.get(PATH, params={"limit": 9}, headers=rows.headers).json()
+    assert len(body["items"]) == 9
+    assert body["next_cursor"] is None
+
+    body = client.get(PATH, params={"limit": 8}, headers=rows.headers).json()
+    assert body["next_cursor"] is not None
+    last = client.get(PATH, params={"limit": 8, "cursor": body["next_cursor"]}, headers=rows.headers).json()
+    assert [row["id"] for row in last["items"]] == rows.expected[8:]
+    assert last["next_cursor"] is None
+
+
+def test_filters_combine_with_the_cursor(client, rows):
+    params = {
+        "category_id": rows.other,
+        "type": "expense",
+        "amount_min": "12",
+        "date_from": "2025-06-02T00:00:00",
+    }
+    expected = [
+        tr.id for tr in rows.transactions
+        if tr.category_id == rows.other and tr.type == "expense" and tr.amount >= 12 and tr.date >= datetime(2025, 6, 2)
+    ]
+    assert expected
+    assert [tr_id for page in pages(client, rows, 1, **params) for tr_id in page] == expected
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64!",
+    base64.urlsafe_b64encode(b"2025-06-01T12:00:00").decode(),
+    base64.urlsafe_b64encode(b"yesterday|3").decode(),
+    base64.urlsafe_b64encode(b"2025-06-01T12:00:00|three").decode(),
+    base64.urlsafe_b64encode(b"\xff\xfe|1").decode(),
+])
+def test_tampered_cursor_is_rejected(client, rows, cursor):
+    assert client.get(PATH, params={"cursor": cursor}, headers=rows.headers).status_code == 400